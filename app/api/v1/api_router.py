@@ -1,7 +1,7 @@
 # app\api\v1\api_router.py
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, events, users, admin_urls
+from app.api.v1.endpoints import auth, events, users, admin_urls, admin_cache
 
 router = APIRouter(prefix="/api/v1")
 
@@ -9,6 +9,7 @@ router.include_router(auth.router)
 router.include_router(events.router)
 router.include_router(users.router)
 router.include_router(admin_urls.router)
+router.include_router(admin_cache.router)
 
 # app.include_router(
 #     eventos.router,
@@ -0,0 +1,37 @@
+# app\api\v1\endpoints\admin_cache.py
+from fastapi import APIRouter, Depends, Query
+from redis.exceptions import RedisError
+from structlog import get_logger
+
+from app.utils.security import require_roles, auth_dep
+from app.utils.cache import inspect_keys, namespace_versions
+from app.utils.http import raise_http
+
+logger = get_logger().bind(module="admin_cache")
+
+router = APIRouter(
+    prefix="/admin/cache",
+    tags=["Admin"],
+    dependencies=[auth_dep, Depends(require_roles("admin"))],
+)
+
+@router.get("/namespaces", summary="Prefixos do cache e versão atual de cada um")
+def get_cache_namespaces() -> dict[str, int]:
+    return namespace_versions()
+
+@router.get("/keys", summary="Inspeciona chaves de um prefixo no Redis")
+async def get_cache_keys(
+    prefix: str = Query(..., min_length=1, description="Prefixo do `cached_json`, ex.: top-soon"),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    Lista (amostra de até `limit`) chaves `<prefix>:v<versão>:<hash>` com TTL,
+    tamanho em bytes e `fresh_until`. Útil para conferir que os workers
+    compartilham as mesmas chaves e que versões antigas estão expirando.
+    """
+    try:
+        keys = await inspect_keys(prefix, limit)
+    except RedisError as e:
+        raise_http(logger.error, 503, "Redis indisponível", prefix=prefix, error=str(e))
+    logger.info("Chaves do cache inspecionadas", prefix=prefix, total=len(keys))
+    return {"prefix": prefix, "version": namespace_versions().get(prefix), "keys": keys}
@@ -1,8 +1,13 @@
 # app\api\v1\endpoints\admin_urls.py
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, HttpUrl
-from pathlib import Path
-import json
+from structlog import get_logger
+
+from app.core.config import get_settings
+from app.deps import provide_redis
+from app.utils.service_url import service_urls
+
+logger = get_logger().bind(module="admin_urls")
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -11,26 +16,23 @@ class URLUpdateRequest(BaseModel):
     url: HttpUrl
 
 ALLOWED_KEYS = {"forecast_info_url", "local_info_url"}
-RUNTIME_PATH = Path("runtime_urls.json")
 
 
 @router.put("/update-service-url", status_code=204)
-def update_service_url(payload: URLUpdateRequest):
+async def update_service_url(payload: URLUpdateRequest):
+    """
+    Grava o override em `runtime_urls.json` (escrita atômica) e avisa os outros
+    workers pelo Redis; sem Redis, eles pegam a mudança pelo mtime do arquivo.
+    """
     if payload.service not in ALLOWED_KEYS:
         raise HTTPException(status_code=400, detail="Serviço não permitido")
 
-    # Lê o conteúdo atual
-    urls = {}
-    if RUNTIME_PATH.exists():
+    redis = None
+    if get_settings().service_urls_pubsub:
         try:
-            with RUNTIME_PATH.open("r", encoding="utf-8") as f:
-                urls = json.load(f)
-        except Exception:
-            pass
-
-    # Atualiza e salva
-    urls[payload.service] = str(payload.url)
-    with RUNTIME_PATH.open("w", encoding="utf-8") as f:
-        json.dump(urls, f, indent=2, ensure_ascii=False)
+            redis = await provide_redis()
+        except Exception as e:
+            logger.warning("Redis indisponível; mudança de URL só via arquivo", error=str(e))
 
+    await service_urls.update(payload.service, str(payload.url), redis)
     return
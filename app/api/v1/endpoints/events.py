@@ -1,30 +1,37 @@
 # api/v1/endpoints/eventos.py
-from fastapi import APIRouter, Depends, Query, Body, UploadFile, File, BackgroundTasks, Request
+from fastapi import APIRouter, Depends, Query, Body, UploadFile, File, Request, Response
 from fastapi.responses import JSONResponse
 from fastapi.encoders import jsonable_encoder
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from structlog import get_logger
 from io import StringIO
 import inspect
 import csv
 import asyncio
-import json
+import time
 
 from app.core.rate_limit_config import limiter
+from app.constants.cache_tags import EVENTS_ALL_TAG, EVENTS_LIST_TAG, EVENT_TAG
 
 from app.schemas.event_create import EventCreate, EventResponse
-from app.schemas.local_info import LocalInfo, LocalInfoResponse
+from app.schemas.local_info import LocalInfo
 from app.schemas.event_update import EventUpdate, LocalInfoUpdate
 from app.schemas.common import MessageResponse
+from app.schemas.weather_forecast import ForecastRangeResponse
 
-from app.utils.cache import cached_json
+from app.utils.blocking import run_blocking
+from app.utils.cache import cached_json, invalidate_tags, invalidate_tags_sync, tags_etag, tags_etag_sync
 from app.utils.h_events import order_and_slice, ensure_aware
-from app.utils.http import raise_http
+from app.utils.http import raise_http, etag_matches, not_modified_since, not_modified, cache_headers
 from app.utils.patch import update_event
 from app.utils.security import require_roles, auth_dep
 
 from app.services.interfaces.local_info_protocol import AbstractLocalInfoService
-from app.services.forecast import atualizar_forecast_em_background
+from app.services.interfaces.forecast_info_protocol import AbstractForecastService
+from app.services.venue_resolver import VenueResolver
+from app.services.forecast_range import MAX_RANGE_DAYS, get_forecast_range
+from app.services.forecast_queue import forecast_refresh_queue
+from app.services.cache_warmup import record_local_info_hit
 from app.repositories.event import AbstractEventRepo
 from app.deps import provide_local_info_service, provide_forecast_service, provide_event_repo
 
@@ -36,7 +43,6 @@ from app.websockets.ws_events import (
 )
 from app.websockets.ws_dashboard import notify_user_count
 
-from app.utils.patch import should_update_forecast
 
 _provide_local_info_service = Depends(provide_local_info_service)
 _provide_forecast_service = Depends(provide_forecast_service)
@@ -44,6 +50,12 @@ _provide_event_repo = Depends(provide_event_repo)
 
 logger = get_logger().bind(module="eventos")
 
+LIST_ETAG_WINDOW = 30   # s — views++ não invalida tags, então a ETag da lista "vira" a cada janela
+
+def _last_modified(event: EventResponse) -> float | None:
+    """Epoch da última escrita no conteúdo do evento (`updated_at`), para `Last-Modified`."""
+    return ensure_aware(event.updated_at).timestamp() if event.updated_at else None
+
 router = APIRouter(
     prefix="/events",
     tags=["events"],
@@ -54,20 +66,28 @@ router = APIRouter(
     "/local_info",
     summary="Busca informações de um local pelo nome",
     response_model=LocalInfo,
-    dependencies=[auth_dep, Depends(require_roles("admin", "editor", "viewer"))],
+    dependencies=[
+        auth_dep, Depends(require_roles("admin", "editor", "viewer")),
+        Depends(record_local_info_hit),         # log de consultas → aquecimento do cache
+    ],
     responses={
         200: {"description": "Local encontrado"},
         404: {"description": "Local não encontrado"}
     },
 )
-@cached_json("local-info", ttl=86400)              # ⬅⬅️ _a “mágica” está aqui_
+@cached_json(                                    # ⬅⬅️ _a “mágica” está aqui_
+    "local-info", ttl=86400, local_ttl=5, stale_ttl=86400,
+    negative_ttl=60,                            # local inexistente: 404 cacheado por 1 min
+    response_model=LocalInfo,
+)
 async def get_local_info(
     location_name: str = Query(..., description="Nome do local a ser buscado"),
     service: AbstractLocalInfoService = _provide_local_info_service
 ):
     """
     Retorna as informações detalhadas de um local a partir do nome.
-    Cache: 24 h (86400 s)
+    Cache: 24 h (86400 s) + 24 h servindo o valor antigo enquanto revalida;
+    404 (local desconhecido) fica 60 s no cache negativo.
     """
     logger.info("Consulta de local iniciada", location_name=location_name)
     
@@ -79,40 +99,57 @@ async def get_local_info(
         raise_http(logger.warning, 404, "Local não encontrado", location_name=location_name)
     return result
 
+@router.get(
+    "/local_info/suggest",
+    summary="Autocomplete de locais pelo começo do nome",
+    response_model=list[LocalInfo],
+    dependencies=[auth_dep, Depends(require_roles("admin", "editor", "viewer"))],
+    responses={200: {"description": "Até `limit` locais, do mais para o menos parecido (lista vazia se nenhum)"}},
+)
+@cached_json("local-info-suggest", ttl=60, local_ttl=5, response_model=list[LocalInfo])
+async def suggest_local_info(
+    q: str = Query(..., min_length=1, max_length=100, description="Texto digitado até agora"),
+    limit: int = Query(8, ge=1, le=20, description="Máximo de sugestões"),
+    service: AbstractLocalInfoService = _provide_local_info_service
+):
+    """
+    Sugestões para o campo de local, a cada tecla: prefixo do nome, prefixo de
+    alguma palavra e, por fim, similaridade por trigramas (erros de digitação).
+    Nunca devolve 404 — sem sugestão é `[]`. Cache curto: 60 s (L1: 5 s).
+    """
+    return await service.suggest(q, limit)
+
 @router.get(
     "/forecast_info",
-    summary="Busca previsão do tempo para uma cidade e data/hora (mock)",
-    response_model=MessageResponse,
+    summary="Previsão do tempo de uma cidade para um intervalo de dias",
+    response_model=ForecastRangeResponse,
     dependencies=[auth_dep, Depends(require_roles("admin", "editor", "viewer"))],
     responses={
-        200: {"description": "Previsão recebida"},
-        404: {"description": "Previsão não recebida"}
+        200: {"description": "Previsões do intervalo"},
+        404: {"description": "Previsão não encontrada"},
+        422: {"description": "Intervalo inválido"},
     },
 )
-@cached_json("forecast", ttl=1800)              # ⬅⬅️ _a “mágica” está aqui_
 async def get_forecast_info(
-    # background_tasks: BackgroundTasks,
     city: str = Query(..., description="Nome da cidade"),
-    date: datetime = Query(..., description="Data e hora de referência para a previsão"),
+    start: date = Query(..., description="Primeiro dia (AAAA-MM-DD)"),
+    end: date | None = Query(None, description="Último dia, inclusive (padrão: `start`)"),
+    service: AbstractForecastService = _provide_forecast_service,
 ):
     """
-    Retorna a previsão do tempo simulada para a cidade e data/hora informadas.
-    Cache: 30 min (1800 s)
+    Retorna todos os slots de previsão (a cada 6 h) da cidade entre `start` e `end`.
+    Cache: 30 min por (cidade, dia) — um intervalo de vários dias é montado a partir
+    das entradas diárias; os dias que faltarem são calculados em uma única chamada ao serviço.
     """
-    logger.info("Consulta de clima iniciada", city=city, date=date)
-    # Adiciona task em background para buscar forecast depois
-    # background_tasks.add_task(
-    #     atualizar_forecast_em_background,
-    #     event_resp.id
-    # )
-    
-    # TODO
-    
-    # Essa função deve retornar o forecast para um range de horários no dia solicitado
-    # Pode-se pensar em pegar para dias tbm
-    
-    logger.info("Endpoint em construção")
-    return {"detail": "Endpoint em construção"}
+    end = end or start
+    if end < start or (end - start).days >= MAX_RANGE_DAYS:
+        raise_http(logger.warning, 422, f"Intervalo inválido: use no máximo {MAX_RANGE_DAYS} dias, com end >= start", city=city, start=start, end=end)
+    logger.info("Consulta de clima iniciada", city=city, start=start, end=end)
+
+    forecasts = await get_forecast_range(service, city, start, end)
+    if not forecasts:
+        raise_http(logger.warning, 404, "Previsão não encontrada", city=city, start=start, end=end)
+    return ForecastRangeResponse(city=city, start=start, end=end, forecasts=forecasts)
 
 @router.get(
     "/all",
@@ -171,6 +208,7 @@ def download_eventos(
 @limiter.limit("60/minute")
 def list_events(
     request: Request,  # ← Necessário para funcionar com @limiter.limit,
+    response: Response,
     skip: int = Query(0, ge=0, description="Quantos registros pular"),
     limit: int = Query(20, le=100, description="Tamanho da página"),
     city: str | None = Query(None, description="Filtrar por cidade"),
@@ -178,11 +216,27 @@ def list_events(
 ) -> list[EventResponse]:
     """
     Retorna uma fatia paginada dos eventos; opcionalmente filtra por cidade.
+    ETag (fraca): versões das tags da coleção + filtros + janela de 30 s (views não invalidam tags).
+    Last-Modified: `updated_at` mais recente da página, nunca antes do início da janela — quem
+    só manda `If-Modified-Since` vê remoções em até 30 s, como o contador de views.
     """
     logger.info("Consulta de evento iniciada", skip=skip, limit=limit, city=city)
+
+    # 🏷️ 304 antes de tocar no repositório
+    window = int(time.time() // LIST_ETAG_WINDOW)
+    etag = tags_etag_sync(EVENTS_ALL_TAG, EVENTS_LIST_TAG, salt=f"{skip}:{limit}:{city}:{window}", weak=True)
+    if etag and etag_matches(request, etag):
+        logger.debug("Lista de eventos não modificada", skip=skip, limit=limit, city=city)
+        return not_modified(etag)
+
     events = repo.list_partial(skip=skip, limit=limit, city=city)
     if not events:
         raise_http(logger.warning, 404, "Nenhum evento encontrado", skip=skip, limit=limit, city=city)
+    last_modified = max([window * LIST_ETAG_WINDOW, *filter(None, map(_last_modified, events))])
+    if not_modified_since(request, last_modified):
+        logger.debug("Lista de eventos não modificada desde", skip=skip, limit=limit, city=city)
+        return not_modified(etag, last_modified)
+    response.headers.update(cache_headers(etag, last_modified))
     return events
 
 @router.get(
@@ -198,36 +252,45 @@ def list_events(
 @limiter.limit("60/minute")
 async def get_event_by_id(
     request: Request,  # ← Necessário para funcionar com @limiter.limit,
-    background_tasks: BackgroundTasks,
+    response: Response,
     event_id: int,
     repo: AbstractEventRepo = _provide_event_repo,
 ) -> EventResponse:
     """
     Busca um evento pelo seu identificador único.
+    Validadores: ETag **fraca** (versões das tags — `views` muda o corpo sem invalidá-las)
+    e `Last-Modified` = `updated_at`. A view é contada antes do 304: revalidar também é ver.
     """
     logger.info("Consulta de evento", event_id=event_id)
-    event = repo.get(event_id)
+
+    etag = await tags_etag(EVENTS_ALL_TAG, EVENT_TAG(event_id), weak=True)
+
+    # repositório síncrono (SQL / Redis do CachedEventRepo): fora do event loop
+    event = await run_blocking(repo.get, event_id)
     
     if event is None:
         raise_http(logger.warning, 404, "Evento não encontrado", event_id=event_id)
     assert event is not None  # MyPy entende que daqui pra frente não é mais None
     
-    if should_update_forecast(event.forecast_info):
-        background_tasks.add_task(
-            atualizar_forecast_em_background,
-            event_id
-        )
+    # previsão antiga é renovada pela varredura periódica (app/services/forecast_sweeper.py), não aqui
     
     event.views += 1
     logger.info("Atualizado os views", event_id=event_id, views=event.views)
     
     # Atualiza apenas o campo de visualizações
     # repo.update(event_id, event.model_dump(exclude_unset=True))
-    repo.update(event_id, {"views": event.views})
+    # ⚠️ views++ não invalida tags: a ETag cobre o evento, não o contador (escritas é que fazem INCR)
+    await run_blocking(repo.update, event_id, {"views": event.views})
     
     # Notifica via WebSocket
     asyncio.create_task(notify_event_viewed_update(event_id, event.views))
-    
+
+    # 🏷️ 304: o cliente já tem o conteúdo (o contador de views é o único campo que pode diferir)
+    last_modified = _last_modified(event)
+    if (etag and etag_matches(request, etag)) or (last_modified is not None and not_modified_since(request, last_modified)):
+        logger.debug("Evento não modificado", event_id=event_id)
+        return not_modified(etag, last_modified)
+    response.headers.update(cache_headers(etag, last_modified))
     return EventResponse.model_validate(event)
 
 @router.get(
@@ -241,8 +304,12 @@ async def get_event_by_id(
     },
     
 )
-@cached_json("top-soon", ttl=10)  # snapshot ultra-curto (10 s)
+@cached_json(                                   # invalidado em escritas; TTL curto cobre o "agora" que avança
+    "top-soon", ttl=10, local_ttl=5, stale_ttl=5,  # no máximo ~15 s de atraso (eventos que já começaram saem logo)
+    tags=(EVENTS_ALL_TAG, EVENTS_LIST_TAG), response_model=list[EventResponse],
+)
 async def get_events_top_soon(
+    request: Request,  # ← usado pelo cached_json para ETag / 304
     limit: int = Query(10, ge=1, le=50, description="Quantos eventos retornar"),
     repo: AbstractEventRepo = _provide_event_repo,
 ) -> list[EventResponse]:
@@ -256,7 +323,7 @@ async def get_events_top_soon(
     #     naive - não usar datetime naive (sem fuso horário), pois irá dificultar a ordenação depois na consulta
     now = datetime.now(timezone.utc)
 
-    events = repo.list_all() # TODO Corrigir para list_partial()
+    events = await run_blocking(repo.list_all) # TODO Corrigir para list_partial()
     most_soon = order_and_slice(
         [ev for ev in events if ensure_aware(ev.event_date) >= now],
         key_fn=lambda ev: ev.event_date,  # most soon first
@@ -278,8 +345,12 @@ async def get_events_top_soon(
         404: {"description": "Nenhum evento encontrado."}
     },
 )
-@cached_json("top-viewed", ttl=30)  # 30 s é suficiente p/ ranking
+@cached_json(                                   # views++ não invalida: 30 s p/ ranking
+    "top-viewed", ttl=30, local_ttl=5, stale_ttl=120,
+    tags=(EVENTS_ALL_TAG, EVENTS_LIST_TAG), response_model=list[EventResponse],
+)
 async def get_events_top_viewed(
+    request: Request,  # ← usado pelo cached_json para ETag / 304
     limit: int = Query(10, ge=1, le=50),
     repo: AbstractEventRepo = _provide_event_repo,
 ) -> list[EventResponse]:
@@ -288,7 +359,7 @@ async def get_events_top_viewed(
     Empate é resolvido pela data do evento (mais próximo primeiro).
     """
     logger.info("Consulta de eventos mais vistos iniciada", limit=limit)
-    events = repo.list_all()
+    events = await run_blocking(repo.list_all)
     # most_viewed = (
     #     sorted(
     #         events,
@@ -322,7 +393,6 @@ async def get_events_top_viewed(
     },
 )
 async def post_create_event(
-    background_tasks: BackgroundTasks,
     event: EventCreate,
     repo: AbstractEventRepo = _provide_event_repo,
 ) -> EventResponse:
@@ -334,13 +404,11 @@ async def post_create_event(
     
     # Criação normal SEM forecast
     # event_resp = repo.add(event, forecast_info=None)           # TODO
-    event_resp = repo.add(event)
+    event_resp = await run_blocking(repo.add, event)
+    await invalidate_tags(EVENTS_LIST_TAG)
     
-    # Adiciona task em background para buscar forecast depois
-    background_tasks.add_task(
-        atualizar_forecast_em_background,
-        event_resp.id
-    )
+    # Agenda a busca do forecast (fila deduplica e agrupa por cidade/horário)
+    forecast_refresh_queue.enqueue(event_resp.id)
     
     # Notifica via WebSocket
     asyncio.create_task(notify_event_created(event.title))
@@ -362,7 +430,6 @@ async def post_create_event(
     },
 )
 async def post_events_batch(
-    background_tasks: BackgroundTasks,
     events: list[EventCreate],
     repo: AbstractEventRepo = _provide_event_repo,
 ) -> list[EventResponse]:
@@ -374,18 +441,18 @@ async def post_events_batch(
     if not events:
         raise_http(logger.warning, 400, "Lista vazia enviada")
 
+    # mesmo local em várias linhas → uma instância só (o FastAPI já validou cada item)
+    venues = VenueResolver()
     new_events: list[EventResponse] = []
     for event in events:
+        event.local_info = venues.intern(event.local_info)
 
         # Criação normal SEM forecast
         # event_resp = repo.add(event, forecast_info=None)      # TODO
-        event_resp = repo.add(event)
+        event_resp = await run_blocking(repo.add, event)
         
-        # Adiciona task em background para buscar forecast depois
-        background_tasks.add_task(
-            atualizar_forecast_em_background,
-            event_resp.id
-        )
+        # Agenda a busca do forecast (fila deduplica e agrupa por cidade/horário)
+        forecast_refresh_queue.enqueue(event_resp.id)
         
         await notify_upload_progress(event.title)
         logger.info("Evento adicionado em lote", event_id=event_resp.id, title=event.title, city=event.city, date=event.event_date)
@@ -393,6 +460,7 @@ async def post_events_batch(
         new_events.append(event_resp)
 
     logger.info("Eventos em lote adicionados com sucesso", total_adicionados=len(new_events))
+    await invalidate_tags(EVENTS_LIST_TAG)
     await notify_upload_end(len(new_events))
     await notify_user_count()
     
@@ -413,24 +481,28 @@ async def post_events_batch(
 @limiter.limit("20/minute")
 async def upload_csv(
     request: Request,  # ← Necessário para funcionar com @limiter.limit,
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     repo: AbstractEventRepo = _provide_event_repo,
+    service: AbstractLocalInfoService = _provide_local_info_service,
 ):
     """
     Permite o envio de um arquivo CSV com eventos e adiciona ao repositório.
+    A coluna `local_info` aceita o JSON do local ou só o nome (buscado no serviço de
+    locais, em um lote); cada local distinto é validado uma vez e compartilhado entre as linhas.
     """
     content = await file.read()
     try:
         decoded = content.decode("utf-8")
     except UnicodeDecodeError:
         raise_http(logger.error, 400, "Erro ao decodificar o arquivo CSV. Certifique-se de que está em UTF-8.")
-    reader = csv.DictReader(StringIO(decoded))
+    rows = list(csv.DictReader(StringIO(decoded)))
+    venues = VenueResolver(service)
+    await venues.prefetch(row.get("local_info") for row in rows)
 
     new_events: list[EventResponse] = []
     total = 0
     # for row in reader:
-    for idx, row in enumerate(reader, start=1):
+    for idx, row in enumerate(rows, start=1):
         try:
             event = EventCreate(
                 title=row["title"],
@@ -439,18 +511,15 @@ async def upload_csv(
                 city=row["city"],
                 participants=row["participants"].split(";"),
                 # local_info=LocalInfo(**eval(row["local_info"]))
-                local_info=LocalInfoResponse(**json.loads(row["local_info"]))  # 👈 mais seguro
+                local_info=venues.resolve(row["local_info"]),   # 👈 validado uma vez por local distinto
             )
             
             # Criação normal SEM forecast
             # event_resp = repo.add(event, forecast_info=None)      # TODO
-            event_resp = repo.add(event)
+            event_resp = await run_blocking(repo.add, event)
             
-            # Adiciona task em background para buscar forecast depois
-            background_tasks.add_task(
-                atualizar_forecast_em_background,
-                event_resp.id
-            )
+            # Agenda a busca do forecast (fila deduplica e agrupa por cidade/horário)
+            forecast_refresh_queue.enqueue(event_resp.id)
             
             # TODO VERIFICAR COM JOÃO SE É UMA BOA PRÁTICA
             new_events.append(EventResponse.model_validate(event_resp))
@@ -465,7 +534,10 @@ async def upload_csv(
             await notify_upload_error(str(e))
             # await manager.broadcast(f"❌ Erro no evento: {str(e)}")
     
+    logger.info("Locais do upload resolvidos", linhas=len(rows), validados=venues.parsed)
     # await manager.broadcast(f"🏁 Upload finalizado: {total} eventos adicionados")
+    if new_events:
+        await invalidate_tags(EVENTS_LIST_TAG)
     await notify_upload_end(len(new_events))
     await notify_user_count()
     
@@ -500,6 +572,7 @@ def put_events(
     asyncio.create_task(notify_replace_started())
     
     result = repo.replace_all(events_new)
+    invalidate_tags_sync(EVENTS_ALL_TAG)
     
     # Notifica via WebSocket
     asyncio.create_task(notify_replace_done())
@@ -532,6 +605,7 @@ def put_event_by_id(
 
     new_event.id = event_id  # Garante que o ID informado será usado
     resultado = repo.replace_by_id(event_id, new_event)
+    invalidate_tags_sync(EVENTS_LIST_TAG, EVENT_TAG(event_id))
     logger.info("Evento substituído com sucesso", event_id=event_id)
     return resultado
 
@@ -554,6 +628,7 @@ def delete_events(
     logger.info("Requisição para deletar todos os eventos recebida")
     try:
         repo.delete_all()
+        invalidate_tags_sync(EVENTS_ALL_TAG)
         logger.info("Todos os eventos foram removidos com sucesso")
         return {"mensagem": "Todos os eventos foram apagados com sucesso."}
     except Exception as e:
@@ -581,6 +656,7 @@ def delete_event_by_id(
     sucesso = repo.delete_by_id(event_id)
     if not sucesso:
         raise_http(logger.warning, 404, "Evento não encontrado", event_id=event_id)
+    invalidate_tags_sync(EVENTS_LIST_TAG, EVENT_TAG(event_id))
     logger.info("Evento removido com sucesso", event_id=event_id)
     return {"mensagem": f"Evento com ID {event_id} removido com sucesso."}
 
@@ -597,7 +673,6 @@ def delete_event_by_id(
     },
 )
 def patch_event_by_id(
-    background_tasks: BackgroundTasks,
     event_id: int,
     update: EventUpdate,
     repo: AbstractEventRepo = _provide_event_repo,
@@ -612,13 +687,11 @@ def patch_event_by_id(
 
     try:
         result = repo.update(event_id, update.model_dump(exclude_unset=True))
+        invalidate_tags_sync(EVENTS_LIST_TAG, EVENT_TAG(event_id))
         
         if update.city or update.event_date:
-            # Adiciona task em background para buscar forecast depois
-            background_tasks.add_task(
-                atualizar_forecast_em_background,
-                event_id
-            )
+            # Agenda a busca do forecast (fila deduplica e agrupa por cidade/horário)
+            forecast_refresh_queue.enqueue(event_id)
             
         logger.info("Evento atualizado com sucesso", event_id=event_id)
         return result
@@ -637,7 +710,6 @@ def patch_event_by_id(
     },
 )
 def patch_event_by_id_local_info( #async?
-    background_tasks: BackgroundTasks,
     event_id: int,
     update: LocalInfoUpdate | None = Body(None),
     repo: AbstractEventRepo = _provide_event_repo,
@@ -660,14 +732,13 @@ def patch_event_by_id_local_info( #async?
     # TODO verificar se ao mudar o local info, também foi alterada a cidade
     
     if event.city or event.event_date:
-        # Adiciona task em background para buscar forecast depois
-        background_tasks.add_task(
-            atualizar_forecast_em_background,
-            event_id
-        )
+        # Agenda a busca do forecast (fila deduplica e agrupa por cidade/horário)
+        forecast_refresh_queue.enqueue(event_id)
     
+    result = repo.replace_by_id(event_id, event)
+    invalidate_tags_sync(EVENTS_LIST_TAG, EVENT_TAG(event_id))
     logger.info("Informações do local atualizadas com sucesso", event_id=event_id)
-    return repo.replace_by_id(event_id, event)
+    return result
 
 @router.patch(
     "/{event_id}/forecast_info",
@@ -681,7 +752,6 @@ def patch_event_by_id_local_info( #async?
     },
 )
 def patch_event_by_id_forecast_info(
-    background_tasks: BackgroundTasks,
     event_id: int,
     repo: AbstractEventRepo = _provide_event_repo,
 ) -> dict:
@@ -695,11 +765,8 @@ def patch_event_by_id_forecast_info(
         raise_http(logger.warning, 404, "Evento não encontrado", event_id=event_id)
     assert event is not None  # MyPy entende que daqui pra frente não é mais None
     
-    # Adiciona task em background para buscar forecast depois
-    background_tasks.add_task(
-        atualizar_forecast_em_background,
-        event_id
-    )
+    # Agenda a busca do forecast (fila deduplica e agrupa por cidade/horário)
+    forecast_refresh_queue.enqueue(event_id)
 
     logger.info("Tarefa de atualização de forecast agendada", event_id=event_id)
     return {"detail": "Tarefa de atualização de forecast agendada"}
\ No newline at end of file
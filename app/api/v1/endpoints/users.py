@@ -3,16 +3,24 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request
 from structlog import get_logger
 
 from app.repositories.user import AbstractUserRepo
-from app.schemas.user import UserInDB, UserCreate
+from app.schemas.user import UserInDB, UserCreate, UserRolesUpdate
 from app.core.security import get_password_hash
 from app.core.rate_limit_config import limiter
 from app.utils.security import require_roles, auth_dep
-from app.deps import provide_user_repo
+from app.core.config import get_settings
+from app.deps import provide_user_repo, provide_redis_sync
+from app.services.token_cache import verified_tokens
 
 _provide_user_repo = Depends(provide_user_repo)
 
 logger = get_logger().bind(module="eventos")
 
+def _revoke_tokens(username: str) -> None:
+    """Derruba os tokens em cache do usuário neste worker e, via pub/sub, nos demais."""
+    settings = get_settings()
+    redis = provide_redis_sync() if settings.auth_token_cache_pubsub and settings.redis_url else None
+    verified_tokens.revoke_user(username, redis)
+
 router = APIRouter(
 #     dependencies=[auth_dep]
     prefix="/users",
@@ -82,8 +90,32 @@ def criar_usuario(
         hashed_password=get_password_hash(novo.password),
         roles=novo.roles,
     )
+    _revoke_tokens(novo.username)                      # tokens antigos de um homônimo removido
     return repo.add(user)
 
+@router.put(
+    "/{username}/roles",
+    summary="Altera os papéis de um usuário",
+    response_model=UserInDB,
+    dependencies=[auth_dep, Depends(require_roles("admin"))],
+    responses={
+        200: {"description": "Papéis atualizados"},
+        404: {"description": "Usuário não encontrado"}
+    },
+)
+@limiter.limit("20/minute")
+def alterar_papeis(
+    request: Request,  # ← Necessário para funcionar com @limiter.limit,
+    username: str,
+    update: UserRolesUpdate,
+    repo: AbstractUserRepo = _provide_user_repo
+):
+    updated = repo.update_roles(username, update.roles)
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Usuário não encontrado")
+    _revoke_tokens(username)                            # próximo request relê os papéis
+    return updated
+
 @router.delete(
     "/{username}",
     summary="Adiciona usuário",
@@ -102,4 +134,5 @@ def remover_usuario(
 ):
     if not repo.delete_by_username(username):
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
+    _revoke_tokens(username)                            # tokens já emitidos deixam de valer na hora
     return None
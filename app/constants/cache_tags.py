@@ -0,0 +1,17 @@
+# app/constants/cache_tags.py
+
+# Tags usadas para invalidar entradas do `cached_json` (app/utils/cache.py).
+# Cada tag tem um contador de versão no Redis; a versão entra na chave do cache,
+# então "invalidar" = incrementar o contador (as chaves antigas viram órfãs e expiram).
+
+# Qualquer resultado derivado de eventos (listas, rankings, detalhe) — muda em operações em massa
+EVENTS_ALL_TAG = "events:all"
+
+# Resultados de coleção (listas/rankings) — muda quando qualquer evento é criado/alterado/removido
+EVENTS_LIST_TAG = "events:list"
+
+# Template para resultados de um evento específico (formatado com os args da função cacheada)
+EVENT_TAG_TEMPLATE = "event:{event_id}"
+
+def EVENT_TAG(event_id: int) -> str:
+    return EVENT_TAG_TEMPLATE.format(event_id=event_id)
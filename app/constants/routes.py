@@ -5,6 +5,7 @@ API_V1_PREFIX = "/api/v1"
 # Eventos
 EVENTS_PREFIX = f"{API_V1_PREFIX}/events"
 EVENTS_LOCAL_INFO_ROUTE = f"{EVENTS_PREFIX}/local_info"
+EVENTS_LOCAL_INFO_SUGGEST_ROUTE = f"{EVENTS_LOCAL_INFO_ROUTE}/suggest"
 EVENTS_FORECAST_INFO_ROUTE = f"{EVENTS_PREFIX}/forecast_info"
 EVENTS_UPLOAD_CSV_ROUTE = f"{EVENTS_PREFIX}/upload"
 
@@ -45,13 +45,94 @@ class Settings(BaseSettings):
     # ── banco e cache ─────────────────────────────────
     db_url:          str | None = Field(None, validation_alias="DB_URL")
     redis_url:       str | None = Field(None, validation_alias="REDIS_URL")
-    
+
+    # ── redis: timeouts, pool e disjuntor ─────────────
+    redis_connect_timeout:  float = Field(0.25, validation_alias="REDIS_CONNECT_TIMEOUT")   # s
+    redis_socket_timeout:   float = Field(0.5, validation_alias="REDIS_SOCKET_TIMEOUT")     # s (leitura/escrita)
+    redis_max_connections:  int = Field(50, validation_alias="REDIS_MAX_CONNECTIONS")     # por pool/worker
+    redis_breaker_failure_rate: float = Field(0.5, validation_alias="REDIS_BREAKER_FAILURE_RATE")
+    redis_breaker_min_calls:    int = Field(10, validation_alias="REDIS_BREAKER_MIN_CALLS")
+    redis_breaker_window:       int = Field(20, validation_alias="REDIS_BREAKER_WINDOW")
+    redis_breaker_slow_ms:      float = Field(200, validation_alias="REDIS_BREAKER_SLOW_MS")  # mais lento = falha
+    redis_breaker_open_seconds: float = Field(5, validation_alias="REDIS_BREAKER_OPEN_SECONDS")
+
+    # ── cache L1 (memória local, por worker) ──────────
+    cache_l1_max_entries: int = Field(1024, validation_alias="CACHE_L1_MAX_ENTRIES")
+    cache_l1_max_bytes:   int = Field(8 * 1024 * 1024, validation_alias="CACHE_L1_MAX_BYTES")
+    cache_l1_max_ttl:     int = Field(5, validation_alias="CACHE_L1_MAX_TTL")   # TTL curto ⇒ workers convergem rápido
+
+    # ── cache: proteção contra stampede ──────────────
+    cache_lock_timeout_ms: int = Field(5000, validation_alias="CACHE_LOCK_TIMEOUT_MS")
+    cache_lock_poll_ms:    int = Field(50, validation_alias="CACHE_LOCK_POLL_MS")
+
+    # ── cache: compressão do corpo gravado no Redis ──
+    cache_compress_min_bytes: int = Field(1024, validation_alias="CACHE_COMPRESS_MIN_BYTES")   # abaixo disso não compensa
+    cache_compress_level:     int = Field(6, validation_alias="CACHE_COMPRESS_LEVEL")          # zlib 1..9
+
+    # ── cache: aquecimento no startup ────────────────
+    cache_warmup_enabled:     bool = Field(True, validation_alias="CACHE_WARMUP_ENABLED")
+    cache_warmup_top_limits:  list[int] = Field(default_factory=lambda: [10], validation_alias="CACHE_WARMUP_TOP_LIMITS")  # JSON: [5,10]
+    cache_warmup_venues:      int = Field(20, validation_alias="CACHE_WARMUP_VENUES")        # top N do log de consultas
+    cache_warmup_concurrency: int = Field(4, validation_alias="CACHE_WARMUP_CONCURRENCY")
+    cache_warmup_budget_s:    float = Field(10, validation_alias="CACHE_WARMUP_BUDGET_S")      # nunca trava o startup
+    cache_warmup_hits_flush_s: float = Field(10, validation_alias="CACHE_WARMUP_HITS_FLUSH_S")  # envio do contador de /local_info
+
+    # ── cache do repositório de eventos ───────────────
+    event_repo_cache:          bool = Field(False, validation_alias="EVENT_REPO_CACHE")     # liga o CachedEventRepo
+    event_repo_cache_ttl:      int = Field(300, validation_alias="EVENT_REPO_CACHE_TTL")   # entidades (write-through)
+    event_repo_cache_list_ttl: int = Field(30, validation_alias="EVENT_REPO_CACHE_LIST_TTL")
+
+    # ── cliente HTTP compartilhado (APIs externas) ────
+    http_http2:            bool = Field(True, validation_alias="HTTP_HTTP2")                # só se o pacote `h2` estiver instalado
+    http_max_connections:  int = Field(100, validation_alias="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive:    int = Field(20, validation_alias="HTTP_MAX_KEEPALIVE")
+    http_keepalive_expiry: float = Field(30, validation_alias="HTTP_KEEPALIVE_EXPIRY")       # s
+    http_connect_timeout:  float = Field(2, validation_alias="HTTP_CONNECT_TIMEOUT")         # s
+    http_read_timeout:     float = Field(5, validation_alias="HTTP_READ_TIMEOUT")            # s
+    http_pool_timeout:     float = Field(2, validation_alias="HTTP_POOL_TIMEOUT")            # s esperando conexão livre
+
+    # ── executor de chamadas bloqueantes (repo/serviços síncronos em código async) ─
+    blocking_executor_workers: int = Field(8, validation_alias="BLOCKING_EXECUTOR_WORKERS")   # limita threads e conexões ao banco
+
+    # ── provedor de previsões ─────────────────────────
+    forecast_provider:           str = Field("mock", validation_alias="FORECAST_PROVIDER")            # mock | http
+    forecast_http_concurrency:   int = Field(10, validation_alias="FORECAST_HTTP_CONCURRENCY")        # chamadas simultâneas ao provedor
+    forecast_http_retries:       int = Field(3, validation_alias="FORECAST_HTTP_RETRIES")
+    forecast_http_backoff_base:  float = Field(0.2, validation_alias="FORECAST_HTTP_BACKOFF_BASE")      # s
+    forecast_http_backoff_max:   float = Field(2.0, validation_alias="FORECAST_HTTP_BACKOFF_MAX")       # s
+
+    # ── cache de previsões (cidade + slot do provedor) ─
+    forecast_cache:             bool = Field(True, validation_alias="FORECAST_CACHE")
+    forecast_cache_redis:       bool = Field(False, validation_alias="FORECAST_CACHE_REDIS")          # L2 compartilhado entre workers
+    forecast_cache_ttl:         int = Field(3 * 3600, validation_alias="FORECAST_CACHE_TTL")         # s — cadência do provedor
+    forecast_cache_slot_hours:  int = Field(6, validation_alias="FORECAST_CACHE_SLOT_HOURS")         # granularidade da previsão
+    forecast_cache_max_entries: int = Field(2048, validation_alias="FORECAST_CACHE_MAX_ENTRIES")     # LRU por processo
+
+    # ── fila de atualização de forecast ─────────────
+    forecast_refresh_workers:        int = Field(4, validation_alias="FORECAST_REFRESH_WORKERS")          # chamadas simultâneas ao provedor
+    forecast_refresh_window_ms:      int = Field(200, validation_alias="FORECAST_REFRESH_WINDOW_MS")      # junta rajadas antes de processar
+    forecast_refresh_bucket_minutes: int = Field(60, validation_alias="FORECAST_REFRESH_BUCKET_MINUTES")  # mesma cidade + bucket = 1 chamada
+    forecast_refresh_retries:        int = Field(3, validation_alias="FORECAST_REFRESH_RETRIES")
+    forecast_refresh_retry_delay:    float = Field(2.0, validation_alias="FORECAST_REFRESH_RETRY_DELAY")    # s, dobra a cada tentativa
+
+    # ── varredura periódica de previsões antigas ───
+    forecast_sweep_enabled:       bool = Field(True, validation_alias="FORECAST_SWEEP_ENABLED")          # false ⇒ rodar como worker separado
+    forecast_sweep_interval_s:    float = Field(300, validation_alias="FORECAST_SWEEP_INTERVAL_S")
+    forecast_sweep_stale_after_s: float = Field(86400, validation_alias="FORECAST_SWEEP_STALE_AFTER_S")   # previsão com mais de 1 dia
+    forecast_sweep_horizon_days:  int = Field(10, validation_alias="FORECAST_SWEEP_HORIZON_DAYS")       # alcance do provedor
+    forecast_sweep_batch_size:    int = Field(100, validation_alias="FORECAST_SWEEP_BATCH_SIZE")
+    forecast_sweep_max_batches:   int = Field(10, validation_alias="FORECAST_SWEEP_MAX_BATCHES")        # por rodada
+
     # ── auth ──────────────────────────────────────────
     auth_secret_key: str | None = Field(None, validation_alias="AUTH_SECRET_KEY")
     auth_access_token_expire: int = Field( # access_token_expire_min
         60 * 24, validation_alias="ACCESS_TOKEN_EXPIRE_MIN"
     )
     auth_algorithm:  str = "HS256"
+    auth_token_cache_ttl:         int = Field(60, validation_alias="AUTH_TOKEN_CACHE_TTL")              # s; 0 desliga
+    auth_token_cache_max_entries: int = Field(10_000, validation_alias="AUTH_TOKEN_CACHE_MAX_ENTRIES")
+    auth_token_cache_pubsub:      bool = Field(True, validation_alias="AUTH_TOKEN_CACHE_PUBSUB")         # invalidação vale para todos os workers
+    auth_token_cache_channel:     str = Field("auth-token-invalidations", validation_alias="AUTH_TOKEN_CACHE_CHANNEL")
     
     # ── logging ───────────────────────────────────────
     log_level: str = Field("INFO", validation_alias="LOG_LEVEL")
@@ -69,7 +150,17 @@ class Settings(BaseSettings):
     port: int = Field(8000, validation_alias="PORT")
 
     # ── filas / tarefas assíncronas ───────────────────
-    celery_broker_url: str | None = Field(None, validation_alias="CELERY_BROKER_URL")
+    celery_broker_url: str | None = Field(None, validation_alias="CELERY_BROKER_URL")   # broker da fila de jobs (padrão: REDIS_URL)
+    jobs_backend:              str = Field("inline", validation_alias="JOBS_BACKEND")             # inline | redis | sqlite
+    jobs_queue_name:           str = Field("default", validation_alias="JOBS_QUEUE_NAME")
+    jobs_sqlite_path:          str = Field("jobs.sqlite3", validation_alias="JOBS_SQLITE_PATH")
+    jobs_max_attempts:         int = Field(5, validation_alias="JOBS_MAX_ATTEMPTS")               # depois disso ⇒ fila de mortos
+    jobs_backoff_base_s:       float = Field(5.0, validation_alias="JOBS_BACKOFF_BASE_S")
+    jobs_backoff_max_s:        float = Field(600.0, validation_alias="JOBS_BACKOFF_MAX_S")
+    jobs_visibility_timeout_s: float = Field(300.0, validation_alias="JOBS_VISIBILITY_TIMEOUT_S")    # sem ack nesse prazo ⇒ reentrega
+    jobs_block_ms:             int = Field(1000, validation_alias="JOBS_BLOCK_MS")                # espera do worker por jobs novos
+    jobs_worker_processes:     int = Field(2, validation_alias="JOBS_WORKER_PROCESSES")
+    jobs_worker_concurrency:   int = Field(4, validation_alias="JOBS_WORKER_CONCURRENCY")         # jobs simultâneos por processo
 
     # ── feature flags ─────────────────────────────────
     enable_feature_x: bool = Field(False, validation_alias="ENABLE_FEATURE_X")
@@ -84,6 +175,13 @@ class Settings(BaseSettings):
     )
     
     local_info_url: str = Field("https://default.localinfo.api", validation_alias="LOCAL_INFO_URL")
+    local_info_data_path: str | None = Field(None, validation_alias="LOCAL_INFO_DATA_PATH")   # .json/.csv com os locais (mock)
+
+    # ── URLs de serviços em runtime (overrides do admin) ─
+    service_urls_path:    str = Field("runtime_urls.json", validation_alias="SERVICE_URLS_PATH")
+    service_urls_poll_s:  float = Field(2.0, validation_alias="SERVICE_URLS_POLL_S")               # checagem do mtime
+    service_urls_pubsub:  bool = Field(True, validation_alias="SERVICE_URLS_PUBSUB")              # avisa os outros workers via Redis
+    service_urls_channel: str = Field("service-urls", validation_alias="SERVICE_URLS_CHANNEL")
     forecast_info_url: str = Field("https://default.forecast.api", validation_alias="FORECAST_INFO_URL")
     
     # ─────────────────────── configuração Pydantic ─────────────────
@@ -0,0 +1,74 @@
+# app/core/metrics.py
+from prometheus_client import Counter, Gauge
+
+# Métricas de negócio/infra próprias do app.
+# Todas usam o registry padrão do prometheus_client, então aparecem
+# automaticamente em /metrics (exposto pelo Instrumentator em app/main.py).
+
+# ── cache (app/utils/cache.py) ───────────────────────
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Consultas ao cache por camada (l1 = memória local, l2 = Redis) e resultado",
+    ["tier", "prefix", "result"],
+)
+
+CACHE_COALESCED = Counter(
+    "cache_coalesced_total",
+    "Misses que aguardaram um cálculo já em andamento (local = mesmo worker, redis = outro worker)",
+    ["prefix", "scope"],
+)
+
+CACHE_WARMUP = Counter(
+    "cache_warmup_total",
+    "Entradas pré-calculadas no startup por resultado (ok, empty, failed, cancelled)",
+    ["result"],
+)
+
+# ── cache do repositório de eventos (app/repositories/event_cached.py) ──
+REPO_CACHE_REQUESTS = Counter(
+    "repo_cache_requests_total",
+    "Leituras do CachedEventRepo por operação e resultado (hit, miss, error, bypass)",
+    ["op", "result"],
+)
+
+# ── fila de forecast (app/services/forecast_queue.py) ──
+FORECAST_QUEUE_DEPTH = Gauge(
+    "forecast_refresh_queue_depth",
+    "Eventos aguardando atualização de forecast (já deduplicados)",
+)
+
+FORECAST_QUEUE_DEDUP = Counter(
+    "forecast_refresh_dedup_total",
+    "Pedidos de atualização descartados por já haver o mesmo evento pendente",
+)
+
+FORECAST_REFRESH_GROUPS = Counter(
+    "forecast_refresh_groups_total",
+    "Grupos (cidade, bucket de tempo) processados por resultado (ok, empty, failed)",
+    ["result"],
+)
+
+FORECAST_SWEEP_RUNS = Counter(
+    "forecast_sweep_runs_total",
+    "Rodadas da varredura de previsões antigas por resultado (ok, locked = outro worker, failed)",
+    ["result"],
+)
+
+FORECAST_SWEEP_EVENTS = Counter(
+    "forecast_sweep_events_total",
+    "Eventos enviados para atualização pela varredura de previsões",
+)
+
+# ── fila de jobs (app/jobs) ──────────────────────────
+JOBS_PROCESSED = Counter(
+    "jobs_processed_total",
+    "Execuções de jobs no worker por nome e resultado (ok, retry, dead)",
+    ["name", "result"],
+)
+
+# ── disjuntores (app/utils/circuit_breaker.py) ───────
+CIRCUIT_STATE = Gauge(
+    "circuit_breaker_state",
+    "Estado do disjuntor: 0 = closed, 1 = half_open, 2 = open",
+    ["name"],
+)
@@ -1,4 +1,5 @@
 # app/deps.py
+import redis
 from redis.asyncio import Redis
 from structlog import get_logger
 from sqlalchemy.orm import Session
@@ -8,6 +9,7 @@ from app.db.session import get_db
 
 from app.repositories.event_orm_db import SQLEventRepo
 from app.repositories.event import AbstractEventRepo
+from app.repositories.event_cached import CachedEventRepo
 # from app.repositories.user import AbstractUserRepo
 
 from app.services.interfaces.user_protocol import AbstractUserRepo
@@ -20,6 +22,8 @@ from app.services.interfaces.local_info_protocol import AbstractLocalInfoService
 from app.services.mock_forecast_info import MockForecastService
 from app.services.interfaces.forecast_info_protocol import AbstractForecastService
 
+from app.jobs.base import AbstractJobQueue
+
 from app.core.config import get_settings
 
 logger = get_logger().bind(module="deps")
@@ -38,26 +42,95 @@ def provide_user_repo(db: Session = Depends(get_db)) -> AbstractUserRepo:
     # return UserRepo(db)
     return get_in_memory_user_repo()
 
+_local_info_service_singleton: AbstractLocalInfoService | None = None   # índice de locais montado uma vez
+
 def provide_local_info_service() -> AbstractLocalInfoService:
     """
-    Retorna o serviço de localinfo.
+    Retorna o serviço de localinfo (instância única do processo).
+    Com `LOCAL_INFO_DATA_PATH` os locais vêm do arquivo (.json/.csv); sem ele, a lista mock.
     """
-    if _settings.environment == "test.inmemory":
+    global _local_info_service_singleton
+    if _local_info_service_singleton is None:
         from app.services.mock_local_info import MockLocalInfoService
-        logger.debug("Injetando serviço de local_info (mock)")
-        return MockLocalInfoService()
-    return MockLocalInfoService() # LocalInfoService()
+        if _settings.local_info_data_path:
+            logger.debug("Injetando serviço de local_info (arquivo)", path=_settings.local_info_data_path)
+            _local_info_service_singleton = MockLocalInfoService.from_file(_settings.local_info_data_path)
+        else:
+            logger.debug("Injetando serviço de local_info (mock)")
+            _local_info_service_singleton = MockLocalInfoService() # LocalInfoService()
+    return _local_info_service_singleton
+
+_forecast_service_singleton: AbstractForecastService | None = None   # o cache de previsões vive aqui
 
 def provide_forecast_service() -> AbstractForecastService:
     """
-    Retorna o serviço de forecast.
+    Retorna o serviço de forecast (instância única do processo).
+    Com `FORECAST_CACHE=true` vem embrulhado no `CachedForecastService`.
     """
-    if _settings.environment == "test.inmemory":
-        logger.debug("Injetando serviço de forecast_info (mock)")
-        return MockForecastService()
-    return MockForecastService()
+    global _forecast_service_singleton
+    if _forecast_service_singleton is None:
+        service: AbstractForecastService
+        if _settings.forecast_provider == "http":
+            from app.services.forecast_api import HttpForecastService
+            logger.debug("Injetando serviço de forecast_info (HTTP)")
+            service = HttpForecastService()
+        else:
+            logger.debug("Injetando serviço de forecast_info (mock)")
+            service = MockForecastService()
+        if _settings.forecast_cache:
+            # import tardio: o cache de previsões usa `app.utils.cache`, que importa este módulo
+            from app.services.forecast_cached import CachedForecastService
+            service = CachedForecastService(
+                service,
+                provide_redis_sync() if _settings.forecast_cache_redis and _settings.redis_url else None,
+                ttl=_settings.forecast_cache_ttl,
+                slot_hours=_settings.forecast_cache_slot_hours,
+                max_entries=_settings.forecast_cache_max_entries,
+            )
+        _forecast_service_singleton = service
+    return _forecast_service_singleton
+
+_job_queue_singleton: AbstractJobQueue | None = None
+
+def provide_job_queue() -> AbstractJobQueue | None:
+    """
+    Fila de jobs durável conforme `JOBS_BACKEND`; `None` no modo `inline`
+    (o trabalho roda no próprio processo da API).
+    """
+    global _job_queue_singleton
+    backend = _settings.jobs_backend
+    if backend == "inline":
+        return None
+    if _job_queue_singleton is None:
+        if backend == "redis":
+            from app.jobs.redis_streams import RedisStreamJobQueue
+            url = _settings.celery_broker_url or _settings.redis_url
+            if url is None:
+                raise RuntimeError("JOBS_BACKEND=redis exige CELERY_BROKER_URL ou REDIS_URL")
+            logger.info("Instanciando fila de jobs (Redis Streams)", url=url, queue=_settings.jobs_queue_name)
+            options = _redis_pool_options()
+            # XREADGROUP BLOCK segura o socket: o timeout precisa cobrir a espera
+            options["socket_timeout"] = _settings.redis_socket_timeout + _settings.jobs_block_ms / 1000
+            _job_queue_singleton = RedisStreamJobQueue(
+                redis.Redis.from_url(url, decode_responses=True, health_check_interval=30, **options),
+                _settings.jobs_queue_name,
+                visibility_timeout=_settings.jobs_visibility_timeout_s,
+            )
+        elif backend == "sqlite":
+            from app.jobs.sqlite import SQLiteJobQueue
+            logger.info("Instanciando fila de jobs (SQLite)", path=_settings.jobs_sqlite_path, queue=_settings.jobs_queue_name)
+            _job_queue_singleton = SQLiteJobQueue(
+                _settings.jobs_sqlite_path,
+                _settings.jobs_queue_name,
+                visibility_timeout=_settings.jobs_visibility_timeout_s,
+            )
+        else:
+            raise ValueError(f"JOBS_BACKEND inválido: {backend!r} (use inline, redis ou sqlite)")
+    return _job_queue_singleton
 
 _redis_singleton: Redis | None = None     # conexão global reaproveitável
+_redis_bytes_singleton: Redis | None = None   # idem, sem decode (usada pelo cache)
+_redis_sync_singleton: redis.Redis | None = None   # síncrona: repositórios também são síncronos
 
 def provide_event_repo(db: Session = Depends(get_db)) -> AbstractEventRepo:
     """
@@ -66,9 +139,42 @@ def provide_event_repo(db: Session = Depends(get_db)) -> AbstractEventRepo:
     if _settings.environment == "test.inmemory":
         from app.deps_singletons import get_in_memory_event_repo
         logger.debug("Injetando instância global de repositório em memória (via singleton manual)")
-        return get_in_memory_event_repo()
-    logger.debug("Injetando repositório de eventos (SQLAlchemy)")
-    return SQLEventRepo(db)
+        repo: AbstractEventRepo = get_in_memory_event_repo()
+    else:
+        logger.debug("Injetando repositório de eventos (SQLAlchemy)")
+        repo = SQLEventRepo(db)
+
+    if _settings.event_repo_cache and _settings.redis_url:
+        return CachedEventRepo(
+            repo,
+            provide_redis_sync(),
+            ttl=_settings.event_repo_cache_ttl,
+            list_ttl=_settings.event_repo_cache_list_ttl,
+        )
+    return repo
+
+def provide_redis_sync() -> redis.Redis:
+    """Cliente Redis síncrono e binário — para código síncrono (ex.: `CachedEventRepo`)."""
+    global _redis_sync_singleton
+    if _settings.redis_url is None:
+        logger.warning("REDIS_URL ausente", environment=_settings.environment)
+        raise RuntimeError("REDIS_URL obrigatório")
+    if _redis_sync_singleton is None:
+        logger.info("Instanciando conexão Redis (síncrona)", url=_settings.redis_url)
+        _redis_sync_singleton = redis.Redis.from_url(
+            _settings.redis_url,
+            health_check_interval=30,
+            **_redis_pool_options(),
+        )
+    return _redis_sync_singleton
+
+def _redis_pool_options() -> dict:
+    """Timeouts explícitos e tamanho do pool: Redis lento não pode segurar a request até o timeout do SO."""
+    return {
+        "socket_connect_timeout": _settings.redis_connect_timeout,
+        "socket_timeout": _settings.redis_socket_timeout,
+        "max_connections": _settings.redis_max_connections,
+    }
 
 async def provide_redis() -> Redis:
     global _redis_singleton
@@ -81,5 +187,24 @@ async def provide_redis() -> Redis:
             _settings.redis_url,
             decode_responses=True,        # retorna str em vez de bytes
             health_check_interval=30,     # pool saudável
+            **_redis_pool_options(),
+        )
+    return _redis_singleton
+
+async def provide_redis_bytes() -> Redis:
+    """
+    Cliente Redis *binário* (sem `decode_responses`).
+    Usado pelo `cached_json`, que grava o corpo da resposta já codificado (e às vezes comprimido).
+    """
+    global _redis_bytes_singleton
+    if _settings.redis_url is None:
+        logger.warning("REDIS_URL ausente", environment=_settings.environment)
+        raise RuntimeError("REDIS_URL obrigatório")
+    if _redis_bytes_singleton is None:
+        logger.info("Instanciando conexão Redis (binária)", url=_settings.redis_url)
+        _redis_bytes_singleton = Redis.from_url(
+            _settings.redis_url,
+            health_check_interval=30,
+            **_redis_pool_options(),
         )
-    return _redis_singleton
\ No newline at end of file
+    return _redis_bytes_singleton
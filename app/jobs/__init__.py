@@ -0,0 +1,7 @@
+# app/jobs/__init__.py
+# Fila de jobs durável (Redis Streams ou SQLite) + worker em processos separados.
+# Produtores: `provide_job_queue().enqueue(nome, payload)`; consumidores: `python -m app.jobs.worker`.
+from app.jobs.base import AbstractJobQueue, Job, RetryJob
+from app.jobs.registry import register_job, get_handler
+
+__all__ = ["AbstractJobQueue", "Job", "RetryJob", "register_job", "get_handler"]
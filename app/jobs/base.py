@@ -0,0 +1,65 @@
+# app/jobs/base.py
+import abc
+import random
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+class Job(BaseModel):
+    """Unidade de trabalho persistida na fila."""
+    id: str
+    name: str                                   # chave no registro de handlers (ex.: "forecast.refresh")
+    payload: dict[str, Any] = Field(default_factory=dict)
+    attempts: int = 0                           # execuções que já falharam
+    last_error: str | None = None
+    receipt: str | None = None                  # identificador da entrega (usado no ack); depende do backend
+
+class RetryJob(Exception):
+    """
+    Levantada pelo handler para pedir nova tentativa; `payload` (opcional)
+    substitui o original — ex.: repetir só os itens que falharam.
+    """
+    def __init__(self, message: str, payload: dict[str, Any] | None = None):
+        super().__init__(message)
+        self.payload = payload
+
+class AbstractJobQueue(abc.ABC):
+    """
+    Fila durável com confirmação explícita (*at-least-once*):
+
+    - `reserve` entrega jobs a um consumidor; sem `ack` dentro de `visibility_timeout`
+      (worker morreu), o job volta a ser entregue a outro consumidor.
+    - `retry` reagenda com atraso; `dead_letter` tira o job de circulação e guarda o erro.
+    """
+
+    @abc.abstractmethod
+    def enqueue(self, name: str, payload: dict[str, Any], *, delay: float = 0) -> str:
+        """Publica um job; devolve o id."""
+
+    @abc.abstractmethod
+    def reserve(self, consumer: str, count: int = 1, block_ms: int = 1000) -> list[Job]:
+        """Reserva até `count` jobs prontos (espera até `block_ms` se não houver nenhum)."""
+
+    @abc.abstractmethod
+    def ack(self, job: Job) -> None:
+        """Confirma a execução: o job sai da fila."""
+
+    @abc.abstractmethod
+    def retry(self, job: Job, delay: float, error: str) -> None:
+        """Reagenda o job (tentativas + 1) para daqui a `delay` s."""
+
+    @abc.abstractmethod
+    def dead_letter(self, job: Job, error: str) -> None:
+        """Move o job para a fila de mortos (não é mais entregue)."""
+
+    @abc.abstractmethod
+    def dead_letters(self, limit: int = 100) -> list[Job]:
+        """Jobs mortos, para inspeção/reprocessamento manual."""
+
+    @abc.abstractmethod
+    def pending(self) -> int:
+        """Jobs ainda não confirmados (prontos, agendados ou reservados)."""
+
+def backoff_delay(attempts: int, base: float, maximum: float) -> float:
+    """Exponencial com *full jitter*: aleatório em [0, min(max, base·2^tentativas)]."""
+    return random.uniform(0, min(maximum, base * 2 ** attempts))
@@ -0,0 +1,22 @@
+# app/jobs/handlers.py
+# Handlers dos jobs conhecidos. O worker importa este módulo para registrá-los.
+from typing import Any
+
+from structlog import get_logger
+
+from app.jobs.base import RetryJob
+from app.jobs.registry import register_job
+from app.services.forecast_queue import FORECAST_REFRESH_JOB, forecast_refresh_queue
+
+logger = get_logger().bind(module="job_handlers")
+
+@register_job(FORECAST_REFRESH_JOB)
+async def refresh_forecasts(payload: dict[str, Any]) -> None:
+    """
+    Atualiza o forecast de um lote de eventos (`{"event_ids": [...]}`) com o mesmo
+    agrupamento por cidade/horário da fila em processo. Grupos que falharam voltam
+    para a fila — só eles, não o lote inteiro.
+    """
+    failed = await forecast_refresh_queue.refresh(payload.get("event_ids", []))
+    if failed:
+        raise RetryJob(f"{len(failed)} evento(s) sem previsão", {"event_ids": sorted(failed)})
@@ -0,0 +1,123 @@
+# app/jobs/redis_streams.py
+import json
+import time
+import uuid
+from typing import Any
+
+from redis import Redis
+from redis.exceptions import ResponseError
+from structlog import get_logger
+
+from app.jobs.base import AbstractJobQueue, Job
+
+logger = get_logger().bind(module="jobs_redis")
+
+class RedisStreamJobQueue(AbstractJobQueue):
+    """
+    Fila sobre Redis Streams com *consumer group*.
+
+    - `jobs:<fila>`          stream com os jobs prontos (XADD / XREADGROUP / XACK + XDEL)
+    - `jobs:<fila>:delayed`  ZSET de jobs agendados (score = quando ficam prontos)
+    - `jobs:<fila>:dead`     stream de mortos (com o último erro)
+
+    Jobs entregues e não confirmados há mais de `visibility_timeout` (worker caiu) são
+    reivindicados por outro consumidor com XAUTOCLAIM.
+    """
+
+    def __init__(self, redis: Redis, queue: str = "default", *, group: str = "workers", visibility_timeout: float = 300):
+        self.redis = redis                    # cliente com decode_responses=True
+        self.stream = f"jobs:{queue}"
+        self.delayed_key = f"jobs:{queue}:delayed"
+        self.dead_key = f"jobs:{queue}:dead"
+        self.group = group
+        self.visibility_ms = int(visibility_timeout * 1000)
+        self._group_ready = False
+
+    # ---------------------------------------------------------------- produtor
+    def enqueue(self, name: str, payload: dict[str, Any], *, delay: float = 0) -> str:
+        job_id = uuid.uuid4().hex
+        self._publish({"id": job_id, "name": name, "payload": json.dumps(payload), "attempts": "0"}, delay)
+        return job_id
+
+    # ---------------------------------------------------------------- consumidor
+    def reserve(self, consumer: str, count: int = 1, block_ms: int = 1000) -> list[Job]:
+        self._ensure_group()
+        self._promote_due()
+
+        # 1) órfãos: entregues a um consumidor que não confirmou a tempo
+        _, entries, *_ = self.redis.xautoclaim(
+            self.stream, self.group, consumer, min_idle_time=self.visibility_ms, start_id="0-0", count=count,
+        )
+        entries = [e for e in entries if e and e[1]]
+        # 2) novos
+        if len(entries) < count:
+            response = self.redis.xreadgroup(
+                self.group, consumer, {self.stream: ">"},
+                count=count - len(entries), block=None if entries or block_ms <= 0 else block_ms,
+            )
+            for _, messages in response or []:
+                entries.extend(messages)
+        return [self._to_job(entry_id, fields) for entry_id, fields in entries]
+
+    def ack(self, job: Job) -> None:
+        with self.redis.pipeline() as pipe:
+            pipe.xack(self.stream, self.group, job.receipt)
+            pipe.xdel(self.stream, job.receipt)
+            pipe.execute()
+
+    def retry(self, job: Job, delay: float, error: str) -> None:
+        self._publish(self._fields(job, attempts=job.attempts + 1, error=error), delay)
+        self.ack(job)
+
+    def dead_letter(self, job: Job, error: str) -> None:
+        self.redis.xadd(self.dead_key, self._fields(job, attempts=job.attempts + 1, error=error), maxlen=10_000, approximate=True)
+        self.ack(job)
+        logger.error("Job movido para a fila de mortos", job_id=job.id, name=job.name, attempts=job.attempts + 1, error=error)
+
+    def dead_letters(self, limit: int = 100) -> list[Job]:
+        return [self._to_job(entry_id, fields) for entry_id, fields in self.redis.xrevrange(self.dead_key, count=limit)]
+
+    def pending(self) -> int:
+        # entradas confirmadas são apagadas (XDEL): o que sobra no stream ainda não terminou
+        return int(self.redis.xlen(self.stream)) + int(self.redis.zcard(self.delayed_key))
+
+    # ---------------------------------------------------------------- helpers
+    def _ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        try:
+            self.redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    def _publish(self, fields: dict[str, str], delay: float) -> None:
+        if delay > 0:
+            self.redis.zadd(self.delayed_key, {json.dumps(fields): time.time() + delay})
+        else:
+            self.redis.xadd(self.stream, fields)
+
+    def _promote_due(self, batch: int = 100) -> None:
+        """Agendados vencidos → stream. `ZREM` devolve 1 para um único worker, que publica."""
+        for member in self.redis.zrangebyscore(self.delayed_key, 0, time.time(), start=0, num=batch):
+            if self.redis.zrem(self.delayed_key, member):
+                self.redis.xadd(self.stream, json.loads(member))
+
+    @staticmethod
+    def _fields(job: Job, *, attempts: int, error: str) -> dict[str, str]:
+        return {
+            "id": job.id, "name": job.name, "payload": json.dumps(job.payload),
+            "attempts": str(attempts), "last_error": error[:1000],
+        }
+
+    @staticmethod
+    def _to_job(entry_id: str, fields: dict[str, str]) -> Job:
+        return Job(
+            id=fields["id"],
+            name=fields["name"],
+            payload=json.loads(fields["payload"]),
+            attempts=int(fields.get("attempts", 0)),
+            last_error=fields.get("last_error"),
+            receipt=entry_id,
+        )
@@ -0,0 +1,21 @@
+# app/jobs/registry.py
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+JobHandler = Callable[[dict[str, Any]], Awaitable[None]]
+
+# nome do job → coroutine que o executa (registrada via decorator nos módulos de handlers)
+_handlers: dict[str, JobHandler] = {}
+
+def register_job(name: str) -> Callable[[JobHandler], JobHandler]:
+    """Decorator: `@register_job("forecast.refresh")` em uma `async def handler(payload)`."""
+    def _decorator(fn: JobHandler) -> JobHandler:
+        _handlers[name] = fn
+        return fn
+    return _decorator
+
+def get_handler(name: str) -> JobHandler | None:
+    return _handlers.get(name)
+
+def registered_jobs() -> list[str]:
+    return sorted(_handlers)
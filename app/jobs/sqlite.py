@@ -0,0 +1,155 @@
+# app/jobs/sqlite.py
+import json
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+from structlog import get_logger
+
+from app.jobs.base import AbstractJobQueue, Job
+
+logger = get_logger().bind(module="jobs_sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id             TEXT PRIMARY KEY,
+    queue          TEXT    NOT NULL,
+    name           TEXT    NOT NULL,
+    payload        TEXT    NOT NULL,
+    attempts       INTEGER NOT NULL DEFAULT 0,
+    last_error     TEXT,
+    available_at   REAL    NOT NULL,
+    reserved_by    TEXT,
+    reserved_until REAL,
+    dead           INTEGER NOT NULL DEFAULT 0,
+    created_at     REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_ready ON jobs (queue, dead, available_at);
+"""
+
+class SQLiteJobQueue(AbstractJobQueue):
+    """
+    Fila local em SQLite (WAL) para instalação em um único nó — sobrevive a restart
+    sem depender de Redis.
+
+    `reserve` marca os jobs com um token de entrega e um prazo (`reserved_until`) dentro de
+    `BEGIN IMMEDIATE`, então dois processos nunca pegam o mesmo job; vencido o prazo sem
+    `ack`, o job volta a ficar disponível.
+    """
+
+    def __init__(self, path: str | Path, queue: str = "default", *, visibility_timeout: float = 300, poll_interval: float = 0.2):
+        self.path = str(path)
+        self.queue = queue
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # uma conexão por operação: seguro entre threads e processos
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # ---------------------------------------------------------------- produtor
+    def enqueue(self, name: str, payload: dict[str, Any], *, delay: float = 0) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, queue, name, payload, available_at, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, self.queue, name, json.dumps(payload), now + max(delay, 0), now),
+            )
+        return job_id
+
+    # ---------------------------------------------------------------- consumidor
+    def reserve(self, consumer: str, count: int = 1, block_ms: int = 1000) -> list[Job]:
+        deadline = time.monotonic() + block_ms / 1000
+        while True:
+            jobs = self._try_reserve(consumer, count)
+            if jobs or time.monotonic() >= deadline:
+                return jobs
+            time.sleep(min(self.poll_interval, max(deadline - time.monotonic(), 0)))
+
+    def _try_reserve(self, consumer: str, count: int) -> list[Job]:
+        now = time.time()
+        receipt = f"{consumer}:{uuid.uuid4().hex}"
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    """
+                    SELECT * FROM jobs
+                     WHERE queue = ? AND dead = 0 AND available_at <= ?
+                       AND (reserved_until IS NULL OR reserved_until < ?)
+                     ORDER BY available_at
+                     LIMIT ?
+                    """,
+                    (self.queue, now, now, count),
+                ).fetchall()
+                conn.executemany(
+                    "UPDATE jobs SET reserved_by = ?, reserved_until = ? WHERE id = ?",
+                    [(receipt, now + self.visibility_timeout, row["id"]) for row in rows],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return [self._to_job(row, receipt) for row in rows]
+
+    def ack(self, job: Job) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM jobs WHERE id = ? AND reserved_by = ?", (job.id, job.receipt))
+
+    def retry(self, job: Job, delay: float, error: str) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute(
+                """
+                UPDATE jobs
+                   SET attempts = ?, last_error = ?, payload = ?, available_at = ?,
+                       reserved_by = NULL, reserved_until = NULL
+                 WHERE id = ? AND reserved_by = ?
+                """,
+                (job.attempts + 1, error[:1000], json.dumps(job.payload), time.time() + max(delay, 0), job.id, job.receipt),
+            )
+
+    def dead_letter(self, job: Job, error: str) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute(
+                """
+                UPDATE jobs
+                   SET dead = 1, attempts = ?, last_error = ?, payload = ?,
+                       reserved_by = NULL, reserved_until = NULL
+                 WHERE id = ? AND reserved_by = ?
+                """,
+                (job.attempts + 1, error[:1000], json.dumps(job.payload), job.id, job.receipt),
+            )
+        logger.error("Job movido para a fila de mortos", job_id=job.id, name=job.name, attempts=job.attempts + 1, error=error)
+
+    def dead_letters(self, limit: int = 100) -> list[Job]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT * FROM jobs WHERE queue = ? AND dead = 1 ORDER BY created_at DESC LIMIT ?",
+                (self.queue, limit),
+            ).fetchall()
+        return [self._to_job(row) for row in rows]
+
+    def pending(self) -> int:
+        with closing(self._connect()) as conn:
+            (total,) = conn.execute("SELECT COUNT(*) FROM jobs WHERE queue = ? AND dead = 0", (self.queue,)).fetchone()
+        return total
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row, receipt: str | None = None) -> Job:
+        return Job(
+            id=row["id"],
+            name=row["name"],
+            payload=json.loads(row["payload"]),
+            attempts=row["attempts"],
+            last_error=row["last_error"],
+            receipt=receipt,
+        )
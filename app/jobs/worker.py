@@ -0,0 +1,202 @@
+# app/jobs/worker.py
+"""
+Worker da fila de jobs: `python -m app.jobs.worker [--processes N] [--concurrency M]`.
+
+O processo pai sobe N processos filhos (spawn) e os reinicia se morrerem; cada filho
+roda um event loop com até M jobs simultâneos. SIGTERM/SIGINT no pai repassa o sinal:
+os filhos param de reservar, terminam os jobs em andamento e saem.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import time
+
+from structlog import get_logger
+
+from app.core.config import get_settings
+from app.core.metrics import JOBS_PROCESSED
+from app.jobs.base import AbstractJobQueue, Job, RetryJob, backoff_delay
+from app.jobs.registry import get_handler
+
+logger = get_logger().bind(module="jobs_worker")
+
+_settings = get_settings()
+
+async def execute_job(
+    queue: AbstractJobQueue,
+    job: Job,
+    *,
+    max_attempts: int,
+    backoff_base: float,
+    backoff_max: float,
+) -> str:
+    """Roda o handler do job e confirma, reagenda ou mata conforme o resultado; devolve ok | retry | dead."""
+    handler = get_handler(job.name)
+    if handler is None:
+        await asyncio.to_thread(queue.dead_letter, job, f"job desconhecido: {job.name}")
+        JOBS_PROCESSED.labels(job.name, "dead").inc()
+        return "dead"
+
+    try:
+        await handler(job.payload)
+    except RetryJob as e:
+        if e.payload is not None:
+            job.payload = e.payload
+        error = str(e)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    else:
+        await asyncio.to_thread(queue.ack, job)
+        JOBS_PROCESSED.labels(job.name, "ok").inc()
+        return "ok"
+
+    if job.attempts + 1 >= max_attempts:
+        await asyncio.to_thread(queue.dead_letter, job, error)
+        JOBS_PROCESSED.labels(job.name, "dead").inc()
+        return "dead"
+
+    delay = backoff_delay(job.attempts, backoff_base, backoff_max)
+    logger.warning("Job falhou; nova tentativa agendada", job_id=job.id, name=job.name, attempt=job.attempts + 1, delay=round(delay, 2), error=error)
+    await asyncio.to_thread(queue.retry, job, delay, error)
+    JOBS_PROCESSED.labels(job.name, "retry").inc()
+    return "retry"
+
+async def run_worker(
+    queue: AbstractJobQueue,
+    *,
+    consumer: str,
+    concurrency: int = 4,
+    max_attempts: int = 5,
+    backoff_base: float = 5.0,
+    backoff_max: float = 600.0,
+    block_ms: int = 1000,
+    stop: asyncio.Event | None = None,
+    stop_when_empty: bool = False,
+) -> int:
+    """
+    Laço de consumo: reserva até `concurrency` jobs por vez e os executa em paralelo.
+    Para quando `stop` é sinalizado (ou, com `stop_when_empty`, quando não houver mais
+    nada pronto); devolve quantos jobs foram executados.
+    """
+    stop = stop or asyncio.Event()
+    in_flight: set[asyncio.Task] = set()
+    executed = 0
+
+    while not stop.is_set():
+        free = concurrency - len(in_flight)
+        if free <= 0:
+            await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            continue
+        # reserva bloqueante (BLOCK / polling) fora do loop
+        try:
+            jobs = await asyncio.to_thread(queue.reserve, consumer, free, 0 if in_flight else block_ms)
+        except Exception as e:
+            logger.error("Falha ao reservar jobs", consumer=consumer, error=str(e))
+            await asyncio.sleep(block_ms / 1000)
+            continue
+        if not jobs:
+            if in_flight:
+                await asyncio.wait(in_flight, timeout=block_ms / 1000, return_when=asyncio.FIRST_COMPLETED)
+            elif stop_when_empty:
+                break
+            continue
+        for job in jobs:
+            task = asyncio.create_task(execute_job(
+                queue, job, max_attempts=max_attempts, backoff_base=backoff_base, backoff_max=backoff_max,
+            ))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+            executed += 1
+
+    if in_flight:
+        await asyncio.gather(*in_flight, return_exceptions=True)
+    return executed
+
+# ──────────────────────────────────────────────────────
+# processos
+# ──────────────────────────────────────────────────────
+async def _child_main(index: int, concurrency: int) -> None:
+    import app.jobs.handlers  # noqa: F401  (registra os handlers)
+    from app.deps import provide_job_queue
+    from app.services.http_client import start_http_client, close_http_client
+
+    queue = provide_job_queue()
+    if queue is None:
+        raise SystemExit("JOBS_BACKEND=inline: não há fila para consumir (use redis ou sqlite)")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    consumer = f"{socket.gethostname()}:{os.getpid()}:{index}"
+    logger.info("Worker de jobs iniciado", consumer=consumer, concurrency=concurrency)
+    await start_http_client()
+    try:
+        await run_worker(
+            queue,
+            consumer=consumer,
+            concurrency=concurrency,
+            max_attempts=_settings.jobs_max_attempts,
+            backoff_base=_settings.jobs_backoff_base_s,
+            backoff_max=_settings.jobs_backoff_max_s,
+            block_ms=_settings.jobs_block_ms,
+            stop=stop,
+        )
+    finally:
+        await close_http_client()
+        logger.info("Worker de jobs encerrado", consumer=consumer)
+
+def _child(index: int, concurrency: int) -> None:
+    from app.core.logging_config import configure_logging
+
+    configure_logging()
+    asyncio.run(_child_main(index, concurrency))
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Worker da fila de jobs")
+    parser.add_argument("--processes", type=int, default=_settings.jobs_worker_processes)
+    parser.add_argument("--concurrency", type=int, default=_settings.jobs_worker_concurrency)
+    args = parser.parse_args(argv)
+    if _settings.jobs_backend == "inline":
+        parser.error("JOBS_BACKEND=inline: não há fila para consumir (use redis ou sqlite)")
+
+    ctx = multiprocessing.get_context("spawn")
+    children: dict[int, multiprocessing.Process] = {}
+    stopping = False
+
+    def _spawn(index: int) -> None:
+        proc = ctx.Process(target=_child, args=(index, args.concurrency), name=f"jobs-worker-{index}")
+        proc.start()
+        children[index] = proc
+
+    def _shutdown(signum, _frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for proc in children.values():
+            if proc.is_alive():
+                os.kill(proc.pid, signum)
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    for i in range(args.processes):
+        _spawn(i)
+    logger.info("Pool de workers de jobs no ar", processes=args.processes, backend=_settings.jobs_backend)
+
+    while children:
+        for index, proc in list(children.items()):
+            proc.join(timeout=0.5)
+            if proc.is_alive():
+                continue
+            del children[index]
+            if not stopping:
+                logger.warning("Worker de jobs morreu; reiniciando", index=index, exitcode=proc.exitcode)
+                time.sleep(1)
+                _spawn(index)
+
+if __name__ == "__main__":
+    main()
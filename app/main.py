@@ -15,6 +15,15 @@ from app.api.v1.api_router import router as api_router
 from app.core.logging_config import configure_logging
 from app.core.exception_handlers import db_connection_exception_handler
 from app.core.tracing_config import configure_tracing
+from app.core.config import get_settings
+from app.deps import provide_local_info_service, provide_redis
+from app.services.cache_warmup import warm_up_cache, venue_hits
+from app.services.forecast_queue import forecast_refresh_queue
+from app.services.forecast_sweeper import forecast_sweeper
+from app.services.http_client import start_http_client, close_http_client
+from app.services.token_cache import verified_tokens
+from app.utils.blocking import shutdown_blocking_executor
+from app.utils.service_url import service_urls
 
 from app.middleware.logging_middleware import LoggingMiddleware
 from app.middleware.secure_headers import SecureHeadersMiddleware
@@ -27,6 +36,16 @@ logger = get_logger().bind(app="FastTrackAPI", env="dev")
 
 uvicorn_log = logging.getLogger("uvicorn.error")   # <- o mesmo que imprime “INFO: …”
 
+async def _service_urls_redis():
+    if not get_settings().service_urls_pubsub or not get_settings().redis_url:
+        return None
+    return await provide_redis()
+
+async def _token_cache_redis():
+    if not get_settings().auth_token_cache_pubsub or not get_settings().redis_url:
+        return None
+    return await provide_redis()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 🔹 CÓDIGO DE STARTUP  (executa antes do app ficar pronto)
@@ -42,9 +61,40 @@ async def lifespan(app: FastAPI):
         #             url=f"http://{host}:{port}{app.redoc_url}")
         uvicorn_log.info("ReDoc (documentação): %s%s",
                          f"http://{host}:{port}", app.redoc_url)
+
+    # 🌐 pool HTTP compartilhado pelos clientes de APIs externas
+    await start_http_client()
+
+    # 🔗 URLs de serviços: mtime do runtime_urls.json + pub/sub entre workers
+    await service_urls.start(await _service_urls_redis())
+
+    # 🔑 cache de tokens: invalidações (remoção, troca de papéis) valem para todos os workers
+    await verified_tokens.start(await _token_cache_redis())
+
+    # 🏛️ índice de locais (nome e autocomplete) montado antes do primeiro request
+    local_info_service = provide_local_info_service()
+    if hasattr(local_info_service, "build_suggest_index"):
+        local_info_service.build_suggest_index()
+
+    # 🌦️ fila de atualização de forecast (um despachante por processo)
+    await forecast_refresh_queue.start()
+    if get_settings().forecast_sweep_enabled:
+        await forecast_sweeper.start()   # previsões antigas são renovadas aqui, não no GET
+
+    # 🔥 aquece o cache antes de aceitar tráfego (com limite de tempo)
+    if get_settings().cache_warmup_enabled:
+        await warm_up_cache()
+    await venue_hits.start()         # contador de /local_info → Redis em lote
     yield          # ← FastAPI levanta o app aqui
     
     # 🔸 CÓDIGO DE SHUTDOWN  (executa quando o servidor está parando)
+    await venue_hits.stop()
+    await forecast_sweeper.stop()
+    await forecast_refresh_queue.stop()
+    await verified_tokens.stop()
+    await service_urls.stop()
+    await close_http_client()
+    shutdown_blocking_executor()
     logger.info("Aplicação finalizada.")
 
 app = FastAPI(
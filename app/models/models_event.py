@@ -15,16 +15,17 @@ class ModelsEvent(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(100), nullable=False)
     description = Column(String, nullable=False)
-    event_date = Column(DateTime, nullable=False)
+    event_date = Column(DateTime, nullable=False, index=True)   # varredura de previsões por faixa de data
     city = Column(String, nullable=False)
     # participants = Column(ARRAY(String), nullable=False, server_default="{}") # type: ignore[var-annotated]  # TODO verificar se alteração funcionou
     participants: Mapped[list[str]] = Column(  # type: ignore[assignment]
         ARRAY(String), nullable=False, server_default="{}"
     )
     views = Column(Integer, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=True)   # última escrita no conteúdo (Last-Modified); views++ não conta
 
     local_info_id = Column(Integer, ForeignKey('local_infos.id'))
-    forecast_info_id = Column(Integer, ForeignKey('forecast_infos.id'))
+    forecast_info_id = Column(Integer, ForeignKey('forecast_infos.id'), index=True)   # previsão compartilhada por cidade/slot
 
     # local_info = relationship("LocalInfo", back_populates="events")   # TODO verificar se alteração funcionou
     # forecast_info = relationship("ForecastInfo", back_populates="events")  # TODO verificar se alteração funcionou
@@ -1,5 +1,5 @@
 # models_forecast_info.py
-from sqlalchemy import Column, Integer, DateTime, Float, String
+from sqlalchemy import Column, Integer, DateTime, Float, String, UniqueConstraint
 # from sqlalchemy.orm import relationship  # TODO verificar se alteração funcionou
 from sqlalchemy.orm import Mapped, relationship
 from typing import TYPE_CHECKING
@@ -11,14 +11,18 @@ if TYPE_CHECKING:
 
 class ModelsForecastInfo(Base):
     __tablename__ = 'forecast_infos'
+    # uma linha por (cidade, slot do provedor), compartilhada por todos os eventos que caem nela
+    __table_args__ = (UniqueConstraint("city", "forecast_datetime", name="uq_forecast_infos_city_slot"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    forecast_datetime = Column(DateTime, nullable=False)
+    city = Column(String, nullable=False)                        # normalizada (minúsculas, espaços colapsados)
+    forecast_datetime = Column(DateTime, nullable=False)         # slot do provedor, UTC
     temperature = Column(Float, nullable=True)
     weather_main = Column(String, nullable=False)
     weather_desc = Column(String, nullable=False)
     humidity = Column(Integer, nullable=False)
     wind_speed = Column(Float, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=True)   # última atualização (varredura de previsões antigas)
 
     # events = relationship("Event", back_populates="forecast_info") # TODO verificar se alteração corrigiu
     # events: Mapped[list["Event"]] = relationship(back_populates="forecast_info")
@@ -1,9 +1,17 @@
 # app/repositories/evento.py
 import abc
+from collections.abc import Sequence
+from datetime import datetime
 from app.schemas.event_create import EventCreate
 from app.schemas.event_create import EventResponse
+from app.schemas.weather_forecast import ForecastInfoResponse
+from app.utils.h_events import ensure_aware
 # from app.schemas.weather_forecast import ForecastInfo      # TODO
 
+# Campos que mudam a cada leitura (GET /events/{id}): não invalidam as listas nem contam
+# como modificação do evento (`updated_at`) — mesma regra das tags do `cached_json`.
+VOLATILE_FIELDS = frozenset({"views"})
+
 class AbstractEventRepo(abc.ABC):
     @abc.abstractmethod
     def list_all(self) -> list[EventResponse]:
@@ -57,4 +65,42 @@ class AbstractEventRepo(abc.ABC):
     @abc.abstractmethod
     def update(self, evento_id: int, data: dict) -> EventResponse:
         """."""
-    
+
+    def list_stale_forecasts(
+        self,
+        *,
+        start: datetime,
+        end: datetime,
+        stale_before: datetime,
+        limit: int = 100,
+    ) -> list[EventResponse]:
+        """
+        Eventos com `start <= event_date < end` cujo `forecast_info` está ausente ou
+        foi atualizado antes de `stale_before`, em ordem de data (os mais próximos primeiro).
+        Implementação genérica (varredura completa); os repositórios concretos usam índice.
+        """
+        upcoming = sorted(
+            (e for e in self.list_all() if start <= ensure_aware(e.event_date) < end),
+            key=lambda e: ensure_aware(e.event_date),
+        )
+        return [e for e in upcoming if _forecast_is_stale(e, stale_before)][:limit]
+
+    def upsert_city_forecasts(
+        self,
+        city: str,
+        forecasts: Sequence[tuple[ForecastInfoResponse, Sequence[int]]],
+    ) -> None:
+        """
+        Grava as previsões de uma cidade — uma por slot (`forecast_datetime`) — e associa
+        cada uma aos eventos listados. Implementação genérica (evento a evento, todos
+        apontando para o mesmo objeto); o repositório SQL faz um único upsert por cidade.
+        """
+        for forecast, event_ids in forecasts:
+            for event_id in event_ids:
+                if (event := self.get(event_id)) is not None:
+                    event.forecast_info = forecast
+                    self.replace_by_id(event_id, event)
+
+def _forecast_is_stale(event: EventResponse, stale_before: datetime) -> bool:
+    info = event.forecast_info
+    return info is None or info.updated_at is None or ensure_aware(info.updated_at) < stale_before
@@ -0,0 +1,181 @@
+# app/repositories/event_cached.py
+import json
+import hashlib
+from collections.abc import Sequence
+from pydantic import TypeAdapter
+from redis import Redis
+from structlog import get_logger
+
+from app.schemas.event_create import EventCreate, EventResponse
+from app.schemas.weather_forecast import ForecastInfoResponse
+from app.repositories.event import AbstractEventRepo, VOLATILE_FIELDS
+from app.core.metrics import REPO_CACHE_REQUESTS
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError, redis_breaker
+
+logger = get_logger().bind(module="event_cached")
+
+_LIST_ADAPTER = TypeAdapter(list[EventResponse])
+
+class CachedEventRepo(AbstractEventRepo):
+    """
+    *Decorator* de repositório: cache read-through no Redis em volta de qualquer
+    `AbstractEventRepo` (memória ou SQL).
+
+    - `get`: chave por evento (`repo:event:<id>`), gravada também nas escritas (write-through).
+    - `list_all` / `list_partial`: chave por filtros + contador de versão da coleção
+      (`repo:events:version`); qualquer escrita faz `INCR` e as listas antigas expiram sozinhas.
+    - Redis indisponível ⇒ tudo vai direto para o repositório interno. Toda chamada passa
+      pelo disjuntor do Redis (`redis_breaker`): aberto ⇒ nem tenta, sem esperar o timeout.
+    - Cliente Redis síncrono, como o resto do repositório: endpoints `async` chamam via
+      `run_blocking` (app/utils/blocking.py) para não travar o event loop.
+    """
+
+    ENTITY_KEY = "repo:event:{}"
+    VERSION_KEY = "repo:events:version"
+    LIST_KEY = "repo:events:list:v{}:{}"
+
+    def __init__(
+        self, inner: AbstractEventRepo, redis: Redis, ttl: int = 300, list_ttl: int = 30,
+        breaker: CircuitBreaker = redis_breaker,
+    ):
+        self.inner = inner
+        self.redis = redis
+        self.breaker = breaker
+        self.ttl = ttl
+        self.list_ttl = list_ttl
+
+    # ---------------------------------------------------------------- leitura
+    def get(self, event_id: int) -> EventResponse | None:
+        key = self.ENTITY_KEY.format(event_id)
+        try:
+            with self.breaker.guard():
+                raw = self.redis.get(key)
+            if raw is not None:
+                REPO_CACHE_REQUESTS.labels("get", "hit").inc()
+                return EventResponse.model_validate_json(raw)
+            REPO_CACHE_REQUESTS.labels("get", "miss").inc()
+        except CircuitOpenError:
+            REPO_CACHE_REQUESTS.labels("get", "bypass").inc()
+            return self.inner.get(event_id)
+        except Exception as e:
+            REPO_CACHE_REQUESTS.labels("get", "error").inc()
+            logger.warning("Erro ao ler evento do cache", event_id=event_id, error=str(e))
+            return self.inner.get(event_id)
+
+        event = self.inner.get(event_id)
+        if event is not None:
+            self._store(event)
+        return event
+
+    def list_all(self) -> list[EventResponse]:
+        return self._cached_list("list_all", {}, self.inner.list_all)
+
+    def list_partial(self, *, skip: int = 0, limit: int = 20, **filters) -> list[EventResponse]:
+        params = {"skip": skip, "limit": limit, **filters}
+        return self._cached_list(
+            "list_partial", params,
+            lambda: self.inner.list_partial(skip=skip, limit=limit, **filters),
+        )
+
+    def list_stale_forecasts(self, **kwargs) -> list[EventResponse]:
+        # consulta operacional da varredura de previsões: sempre no repositório interno
+        return self.inner.list_stale_forecasts(**kwargs)
+
+    # ---------------------------------------------------------------- escrita
+    def add(self, event: EventCreate) -> EventResponse:
+        result = self.inner.add(event)
+        self._store(result)
+        self._bump_version()
+        return result
+
+    def update(self, event_id: int, data: dict) -> EventResponse:
+        result = self.inner.update(event_id, data)
+        self._store(result, event_id)
+        if not set(data) <= VOLATILE_FIELDS:
+            self._bump_version()
+        return result
+
+    def replace_by_id(self, event_id: int, event: EventResponse) -> EventResponse:
+        result = self.inner.replace_by_id(event_id, event)
+        self._store(result, event_id)
+        self._bump_version()
+        return result
+
+    def upsert_city_forecasts(self, city: str, forecasts: Sequence[tuple[ForecastInfoResponse, Sequence[int]]]) -> None:
+        self.inner.upsert_city_forecasts(city, forecasts)
+        event_ids = [event_id for _, ids in forecasts for event_id in ids]
+        if event_ids:
+            self._safe("delete", self.redis.delete, *(self.ENTITY_KEY.format(i) for i in event_ids))
+            self._bump_version()
+
+    def replace_all(self, events: list[EventResponse]) -> list[EventResponse]:
+        result = self.inner.replace_all(events)
+        self._drop_entities()
+        self._bump_version()
+        return result
+
+    def delete_by_id(self, event_id: int) -> bool:
+        result = self.inner.delete_by_id(event_id)
+        self._safe("delete", self.redis.delete, self.ENTITY_KEY.format(event_id))
+        self._bump_version()
+        return result
+
+    def delete_all(self) -> None:
+        self.inner.delete_all()
+        self._drop_entities()
+        self._bump_version()
+
+    # ---------------------------------------------------------------- helpers
+    def _cached_list(self, op: str, params: dict, load) -> list[EventResponse]:
+        try:
+            with self.breaker.guard():
+                version = int(self.redis.get(self.VERSION_KEY) or 0)
+            canonical = json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+            digest = hashlib.blake2b(f"{op}:{canonical}".encode(), digest_size=16).hexdigest()
+            key = self.LIST_KEY.format(version, digest)
+            with self.breaker.guard():
+                raw = self.redis.get(key)
+            if raw is not None:
+                REPO_CACHE_REQUESTS.labels(op, "hit").inc()
+                return _LIST_ADAPTER.validate_json(raw)
+            REPO_CACHE_REQUESTS.labels(op, "miss").inc()
+        except CircuitOpenError:
+            REPO_CACHE_REQUESTS.labels(op, "bypass").inc()
+            return load()
+        except Exception as e:
+            REPO_CACHE_REQUESTS.labels(op, "error").inc()
+            logger.warning("Erro ao ler lista de eventos do cache", op=op, error=str(e))
+            return load()
+
+        events = load()
+        self._safe("set", self.redis.set, key, _LIST_ADAPTER.dump_json(events), ex=self.list_ttl)
+        return events
+
+    def _store(self, event: EventResponse | None, event_id: int | None = None) -> None:
+        """Write-through da entidade; sem retorno do repositório interno, apenas invalida."""
+        if event is None:
+            if event_id is not None:
+                self._safe("delete", self.redis.delete, self.ENTITY_KEY.format(event_id))
+            return
+        self._safe("set", self.redis.set, self.ENTITY_KEY.format(event.id), event.model_dump_json(), ex=self.ttl)
+
+    def _bump_version(self) -> None:
+        self._safe("incr", self.redis.incr, self.VERSION_KEY)
+
+    def _drop_entities(self) -> None:
+        # operações em massa (raras): apaga todas as entidades individuais
+        def _drop() -> None:
+            keys = list(self.redis.scan_iter(match=self.ENTITY_KEY.format("*"), count=500))
+            if keys:
+                self.redis.delete(*keys)
+        self._safe("drop", _drop)
+
+    def _safe(self, op: str, fn, *args, **kwargs) -> None:
+        try:
+            with self.breaker.guard():
+                fn(*args, **kwargs)
+        except CircuitOpenError:
+            logger.debug("Disjuntor do Redis aberto; cache do repositório não atualizado", op=op)
+        except Exception as e:
+            # escrita já foi feita no repositório; o pior caso é servir o valor antigo até o TTL
+            logger.warning("Erro ao atualizar cache do repositório", op=op, error=str(e))
@@ -1,10 +1,13 @@
 # app/repositories/event_mem.py
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
 from structlog import get_logger
 
 from app.schemas.event_create import EventCreate, EventResponse
 # from app.schemas.weather_forecast import ForecastInfo      # TODO
 
-from app.repositories.event import AbstractEventRepo
+from app.repositories.event import AbstractEventRepo, VOLATILE_FIELDS, _forecast_is_stale
+from app.utils.h_events import ensure_aware
 
 logger = get_logger().bind(module="event_mem")
 
@@ -12,6 +15,9 @@ class InMemoryEventRepo(AbstractEventRepo):
     def __init__(self):
         self._db: dict[int, EventResponse] = {}
         self._id_counter = 1
+        # índice ordenado por data: (event_date, id) — consultas por intervalo via bisect
+        self._by_date: list[tuple[datetime, int]] = []
+        self._indexed: dict[int, tuple[datetime, int]] = {}
 
     def list_all(self) -> list[EventResponse]:
         logger.info("Listando todos os eventos", total=len(self._db))
@@ -71,19 +77,25 @@ class InMemoryEventRepo(AbstractEventRepo):
             local_info=event.local_info,
             # forecast_info=forecast_info,
             forecast_info=None,
+            updated_at=datetime.now(timezone.utc),
         )
         self._db[self._id_counter] = event_resp
+        self._reindex(event_resp)
         logger.info("Evento adicionado", event_id=self._id_counter, title=event.title, city=event.city, date=event.event_date)
         self._id_counter += 1
         return event_resp
 
     def replace_all(self, events: list[EventResponse]) -> list[EventResponse]:
-        self._db = {e.id: e for e in events}
+        now = datetime.now(timezone.utc)
+        self._db = {e.id: e.model_copy(update={"updated_at": now}) for e in events}
+        self._rebuild_index()
         logger.info("Todos os eventos foram substituídos", total=len(events))
         return list(self._db.values())
 
     def replace_by_id(self, event_id: int, event: EventResponse) -> EventResponse:
+        event.updated_at = datetime.now(timezone.utc)
         self._db[event_id] = event
+        self._reindex(event, event_id)
         logger.info("Evento substituído", event_id=event_id)
         return event
     
@@ -92,6 +104,7 @@ class InMemoryEventRepo(AbstractEventRepo):
         """Remove todos os eventos e zera o contador de IDs (usado em testes)."""
         self._db.clear()
         self._id_counter = 1
+        self._rebuild_index()
         logger.info("Repositório de eventos limpo")
     # -----------------------------------------------------------------
 
@@ -99,10 +112,12 @@ class InMemoryEventRepo(AbstractEventRepo):
         """Remove todos os eventos e zera o contador de IDs (usado em testes)."""
         self._db.clear()
         self._id_counter = 1
+        self._rebuild_index()
         logger.info("Todos os eventos foram deletados")
 
     def delete_by_id(self, event_id: int) -> bool:
         result = self._db.pop(event_id, None)
+        self._unindex(event_id)
         if result:
             logger.info("Evento deletado", event_id=event_id)
             return True
@@ -116,6 +131,51 @@ class InMemoryEventRepo(AbstractEventRepo):
             raise ValueError("Evento não encontrado")
         for key, value in data.items():
             setattr(existing, key, value)
+        if not set(data) <= VOLATILE_FIELDS:
+            existing.updated_at = datetime.now(timezone.utc)
         self._db[event_id] = existing
+        if "event_date" in data:
+            self._reindex(existing)
         logger.info("Evento atualizado", event_id=event_id, campos=list(data.keys()))
         return existing
+
+    def list_stale_forecasts(
+        self,
+        *,
+        start: datetime,
+        end: datetime,
+        stale_before: datetime,
+        limit: int = 100,
+    ) -> list[EventResponse]:
+        """Percorre só a faixa `[start, end)` do índice por data (bisect), parando em `limit`."""
+        result: list[EventResponse] = []
+        i = bisect_left(self._by_date, (ensure_aware(start), -1))
+        end = ensure_aware(end)
+        while i < len(self._by_date) and len(result) < limit:
+            event_date, event_id = self._by_date[i]
+            if event_date >= end:
+                break
+            event = self._db[event_id]
+            if _forecast_is_stale(event, stale_before):
+                result.append(event)
+            i += 1
+        return result
+
+    # ---------------------------------------------------------------- índice por data
+    def _reindex(self, event: EventResponse, event_id: int | None = None) -> None:
+        event_id = event.id if event_id is None else event_id
+        self._unindex(event_id)
+        entry = (ensure_aware(event.event_date), event_id)
+        insort(self._by_date, entry)
+        self._indexed[event_id] = entry
+
+    def _unindex(self, event_id: int) -> None:
+        entry = self._indexed.pop(event_id, None)
+        if entry is not None:
+            i = bisect_left(self._by_date, entry)
+            if i < len(self._by_date) and self._by_date[i] == entry:
+                del self._by_date[i]
+
+    def _rebuild_index(self) -> None:
+        self._indexed = {event_id: (ensure_aware(e.event_date), event_id) for event_id, e in self._db.items()}
+        self._by_date = sorted(self._indexed.values())
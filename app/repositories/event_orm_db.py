@@ -1,17 +1,23 @@
 # app/repositories/event_orm_db.py
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from sqlalchemy import or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from structlog import get_logger
 
 from app.schemas.event_create import EventCreate, EventResponse
+from app.schemas.weather_forecast import ForecastInfoResponse
+from app.utils.h_events import ensure_aware, normalize_city
 # from app.schemas.weather_forecast import ForecastInfo
 
 # from app.schemas.event_update import ForecastInfoUpdate      # TODO
 
-from app.repositories.event import AbstractEventRepo
+from app.repositories.event import AbstractEventRepo, VOLATILE_FIELDS
 
 from app.models.models_event import ModelsEvent
 from app.models.models_local_info import ModelsLocalInfo
-# from app.models.models_forecast_info import ModelsForecastInfo
+from app.models.models_forecast_info import ModelsForecastInfo
 
 logger = get_logger().bind(module="repo_eventos")
 
@@ -72,7 +78,8 @@ class SQLEventRepo(AbstractEventRepo):
             description=event.description,
             event_date=event.event_date,
             city=event.city,
-            participants=event.participants or []
+            participants=event.participants or [],
+            updated_at=datetime.now(timezone.utc),
         )
 
         # Associa local_info (se estiver presente no EventCreate)
@@ -96,6 +103,10 @@ class SQLEventRepo(AbstractEventRepo):
         """
         Substitui completamente os dados de um evento existente por novos valores, 
         aproveitando local_info/forecast_info se existentes.
+
+        `forecast_info` do cliente não é gravado: a linha (cidade, slot) é compartilhada e só
+        muda por `upsert_city_forecasts`. Aqui o evento só passa a apontar para a linha do
+        slot informado, se ela já existir.
         """
         db_event = self.db.query(ModelsEvent).filter(ModelsEvent.id == event_id).first()
         if not db_event:
@@ -109,6 +120,16 @@ class SQLEventRepo(AbstractEventRepo):
             if key == "local_info" and value is not None:
                 logger.debug("Atualizando local_info", event_id=event_id)
                 db_event.local_info = ModelsLocalInfo(**value)
+            elif key == "forecast_info" and value is not None:
+                # linha compartilhada por (cidade, slot): só repontar, nunca sobrescrever com dados do cliente
+                forecast_id = self.db.scalar(
+                    select(ModelsForecastInfo.id).where(
+                        ModelsForecastInfo.city == normalize_city(event.city),
+                        ModelsForecastInfo.forecast_datetime == _slot(value["forecast_datetime"]),
+                    )
+                )
+                if forecast_id is not None:
+                    db_event.forecast_info_id = forecast_id
             # elif key == "forecast_info":
             #     try:
             #         service: AbstractForecastService = Depends(provide_forecast_service)
@@ -123,6 +144,7 @@ class SQLEventRepo(AbstractEventRepo):
             # else:
             elif key in {"title", "description", "event_date", "city", "participants", "views"}:
                 setattr(db_event, key, value)
+        db_event.updated_at = datetime.now(timezone.utc)
         
         self.db.commit()
         self.db.refresh(db_event)
@@ -133,13 +155,15 @@ class SQLEventRepo(AbstractEventRepo):
         Remove todos os eventos existentes e insere os novos.
         """
         self.db.query(ModelsEvent).delete()
+        now = datetime.now(timezone.utc)
         simplified = [
             ModelsEvent(
                 title=e.title,
                 description=e.description,
                 event_date=e.event_date,
                 city=e.city,
-                participants=e.participants
+                participants=e.participants,
+                updated_at=now,
             )
             for e in events
         ]
@@ -168,10 +192,74 @@ class SQLEventRepo(AbstractEventRepo):
         Atualiza campos específicos de um evento via dicionário (`data`).
         """
         data = _clean_update_data(data)
+        if not set(data) <= VOLATILE_FIELDS:
+            data["updated_at"] = datetime.now(timezone.utc)
         self.db.query(ModelsEvent).filter(ModelsEvent.id == event_id).update(data)
         self.db.commit()
         return self.get(event_id)
 
+    def upsert_city_forecasts(
+        self,
+        city: str,
+        forecasts: Sequence[tuple[ForecastInfoResponse, Sequence[int]]],
+    ) -> None:
+        """
+        Atualização de uma cidade: um único `INSERT … ON CONFLICT (city, forecast_datetime) DO UPDATE`
+        com todos os slots e um `UPDATE events` por slot apontando para a linha compartilhada —
+        o custo não cresce com o número de eventos.
+        """
+        if not forecasts:
+            return
+        ids = self._upsert_forecast_rows(city, [forecast for forecast, _ in forecasts])
+        now = datetime.now(timezone.utc)
+        for forecast, event_ids in forecasts:
+            if event_ids:
+                (
+                    self.db.query(ModelsEvent)
+                    .filter(ModelsEvent.id.in_(list(event_ids)))
+                    .update({"forecast_info_id": ids[_slot(forecast.forecast_datetime)], "updated_at": now}, synchronize_session=False)
+                )
+        self.db.commit()
+        logger.info("Previsões da cidade gravadas", city=city, slots=len(ids), events=sum(len(e) for _, e in forecasts))
+
+    def _upsert_forecast_rows(self, city: str, forecasts: list[ForecastInfoResponse]) -> dict[datetime, int]:
+        """Upsert das linhas (uma por slot) da cidade; devolve {slot: id}. Não faz commit."""
+        rows = {
+            _slot(f.forecast_datetime): {
+                **f.model_dump(), "forecast_datetime": _slot(f.forecast_datetime), "city": normalize_city(city),
+            }
+            for f in forecasts
+        }
+        stmt = pg_insert(ModelsForecastInfo).values(list(rows.values()))
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_forecast_infos_city_slot",
+            set_={c: stmt.excluded[c] for c in _FORECAST_FIELDS},
+        ).returning(ModelsForecastInfo.forecast_datetime, ModelsForecastInfo.id)
+        return {slot: forecast_id for slot, forecast_id in self.db.execute(stmt)}
+
+    def list_stale_forecasts(self, *, start: datetime, end: datetime, stale_before: datetime, limit: int = 100):
+        """
+        Eventos futuros com previsão ausente/antiga — faixa de `event_date` resolvida
+        pelo índice `ix_events_event_date`, mais próximos primeiro.
+        """
+        db_events = (
+            self.db.query(ModelsEvent)
+            .outerjoin(ModelsEvent.forecast_info)
+            .filter(ModelsEvent.event_date >= start, ModelsEvent.event_date < end)
+            .filter(or_(
+                ModelsEvent.forecast_info_id.is_(None),
+                ModelsForecastInfo.updated_at.is_(None),
+                ModelsForecastInfo.updated_at < stale_before,
+            ))
+            .order_by(ModelsEvent.event_date)
+            .limit(limit)
+            .all()
+        )
+        return [
+            EventResponse.model_validate(e, from_attributes=True)
+            for e in db_events
+        ]
+
 # def orm_to_response(event: Event) -> EventResponse:
 #     """
 #     Converte um objeto ORM Event em um objeto Pydantic EventResponse.
@@ -190,6 +278,12 @@ class SQLEventRepo(AbstractEventRepo):
 #         # created_at=event.created_at
 #     )
 
+_FORECAST_FIELDS = ("temperature", "weather_main", "weather_desc", "humidity", "wind_speed", "updated_at")
+
+def _slot(dt: datetime) -> datetime:
+    # `forecast_datetime` é `timestamp without time zone` em UTC: normaliza para a chave bater com o RETURNING
+    return ensure_aware(dt).astimezone(timezone.utc).replace(tzinfo=None)
+
 def _clean_update_data(data: dict) -> dict:
     # ⚠️ Remover campos que não podem ser atualizados diretamente
     return {
@@ -16,6 +16,10 @@ class AbstractUserRepo(abc.ABC):
     def add(self, user: UserInDB) -> UserInDB:
         """."""
     
+    @abc.abstractmethod
+    def update_roles(self, username: str, roles: list[str]) -> UserInDB | None:
+        """Troca os papéis do usuário; `None` se ele não existe."""
+
     @abc.abstractmethod
     def delete_by_username(self, username: str) -> bool:
         """."""
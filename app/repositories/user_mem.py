@@ -48,6 +48,15 @@ class InMemoryUserRepo(AbstractUserRepo):
         self._db[user.username] = user
         return user
 
+    def update_roles(self, username: str, roles: list[str]) -> UserInDB | None:
+        user = self._db.get(username)
+        if user is None:
+            logger.warning("Usuário não encontrado para troca de papéis", username=username)
+            return None
+        logger.info("Atualizando papéis do usuário", username=username, roles=roles)
+        self._db[username] = user.model_copy(update={"roles": list(roles)})
+        return self._db[username]
+
     def delete_by_username(self, username: str) -> bool:
         if username in self._db:
             logger.info("Removendo usuário", username=username)
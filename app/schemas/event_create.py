@@ -42,15 +42,18 @@ class EventCreate(BaseModel):
             
         super().__init__(**data)
 
+_DEFAULT_LOCAL_INFO = LocalInfoResponse(
+    location_name="local",
+    capacity=1,
+    venue_type=None,
+    is_accessible=False,
+    address=None,
+    manually_edited=False,
+)
+
 def _make_default_local_info() -> LocalInfoResponse:
-    return LocalInfoResponse(
-        location_name="local",
-        capacity=1,
-        venue_type=None,
-        is_accessible=False,
-        address=None,
-        manually_edited=False,
-    )
+    # imutável: uma instância só, compartilhada por todos os eventos sem local
+    return _DEFAULT_LOCAL_INFO
 
 
 def _make_dummy_event_data() -> dict[str, Any]:
@@ -67,4 +70,5 @@ class EventResponse(EventCreate):
     id: int
     forecast_info: ForecastInfoResponse | None = None
     views: int = 0 # (default = 0)
+    updated_at: datetime | None = None   # última escrita no conteúdo (views++ não conta) → Last-Modified
     
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Annotated
 from structlog import get_logger
 
@@ -7,6 +7,10 @@ from app.schemas.venue_type import VenueTypes
 logger = get_logger().bind(module="local_info")
 
 class LocalInfo(BaseModel):
+    # imutável: a mesma instância é compartilhada entre eventos (importação em lote, mock);
+    # alterações (PATCH) criam um objeto novo
+    model_config = ConfigDict(frozen=True)
+
     location_name: Annotated[str, Field(description="Nome do local", min_length=2, json_schema_extra={"example":"CESAR"})]
     capacity: Annotated[int, Field(ge=0, description="Capacidade máxima de pessoas", json_schema_extra={"example":150}, default=1)]  # >= 1
     venue_type: Annotated[VenueTypes | None, Field(description="Tipo de local (auditório, salão, etc.)", default=None)]
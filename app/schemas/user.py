@@ -11,4 +11,7 @@ class UserInDB(User):
     hashed_password: str
 
 class UserCreate(User):
-    password: str
\ No newline at end of file
+    password: str
+
+class UserRolesUpdate(BaseModel):
+    roles: Annotated[list[str], Field(examples=[["editor"]])]
@@ -1,7 +1,7 @@
 # app\schemas\weather_forecast.py
 from pydantic import BaseModel, Field
 from typing import Annotated
-from datetime import datetime
+from datetime import date, datetime
 
 class ForecastInfo(BaseModel):
     forecast_datetime: Annotated[datetime, Field(description="Data e hora da previsão")]
@@ -15,4 +15,10 @@ class ForecastInfoResponse(ForecastInfo):
     updated_at: Annotated[datetime, Field(
         description="Data e hora da última atualização (UTC)",
         json_schema_extra={"example": "2025-06-12T19:00:00Z"}
-    )]
\ No newline at end of file
+    )]
+
+class ForecastRangeResponse(BaseModel):
+    city: Annotated[str, Field(description="Cidade consultada")]
+    start: Annotated[date, Field(description="Primeiro dia do intervalo")]
+    end: Annotated[date, Field(description="Último dia do intervalo (inclusive)")]
+    forecasts: Annotated[list[ForecastInfo], Field(description="Slots de previsão do intervalo, em ordem cronológica")]
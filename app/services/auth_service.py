@@ -11,6 +11,7 @@ from app.deps import provide_user_repo
 from app.core.security import verify_password
 from app.core.config import get_settings
 from app.core.contextvars import request_user
+from app.services.token_cache import verified_tokens
 
 logger = get_logger().bind(module="auth_service")
 
@@ -39,6 +40,12 @@ def get_current_user(
     token: str = Depends(oauth2_scheme),
     repo: AbstractUserRepo = _AbstractUserRepo
 ):
+    # token já verificado há pouco: sem jwt.decode nem consulta ao repositório
+    user = verified_tokens.get(token)
+    if user is not None:
+        request_user.set(user.username)
+        return user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Credenciais inválidas",
@@ -64,6 +71,7 @@ def get_current_user(
         logger.warning("Usuário do token não encontrado", username=username)
         raise credentials_exception
     logger.info("Usuário autenticado via token", username=username)
+    verified_tokens.put(token, user, payload.get("exp"))
     
     # 💡 Aqui salvamos o usuário no contexto da requisiçãorevise o logging
     request_user.set(user.username)
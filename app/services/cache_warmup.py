@@ -0,0 +1,174 @@
+# app/services/cache_warmup.py
+import asyncio
+import time
+from collections import Counter
+from contextlib import closing
+from collections.abc import Awaitable, Callable
+
+from fastapi import HTTPException, Request
+from structlog import get_logger
+
+from app.core.config import get_settings
+from app.core.metrics import CACHE_WARMUP
+from app.deps import provide_redis, provide_event_repo, provide_local_info_service
+from app.db.session import SessionLocal
+from app.utils.circuit_breaker import redis_breaker
+
+logger = get_logger().bind(module="cache_warmup")
+
+_settings = get_settings()
+
+VENUE_HITS_KEY = "warmup:local-info:hits"   # ZSET nome → nº de consultas (persistido no Redis)
+VENUE_HITS_MAX = 1000                       # mantém só os mais consultados
+
+# ──────────────────────────────────────────────────────
+# log de consultas: alimenta o aquecimento dos locais mais buscados
+# ──────────────────────────────────────────────────────
+class VenueHitCounter:
+    """
+    Contador das consultas a `/events/local_info`, em memória do processo.
+
+    - `record` é só um incremento no `Counter` — nada de Redis no caminho da request
+      (que em geral é um hit do L1).
+    - `flush` envia o acumulado em **um** pipeline (`ZINCRBY` por nome + corte do ZSET),
+      pelo disjuntor do Redis; rodado a cada `interval_s` por `start` e uma última vez no `stop`.
+    - Redis fora: as contagens voltam para o acumulado (no máximo `VENUE_HITS_MAX` nomes).
+    """
+
+    def __init__(self, interval_s: float = 10):
+        self.interval_s = interval_s
+        self._pending: Counter[str] = Counter()
+        self._task: asyncio.Task | None = None
+
+    def record(self, name: str) -> None:
+        if name in self._pending or len(self._pending) < VENUE_HITS_MAX:
+            self._pending[name] += 1
+
+    def clear(self) -> None:
+        self._pending.clear()
+
+    async def flush(self) -> int:
+        """Grava o acumulado no ZSET; devolve quantos nomes foram enviados."""
+        pending, self._pending = self._pending, Counter()
+        if not pending:
+            return 0
+        try:
+            redis_client = await provide_redis()
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for name, hits in pending.items():
+                    pipe.zincrby(VENUE_HITS_KEY, hits, name)
+                pipe.zremrangebyrank(VENUE_HITS_KEY, 0, -(VENUE_HITS_MAX + 1))
+                await redis_breaker.call(pipe.execute)
+        except Exception as e:
+            for name, hits in pending.items():
+                if name in self._pending or len(self._pending) < VENUE_HITS_MAX:
+                    self._pending[name] += hits
+            logger.debug("Falha ao gravar consultas de locais; mantidas para o próximo envio", nomes=len(pending), error=str(e))
+            return 0
+        return len(pending)
+
+    # ── ciclo de vida ─────────────────────────────────
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._loop())     # tarefa de um loop antigo (já encerrado) é descartada
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await self.flush()
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_s)
+            await self.flush()
+
+venue_hits = VenueHitCounter(_settings.cache_warmup_hits_flush_s)
+
+async def record_local_info_hit(request: Request) -> None:
+    """Dependência da rota `/events/local_info`: conta a consulta em memória (ver `VenueHitCounter`)."""
+    if name := request.query_params.get("location_name"):
+        venue_hits.record(name)
+
+async def most_requested_venues(limit: int) -> list[str]:
+    """Os `limit` locais mais consultados segundo o log persistido."""
+    if limit <= 0:
+        return []
+    try:
+        redis_client = await provide_redis()
+        return list(await redis_client.zrevrange(VENUE_HITS_KEY, 0, limit - 1))
+    except Exception as e:
+        logger.warning("Não foi possível ler o log de locais consultados", error=str(e))
+        return []
+
+# ──────────────────────────────────────────────────────
+# aquecimento
+# ──────────────────────────────────────────────────────
+async def _build_jobs() -> list[tuple[str, Callable[[], Awaitable[object]]]]:
+    # import tardio: os endpoints importam muita coisa (e este módulo é usado pelo main)
+    from app.api.v1.endpoints.events import get_events_top_soon, get_events_top_viewed, get_local_info
+
+    def _top(endpoint, limit: int):
+        async def _run():
+            with closing(SessionLocal()) as db:
+                return await endpoint(request=None, limit=limit, repo=provide_event_repo(db))
+        return _run
+
+    jobs: list[tuple[str, Callable[[], Awaitable[object]]]] = []
+    for limit in _settings.cache_warmup_top_limits:
+        jobs.append((f"top-soon:{limit}", _top(get_events_top_soon, limit)))
+        jobs.append((f"top-viewed:{limit}", _top(get_events_top_viewed, limit)))
+
+    service = provide_local_info_service()
+    for name in await most_requested_venues(_settings.cache_warmup_venues):
+        jobs.append((f"local-info:{name}", lambda name=name: get_local_info(location_name=name, service=service)))
+    return jobs
+
+async def warm_up_cache() -> dict[str, int]:
+    """
+    Pré-calcula as consultas cacheadas mais comuns antes do app aceitar tráfego.
+
+    - Concorrência limitada (`CACHE_WARMUP_CONCURRENCY`).
+    - Orçamento de tempo (`CACHE_WARMUP_BUDGET_S`): o que não terminar é cancelado
+      e o startup segue — aquecimento nunca trava o deploy.
+    """
+    started = time.monotonic()
+    stats = {"ok": 0, "empty": 0, "failed": 0, "cancelled": 0}
+    try:
+        jobs = await _build_jobs()
+    except Exception as e:
+        logger.warning("Falha ao montar o aquecimento do cache", error=str(e))
+        return stats
+
+    semaphore = asyncio.Semaphore(_settings.cache_warmup_concurrency)
+
+    async def _run(name: str, job: Callable[[], Awaitable[object]]) -> None:
+        async with semaphore:
+            try:
+                await job()
+                result = "ok"
+            except HTTPException:
+                result = "empty"            # ex.: 404 — nada para aquecer
+            except Exception as e:
+                result = "failed"
+                logger.warning("Falha ao aquecer entrada do cache", job=name, error=str(e))
+            stats[result] += 1
+            CACHE_WARMUP.labels(result).inc()
+
+    tasks = [asyncio.create_task(_run(name, job)) for name, job in jobs]
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=_settings.cache_warmup_budget_s)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        stats["cancelled"] = len(pending)
+        CACHE_WARMUP.labels("cancelled").inc(len(pending))
+
+    logger.info(
+        "Aquecimento do cache concluído",
+        jobs=len(jobs), elapsed_ms=round((time.monotonic() - started) * 1000), **stats,
+    )
+    return stats
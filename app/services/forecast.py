@@ -1,53 +1,36 @@
 # app\services\forecast.py
-import asyncio
+import inspect
+from typing import cast
 from structlog import get_logger
 from datetime import datetime, timezone
+from collections.abc import Sequence
 
-from app.services.interfaces.forecast_info_protocol import AbstractForecastService
-from app.repositories.event import AbstractEventRepo
+from app.services.interfaces.forecast_info_protocol import AbstractForecastService, AbstractAsyncForecastService
+from app.schemas.weather_forecast import ForecastInfo, ForecastInfoResponse
 
-from app.deps import provide_forecast_service, provide_event_repo
+from app.utils.blocking import run_blocking
 
 logger = get_logger().bind(module="forecast")
 
-async def atualizar_forecast_em_background(
-    event_id: int,
-    retries: int = 3,
-    delay: float = 2.0
-):
-    service: AbstractForecastService = provide_forecast_service()
-    repo: AbstractEventRepo = provide_event_repo()
-    
-    for try_count in range(retries):
-        try:
-            event = repo.get(event_id)
-            if event is None:
-                logger.warning("Evento não encontrado durante atualização do forecast", event_id=event_id)
-                return
-            
-            forecast = service.get_by_city_and_datetime(event.city, event.event_date)
-            logger.debug("Forecast retornado pelo serviço", event_id=event_id, forecast=forecast)
-            
-            if forecast is not None:
-                from app.schemas.event_update import ForecastInfoUpdate
-                from app.utils.patch import update_event
-                
-                data = forecast.model_dump()
-                logger.debug("Dados do forecast antes da validação", event_id=event_id, data=data)
+async def fetch_forecasts(
+    service: AbstractForecastService, city: str, dates: Sequence[datetime],
+) -> list[ForecastInfo | None]:
+    """
+    Previsões de `dates` para uma cidade, sem travar o event loop: usa `aget_many` se o
+    serviço for assíncrono; senão faz um único salto para o executor limitado com o lote inteiro.
+    """
+    aget_many = getattr(service, "aget_many", None)
+    if inspect.iscoroutinefunction(aget_many):
+        return await cast(AbstractAsyncForecastService, service).aget_many(city, dates)
 
-                # Atualiza o timestamp da última atualização bem-sucedida
-                data["updated_at"] = datetime.now(timezone.utc)
-                update = ForecastInfoUpdate.model_validate(data)
-                logger.debug("Dados do forecast após a validação", event_id=event_id, data=data)
-                update_event(event, update, attr="forecast_info")
-                logger.debug("Atualizando objeto eventos", updated_event=event)
-                
-                repo.replace_by_id(event_id, event)
-                logger.info("Forecast atualizado com sucesso via background", event_id=event_id, updated_at=update.updated_at.isoformat())
-            return
-        except Exception as e:
-            logger.warning(f"Tentativa {try_count + 1} falhou", event_id=event_id, error=str(e))
-            await asyncio.sleep(delay)
+    def _sync() -> list[ForecastInfo | None]:
+        get_many = getattr(service, "get_many", None)
+        if get_many is None or len(dates) == 1:
+            return [service.get_by_city_and_datetime(city, date) for date in dates]
+        return get_many(city, dates)
 
-    logger.error("Falha definitiva ao atualizar previsão do tempo", event_id=event_id)
+    return await run_blocking(_sync)
 
+def stamp_forecast(forecast: ForecastInfo) -> ForecastInfoResponse:
+    """Previsão do provedor carimbada com `updated_at` = agora — a linha gravada e compartilhada pelos eventos."""
+    return ForecastInfoResponse(**forecast.model_dump(), updated_at=datetime.now(timezone.utc))
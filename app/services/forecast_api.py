@@ -0,0 +1,116 @@
+# app/services/forecast_api.py
+import asyncio
+import random
+import threading
+import weakref
+from collections.abc import Sequence
+from datetime import datetime
+
+import httpx
+from structlog import get_logger
+
+from app.core.config import get_settings
+from app.schemas.weather_forecast import ForecastInfo
+from app.services.interfaces.forecast_info_protocol import AbstractForecastService
+from app.services.http_client import get_http_client, http_client_loop
+from app.utils.service_url import get_service_url
+
+logger = get_logger().bind(module="forecast_api")
+
+_settings = get_settings()
+
+_RETRY_STATUS = {429, 502, 503, 504}
+
+class HttpForecastService(AbstractForecastService):
+    """
+    Implementação real que consulta a API externa de previsão do tempo.
+
+    `GET {forecast_info_url}?city=<cidade>&datetime=<ISO 8601>` → `ForecastInfo` (404 = sem previsão).
+
+    - Usa o `httpx.AsyncClient` compartilhado (`app/services/http_client.py`): keep-alive/HTTP/2,
+      sem handshake TCP/TLS por chamada.
+    - Semáforo limita as chamadas simultâneas a este provedor (`FORECAST_HTTP_CONCURRENCY`).
+    - Erros de rede, 429 e 5xx transitórios são repetidos com *backoff* exponencial e jitter.
+    - `get_by_city_and_datetime` (protocolo síncrono) agenda `fetch` no loop do cliente;
+      no próprio loop use `await fetch(...)`.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        *,
+        max_concurrency: int | None = None,
+        retries: int | None = None,
+        backoff_base: float | None = None,
+        backoff_max: float | None = None,
+    ):
+        self._client = client
+        self.max_concurrency = max_concurrency or _settings.forecast_http_concurrency
+        self.retries = retries if retries is not None else _settings.forecast_http_retries
+        self.backoff_base = backoff_base if backoff_base is not None else _settings.forecast_http_backoff_base
+        self.backoff_max = backoff_max if backoff_max is not None else _settings.forecast_http_backoff_max
+        self._semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    # ── async ─────────────────────────────────────────
+    async def fetch(self, city: str, date: datetime) -> ForecastInfo | None:
+        client = self._client or get_http_client()
+        self._loop = asyncio.get_running_loop()
+        url = get_service_url("forecast_info_url")
+        params = {"city": city, "datetime": date.isoformat()}
+
+        async with self._semaphore():
+            attempt = 0
+            while True:
+                try:
+                    response = await client.get(url, params=params)
+                    if response.status_code == 404:
+                        return None
+                    if response.status_code not in _RETRY_STATUS:
+                        response.raise_for_status()
+                        return ForecastInfo.model_validate_json(response.content)
+                    error: Exception = httpx.HTTPStatusError(
+                        f"status {response.status_code}", request=response.request, response=response,
+                    )
+                except httpx.TransportError as e:
+                    error = e
+                if attempt >= self.retries:
+                    logger.error("Falha ao consultar previsão do tempo", city=city, attempts=attempt + 1, error=str(error))
+                    raise error
+                delay = self._backoff(attempt)
+                logger.warning("Erro transitório no provedor de previsão", city=city, attempt=attempt + 1, retry_in=round(delay, 3), error=str(error))
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def aget_many(self, city: str, dates: Sequence[datetime]) -> list[ForecastInfo | None]:
+        """Lote da mesma cidade: uma requisição por data distinta, em paralelo (limitadas pelo semáforo)."""
+        unique = list(dict.fromkeys(dates))
+        found = dict(zip(unique, await asyncio.gather(*(self.fetch(city, date) for date in unique))))
+        return [found[date] for date in dates]
+
+    # ── protocolo síncrono ────────────────────────────
+    def get_by_city_and_datetime(self, city: str, date: datetime) -> ForecastInfo | None:
+        loop = self._loop or http_client_loop()
+        if loop is None or loop.is_closed():
+            raise RuntimeError("HttpForecastService sem event loop: inicie o cliente HTTP no lifespan")
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            raise RuntimeError("Chamada síncrona dentro do event loop travaria o loop; use `await fetch(...)`")
+        return asyncio.run_coroutine_threadsafe(self.fetch(city, date), loop).result()
+
+    # ── helpers ───────────────────────────────────────
+    def _semaphore(self) -> asyncio.Semaphore:
+        # um semáforo por loop (asyncio.Semaphore não pode ser compartilhado entre loops)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if (semaphore := self._semaphores.get(loop)) is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def _backoff(self, attempt: int) -> float:
+        """*Full jitter*: espera aleatória em [0, min(max, base·2^tentativa)]."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
@@ -0,0 +1,255 @@
+# app/services/forecast_cached.py
+import asyncio
+import math
+import threading
+from collections.abc import Sequence
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from typing import Any
+
+from redis import Redis
+from structlog import get_logger
+
+from app.core.metrics import CACHE_REQUESTS, CACHE_COALESCED
+from app.schemas.weather_forecast import ForecastInfo
+from app.services.forecast import fetch_forecasts
+from app.services.interfaces.forecast_info_protocol import AbstractForecastService
+from app.utils.blocking import run_blocking
+from app.utils.cache import LocalLRUCache, _MISSING
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError, redis_breaker
+
+logger = get_logger().bind(module="forecast_cached")
+
+_NULL = b"null"     # cidade sem previsão também é cacheada (não muda entre chamadas)
+
+def provider_slot(date: datetime, slot_seconds: int) -> datetime:
+    """
+    Slot que o provedor devolve para `date`: grade a cada `slot_seconds` a partir da
+    meia-noite **local** de `date` (no fuso do próprio datetime), o mais próximo — empate
+    fica com o mais cedo. Mesmo fuso de entrada.
+    """
+    midnight = date.replace(hour=0, minute=0, second=0, microsecond=0)
+    offset = (date - midnight).total_seconds()
+    return midnight + timedelta(seconds=math.ceil(offset / slot_seconds - 0.5) * slot_seconds)
+
+class CachedForecastService(AbstractForecastService):
+    """
+    *Decorator* de serviço: cache de previsões em volta de qualquer `AbstractForecastService`.
+
+    - Chave = cidade normalizada + slot do provedor (`provider_slot`: mesma grade e mesmo
+      fuso que o serviço usa, com o offset na chave). Vários eventos na mesma cidade e
+      janela de 6h compartilham uma única consulta.
+    - L1: LRU em memória do processo; L2 (opcional): Redis, compartilhado entre workers,
+      atrás do disjuntor do Redis (aberto ⇒ segue só com L1 + serviço, sem esperar timeout).
+    - TTL = cadência de atualização do provedor; depois disso a previsão é buscada de novo.
+    - Misses concorrentes da mesma chave esperam uma única chamada — threads do pool em
+      `get_by_city_and_datetime`, corrotinas do mesmo loop em `aget_many`.
+    - Métricas em `cache_requests_total{prefix="forecast-service"}` (razão de acerto por camada).
+    """
+
+    PREFIX = "forecast-service"
+    KEY = "forecast:v2:{}:{}"
+
+    def __init__(
+        self,
+        inner: AbstractForecastService,
+        redis: Redis | None = None,
+        ttl: int = 3 * 3600,
+        slot_hours: int = 6,
+        max_entries: int = 2048,
+        breaker: CircuitBreaker = redis_breaker,
+    ):
+        self.inner = inner
+        self.redis = redis
+        self.breaker = breaker
+        self.ttl = ttl
+        self.slot_seconds = slot_hours * 3600
+        self._local = LocalLRUCache(max_entries=max_entries, max_bytes=max_entries * 1024)
+        self._lock = threading.Lock()                     # LRU e in-flight são usados por várias threads
+        self._inflight: dict[str, Future] = {}
+        self._ainflight: dict[str, asyncio.Future] = {}   # idem para `aget_many` (futures do loop)
+
+    def get_by_city_and_datetime(self, city: str, date: datetime) -> ForecastInfo | None:
+        key = self.key_for(city, date)
+
+        with self._lock:
+            value = self._local.get(key)
+            if value is not _MISSING:
+                CACHE_REQUESTS.labels("l1", self.PREFIX, "hit").inc()
+                return value
+            CACHE_REQUESTS.labels("l1", self.PREFIX, "miss").inc()
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = Future()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            CACHE_COALESCED.labels(self.PREFIX, "local").inc()
+            return pending.result()
+
+        try:
+            value = self._load(key, city, date)
+        except BaseException as exc:
+            pending.set_exception(exc)
+            raise
+        else:
+            pending.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def aget_many(self, city: str, dates: Sequence[datetime]) -> list[ForecastInfo | None]:
+        """
+        Variante assíncrona em lote: L1 direto no loop; L2 (Redis síncrono) em um único
+        `MGET` no executor limitado; o que faltar vai ao serviço interno em uma só chamada.
+        Chaves que outra corrotina já está buscando não são buscadas de novo: espera-se o
+        resultado dela.
+        """
+        loop = asyncio.get_running_loop()
+        keys = [self.key_for(city, date) for date in dates]
+        found: dict[str, Any] = {}
+        missing: dict[str, datetime] = {}
+        waiting: dict[str, asyncio.Future] = {}
+        leading: dict[str, asyncio.Future] = {}
+        with self._lock:
+            for key, date in zip(keys, dates):
+                if key in found or key in missing or key in waiting:
+                    continue
+                value = self._local.get(key)
+                if value is not _MISSING:
+                    CACHE_REQUESTS.labels("l1", self.PREFIX, "hit").inc()
+                    found[key] = value
+                    continue
+                CACHE_REQUESTS.labels("l1", self.PREFIX, "miss").inc()
+                pending = self._ainflight.get(key)
+                if pending is not None and pending.get_loop() is loop:
+                    waiting[key] = pending
+                else:
+                    missing[key] = date
+                    leading[key] = self._ainflight[key] = loop.create_future()
+
+        try:
+            await self._aload(city, missing, found)
+        except BaseException as exc:
+            for pending in leading.values():
+                if isinstance(exc, asyncio.CancelledError):
+                    pending.cancel()
+                else:
+                    pending.set_exception(exc)
+                    pending.exception()                   # seguidores recebem; sem aviso se não houver nenhum
+            raise
+        else:
+            for key, pending in leading.items():
+                pending.set_result(found[key])
+        finally:
+            with self._lock:
+                for key, pending in leading.items():
+                    if self._ainflight.get(key) is pending:
+                        del self._ainflight[key]
+
+        if waiting:
+            CACHE_COALESCED.labels(self.PREFIX, "local").inc(len(waiting))
+            for key, pending in waiting.items():
+                found[key] = await asyncio.shield(pending)  # cancelar quem espera não cancela a busca do líder
+        return [found[key] for key in keys]
+
+    async def _aload(self, city: str, missing: dict[str, datetime], found: dict[str, Any]) -> None:
+        """L2 + serviço interno para as chaves em `missing` (resultado vai para `found`)."""
+        if missing and self.redis is not None:
+            for key, raw in zip(list(missing), await run_blocking(self._redis_mget, list(missing))):
+                if raw is not None:
+                    found[key] = None if raw == _NULL else ForecastInfo.model_validate_json(raw)
+                    self._store_local(key, found[key], len(raw))
+                    del missing[key]
+
+        if missing:
+            values = await fetch_forecasts(self.inner, city, list(missing.values()))
+            fresh: dict[str, bytes] = {}
+            for key, value in zip(missing, values):
+                fresh[key] = _NULL if value is None else value.model_dump_json().encode()
+                self._store_local(key, value, len(fresh[key]))
+                found[key] = value
+            if self.redis is not None:
+                await run_blocking(self._redis_set_many, fresh)
+
+    def key_for(self, city: str, date: datetime) -> str:
+        slot = provider_slot(date, self.slot_seconds)
+        return self.KEY.format(" ".join(city.split()).lower(), slot.isoformat(timespec="minutes"))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    # ---------------------------------------------------------------- helpers
+    def _load(self, key: str, city: str, date: datetime) -> ForecastInfo | None:
+        raw = self._redis_get(key)
+        if raw is not None:
+            value = None if raw == _NULL else ForecastInfo.model_validate_json(raw)
+            self._store_local(key, value, len(raw))
+            return value
+
+        value = self.inner.get_by_city_and_datetime(city, date)
+        raw = _NULL if value is None else value.model_dump_json().encode()
+        self._store_local(key, value, len(raw))
+        self._redis_set(key, raw)
+        return value
+
+    def _store_local(self, key: str, value: Any, size: int) -> None:
+        with self._lock:
+            self._local.set(key, value, size, self.ttl)
+
+    def _redis_get(self, key: str) -> bytes | None:
+        if self.redis is None:
+            return None
+        try:
+            with self.breaker.guard():
+                raw = self.redis.get(key)
+        except CircuitOpenError:
+            CACHE_REQUESTS.labels("l2", self.PREFIX, "bypass").inc()
+            return None
+        except Exception as e:
+            CACHE_REQUESTS.labels("l2", self.PREFIX, "error").inc()
+            logger.warning("Erro ao ler previsão do cache", key=key, error=str(e))
+            return None
+        CACHE_REQUESTS.labels("l2", self.PREFIX, "miss" if raw is None else "hit").inc()
+        return raw
+
+    def _redis_mget(self, keys: list[str]) -> list[bytes | None]:
+        try:
+            with self.breaker.guard():
+                raws = self.redis.mget(keys)
+        except CircuitOpenError:
+            CACHE_REQUESTS.labels("l2", self.PREFIX, "bypass").inc(len(keys))
+            return [None] * len(keys)
+        except Exception as e:
+            CACHE_REQUESTS.labels("l2", self.PREFIX, "error").inc(len(keys))
+            logger.warning("Erro ao ler previsões do cache", keys=len(keys), error=str(e))
+            return [None] * len(keys)
+        for raw in raws:
+            CACHE_REQUESTS.labels("l2", self.PREFIX, "miss" if raw is None else "hit").inc()
+        return raws
+
+    def _redis_set_many(self, items: dict[str, bytes]) -> None:
+        try:
+            with self.breaker.guard(), self.redis.pipeline(transaction=False) as pipe:
+                for key, raw in items.items():
+                    pipe.set(key, raw, ex=self.ttl)
+                pipe.execute()
+        except CircuitOpenError:
+            return
+        except Exception as e:
+            logger.warning("Erro ao gravar previsões no cache", keys=len(items), error=str(e))
+
+    def _redis_set(self, key: str, raw: bytes) -> None:
+        if self.redis is None:
+            return
+        try:
+            with self.breaker.guard():
+                self.redis.set(key, raw, ex=self.ttl)
+        except CircuitOpenError:
+            return
+        except Exception as e:
+            logger.warning("Erro ao gravar previsão no cache", key=key, error=str(e))
@@ -0,0 +1,279 @@
+# app/services/forecast_queue.py
+import asyncio
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from contextlib import closing
+from datetime import datetime
+
+import anyio.from_thread
+from sqlalchemy.orm import Session
+from structlog import get_logger
+
+from app.core.config import get_settings
+from app.core.metrics import FORECAST_QUEUE_DEPTH, FORECAST_QUEUE_DEDUP, FORECAST_REFRESH_GROUPS
+from app.constants.cache_tags import EVENTS_LIST_TAG, EVENT_TAG
+from app.db.session import SessionLocal
+from app.deps import provide_forecast_service, provide_event_repo, provide_job_queue
+from app.jobs.base import AbstractJobQueue
+from app.repositories.event import AbstractEventRepo
+from app.schemas.event_create import EventResponse
+from app.schemas.weather_forecast import ForecastInfoResponse
+from app.services.forecast import fetch_forecasts, stamp_forecast
+from app.services.interfaces.forecast_info_protocol import AbstractForecastService
+from app.utils.blocking import run_blocking
+from app.utils.cache import invalidate_tags
+from app.utils.h_events import ensure_aware, normalize_city
+
+logger = get_logger().bind(module="forecast_queue")
+
+_settings = get_settings()
+
+GroupKey = tuple[str, int]      # (cidade normalizada, nº do bucket de tempo)
+CityForecast = tuple[ForecastInfoResponse, list[int]]   # previsão de um slot + eventos que a usam
+
+FORECAST_REFRESH_JOB = "forecast.refresh"
+
+class ForecastRefreshQueue:
+    """
+    Fila única (por processo) de atualização de forecast.
+
+    - `enqueue(id)` só marca o evento como pendente: pedidos repetidos antes do
+      processamento viram um só (contados em `forecast_refresh_dedup_total`).
+    - Um despachante acorda, espera uma janela curta para juntar pedidos e agrupa
+      os pendentes por (cidade, bucket de tempo): todos os eventos do grupo recebem
+      a mesma previsão, e todos os buckets de uma cidade saem numa única chamada
+      assíncrona ao provedor (`fetch_forecasts`).
+    - As cidades rodam com no máximo `workers` chamadas simultâneas ao provedor;
+      leitura e gravação no repositório vão para o executor limitado (`run_blocking`).
+    - Com fila de jobs configurada (`JOBS_BACKEND=redis|sqlite`), o lote vira um job
+      `forecast.refresh` e quem processa é o worker (`python -m app.jobs.worker`).
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 4,
+        window_ms: int = 200,
+        bucket_minutes: int = 60,
+        retries: int = 3,
+        retry_delay: float = 2.0,
+        service_factory: Callable[[], AbstractForecastService] | None = None,
+        repo_factory: Callable[[Session], AbstractEventRepo] | None = None,
+        job_queue_factory: Callable[[], AbstractJobQueue | None] | None = None,
+    ):
+        self.workers = workers
+        self.window_ms = window_ms
+        self.bucket_minutes = bucket_minutes
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._service_factory = service_factory or provide_forecast_service
+        self._repo_factory = repo_factory or provide_event_repo
+        self._job_queue_factory = job_queue_factory or provide_job_queue
+        self._pending: set[int] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._idle: asyncio.Event | None = None
+        self._dispatcher: asyncio.Task | None = None
+
+    # ── API pública ───────────────────────────────────
+    def enqueue(self, event_id: int) -> None:
+        """
+        Agenda a atualização do forecast de um evento (não bloqueia).
+        Funciona em handlers `async` e nos síncronos (ThreadPool do AnyIO).
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            try:
+                anyio.from_thread.run_sync(self._enqueue_nowait, event_id)
+            except RuntimeError:
+                logger.warning("Sem event loop para agendar forecast; pedido descartado", event_id=event_id)
+            return
+        self._enqueue_nowait(event_id)
+
+    async def refresh(self, event_ids: Iterable[int]) -> set[int]:
+        """
+        Processa um lote já escolhido agora (mesmo agrupamento e limite de workers), sem passar
+        pela fila; devolve os ids cujo grupo falhou em todas as tentativas.
+        """
+        return await self._process(set(event_ids))
+
+    async def dispatch(self, event_ids: Iterable[int]) -> None:
+        """Publica o lote na fila de jobs, se houver; senão (ou se a publicação falhar) processa aqui."""
+        batch = sorted(set(event_ids))
+        if not batch:
+            return
+        job_queue = self._job_queue_factory()
+        if job_queue is not None:
+            try:
+                await asyncio.to_thread(job_queue.enqueue, FORECAST_REFRESH_JOB, {"event_ids": batch})
+                logger.info("Lote de forecast publicado na fila de jobs", events=len(batch))
+                return
+            except Exception as e:
+                logger.warning("Falha ao publicar job de forecast; processando localmente", error=str(e))
+        await self._process(set(batch))
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    async def start(self) -> None:
+        """Sobe o despachante no loop atual (chamado no lifespan; `enqueue` também sobe sob demanda)."""
+        self._ensure_dispatcher()
+
+    async def drain(self) -> None:
+        """Espera até não haver nada pendente nem em processamento."""
+        if self._idle is not None:
+            await self._idle.wait()
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Processa o que estiver pendente (até `timeout` s) e encerra o despachante (shutdown)."""
+        if self._dispatcher is None:
+            return
+        try:
+            await asyncio.wait_for(self.drain(), timeout)
+        except asyncio.TimeoutError:   # noqa: UP041 — no 3.10 (CI) wait_for levanta o alias, não o builtin
+            logger.warning("Fila de forecast encerrada com pedidos pendentes", pending=len(self._pending))
+        self._dispatcher.cancel()
+        await asyncio.gather(self._dispatcher, return_exceptions=True)
+        self._dispatcher = None
+
+    # ── interno ───────────────────────────────────────
+    def _ensure_dispatcher(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._dispatcher is not None and not self._dispatcher.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        if self._pending:
+            self._wakeup.set()
+        else:
+            self._idle.set()
+        self._dispatcher = loop.create_task(self._run())
+
+    def _enqueue_nowait(self, event_id: int) -> None:
+        self._ensure_dispatcher()
+        if event_id in self._pending:
+            FORECAST_QUEUE_DEDUP.inc()
+            logger.debug("Forecast já pendente; pedido agrupado", event_id=event_id)
+            return
+        self._pending.add(event_id)
+        FORECAST_QUEUE_DEPTH.set(len(self._pending))
+        assert self._wakeup is not None and self._idle is not None
+        self._idle.clear()
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None and self._idle is not None
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            # janela curta: junta rajadas (lote, CSV) num único ciclo
+            await asyncio.sleep(self.window_ms / 1000)
+            batch, self._pending = self._pending, set()
+            FORECAST_QUEUE_DEPTH.set(0)
+            try:
+                await self.dispatch(batch)
+            except Exception as e:
+                logger.error("Falha ao processar lote de forecast", event_ids=sorted(batch), error=str(e))
+            if not self._pending:
+                self._idle.set()
+
+    def _group_key(self, event: EventResponse) -> GroupKey:
+        bucket = int(ensure_aware(event.event_date).timestamp() // (self.bucket_minutes * 60))
+        return normalize_city(event.city), bucket
+
+    async def _process(self, event_ids: set[int]) -> set[int]:
+        service = self._service_factory()
+        with closing(SessionLocal()) as db:
+            repo = self._repo_factory(db)
+
+            # repositório síncrono (SQL): um salto para o executor limitado por lote, não um por evento
+            events = await run_blocking(self._load, repo, sorted(event_ids))
+            cities: dict[str, dict[GroupKey, list[EventResponse]]] = defaultdict(lambda: defaultdict(list))
+            for event in events:
+                key = self._group_key(event)
+                cities[key[0]][key].append(event)
+
+            logger.info("Processando fila de forecast", events=len(event_ids), cities=len(cities))
+            semaphore = asyncio.Semaphore(self.workers)
+            results = await asyncio.gather(*(
+                self._refresh_city(semaphore, service, city, groups)
+                for city, groups in cities.items()
+            ))
+
+            updates = {city: items for city, (items, _) in zip(cities, results) if items}
+            if updates:
+                await run_blocking(self._save, repo, updates)
+                await invalidate_tags(EVENTS_LIST_TAG, *(
+                    EVENT_TAG(event_id) for items in updates.values() for _, ids in items for event_id in ids
+                ))
+        return set().union(*(failed for _, failed in results))
+
+    @staticmethod
+    def _load(repo: AbstractEventRepo, event_ids: list[int]) -> list[EventResponse]:
+        events = []
+        for event_id in event_ids:
+            event = repo.get(event_id)
+            if event is None:
+                logger.warning("Evento não encontrado durante atualização do forecast", event_id=event_id)
+                continue
+            events.append(event)
+        return events
+
+    @staticmethod
+    def _save(repo: AbstractEventRepo, updates: dict[str, list[CityForecast]]) -> None:
+        # uma previsão por slot, compartilhada pelos eventos (SQL: um upsert por cidade)
+        for city, items in updates.items():
+            repo.upsert_city_forecasts(city, items)
+
+    async def _refresh_city(
+        self,
+        semaphore: asyncio.Semaphore,
+        service: AbstractForecastService,
+        city: str,
+        groups: dict[GroupKey, list[EventResponse]],
+    ) -> tuple[list[CityForecast], set[int]]:
+        """Uma chamada ao provedor para todos os buckets da cidade; devolve ([(previsão, ids)], ids que falharam)."""
+        # representante de cada bucket: o evento mais cedo (a previsão é por faixa de 6h)
+        firsts = [min(events, key=lambda e: ensure_aware(e.event_date)) for events in groups.values()]
+        async with semaphore:
+            for attempt in range(self.retries):
+                try:
+                    forecasts = await fetch_forecasts(service, firsts[0].city, [e.event_date for e in firsts])
+                    break
+                except Exception as e:
+                    logger.warning(f"Tentativa {attempt + 1} falhou", city=city, groups=len(groups), error=str(e))
+                    await asyncio.sleep(self.retry_delay * 2 ** attempt)
+            else:
+                FORECAST_REFRESH_GROUPS.labels("failed").inc(len(groups))
+                failed = {e.id for events in groups.values() for e in events}
+                logger.error("Falha definitiva ao atualizar previsão do tempo", city=city, event_ids=sorted(failed))
+                return [], failed
+
+        # buckets diferentes podem cair no mesmo slot do provedor: uma linha por slot
+        slots: dict[datetime, CityForecast] = {}
+        for events, forecast in zip(groups.values(), forecasts):
+            if forecast is None:
+                FORECAST_REFRESH_GROUPS.labels("empty").inc()
+                continue
+            if forecast.forecast_datetime not in slots:
+                slots[forecast.forecast_datetime] = (stamp_forecast(forecast), [])
+            slots[forecast.forecast_datetime][1].extend(e.id for e in events)
+            FORECAST_REFRESH_GROUPS.labels("ok").inc()
+        items = list(slots.values())
+        if items:
+            logger.info("Forecast atualizado para a cidade", city=city, slots=len(items), event_ids=[i for _, ids in items for i in ids])
+        return items, set()
+
+# ──────────────────────────────────────────────────────
+# instância única do processo
+# ──────────────────────────────────────────────────────
+forecast_refresh_queue = ForecastRefreshQueue(
+    workers=_settings.forecast_refresh_workers,
+    window_ms=_settings.forecast_refresh_window_ms,
+    bucket_minutes=_settings.forecast_refresh_bucket_minutes,
+    retries=_settings.forecast_refresh_retries,
+    retry_delay=_settings.forecast_refresh_retry_delay,
+)
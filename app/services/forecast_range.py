@@ -0,0 +1,101 @@
+# app/services/forecast_range.py
+import asyncio
+from datetime import date, datetime, time, timedelta, timezone
+
+from structlog import get_logger
+
+from app.core.config import get_settings
+from app.schemas.weather_forecast import ForecastInfo
+from app.services.forecast import fetch_forecasts
+from app.services.interfaces.forecast_info_protocol import AbstractForecastService
+from app.utils.cache import cached_json
+from app.utils.h_events import normalize_city
+
+logger = get_logger().bind(module="forecast_range")
+
+_settings = get_settings()
+
+MAX_RANGE_DAYS = 10         # alcance do provedor
+
+_SETTLE_WAIT = 0.05          # teto (s) da espera pelos outros dias antes da busca em lote
+
+class _RangeBatch:
+    """
+    Slots só dos dias que faltaram no cache, em uma única chamada ao serviço. A busca sai
+    quando todos os dias do intervalo tiveram desfecho (cache ou falta) — ou após
+    `_SETTLE_WAIT`, para não travar em ciclo com outra requisição que calcula um dos dias.
+    Dia que faltar depois da busca (ex.: revalidação stale) é buscado sozinho.
+    """
+
+    def __init__(self, service: AbstractForecastService, city: str, days: list[date]):
+        self.service = service
+        self.city = city
+        self._pending = set(days)           # dias ainda sem desfecho
+        self._missed: list[date] = []
+        self._settled = asyncio.Event()
+        if not self._pending:
+            self._settled.set()
+        self._task: asyncio.Future | None = None
+        self._task_days: frozenset[date] = frozenset()
+
+    def settle(self, day: date) -> None:
+        self._pending.discard(day)
+        if not self._pending:
+            self._settled.set()
+
+    async def day(self, day: date) -> list[ForecastInfo]:
+        if self._task is None:
+            # registra a falta antes de esperar: a busca leva só os dias registrados
+            self._missed.append(day)
+            self.settle(day)
+            try:
+                await asyncio.wait_for(self._settled.wait(), _SETTLE_WAIT)
+            except asyncio.TimeoutError:   # noqa: UP041 — no 3.10 (CI) wait_for levanta o alias, não o builtin
+                pass
+            if self._task is None:
+                self._task_days = frozenset(self._missed)
+                self._task = asyncio.ensure_future(self._load(sorted(self._task_days)))
+        if day not in self._task_days:
+            return (await self._load([day]))[day]
+        return (await asyncio.shield(self._task))[day]
+
+    async def _load(self, days: list[date]) -> dict[date, list[ForecastInfo]]:
+        step = _settings.forecast_cache_slot_hours
+        slots = [
+            datetime.combine(day, time(hour), tzinfo=timezone.utc)
+            for day in days for hour in range(0, 24, step)
+        ]
+        forecasts = await fetch_forecasts(self.service, self.city, slots)
+        logger.info("Previsões do intervalo calculadas", city=self.city, days=len(days), slots=len(slots))
+
+        by_day: dict[date, dict[datetime, ForecastInfo]] = {day: {} for day in days}
+        for forecast in forecasts:
+            if forecast is not None and (day := forecast.forecast_datetime.date()) in by_day:
+                by_day[day].setdefault(forecast.forecast_datetime, forecast)     # provedor pode repetir o slot mais próximo
+        return {day: sorted(found.values(), key=lambda f: f.forecast_datetime) for day, found in by_day.items()}
+
+@cached_json("forecast-day", ttl=1800, local_ttl=5)
+async def _forecast_day(city: str, day: str, batch: _RangeBatch) -> list[ForecastInfo]:
+    # chave = (cidade normalizada, dia ISO); `batch` não entra na chave
+    return await batch.day(date.fromisoformat(day))
+
+async def get_forecast_range(
+    service: AbstractForecastService, city: str, start: date, end: date,
+) -> list[ForecastInfo]:
+    """
+    Slots de previsão da cidade de `start` a `end` (inclusive). Cada dia é uma entrada de cache
+    própria: intervalos diferentes reaproveitam os mesmos dias, sem chaves novas por intervalo.
+    """
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    key_city = normalize_city(city)
+    batch = _RangeBatch(service, city, days)
+
+    async def _one(day: date) -> list[ForecastInfo]:
+        try:
+            return await _forecast_day(key_city, day.isoformat(), batch)
+        finally:
+            batch.settle(day)           # dia servido pelo cache não entra na busca em lote
+
+    per_day = await asyncio.gather(*(_one(day) for day in days))
+    # dia vindo do cache chega como dict (JSON); do cálculo, como modelo
+    return [ForecastInfo.model_validate(forecast) for forecasts in per_day for forecast in forecasts]
@@ -0,0 +1,143 @@
+# app/services/forecast_sweeper.py
+import asyncio
+import uuid
+from collections.abc import Callable
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+from structlog import get_logger
+
+from app.core.config import get_settings
+from app.core.metrics import FORECAST_SWEEP_RUNS, FORECAST_SWEEP_EVENTS
+from app.db.session import SessionLocal
+from app.deps import provide_redis, provide_event_repo
+from app.repositories.event import AbstractEventRepo
+from app.services.forecast_queue import ForecastRefreshQueue, forecast_refresh_queue
+from app.utils.blocking import run_blocking
+from app.utils.h_events import ensure_aware, normalize_city
+
+logger = get_logger().bind(module="forecast_sweeper")
+
+_settings = get_settings()
+
+LOCK_KEY = "lock:forecast-sweeper"
+
+class ForecastSweeper:
+    """
+    Varredura periódica de previsões antigas (substitui a atualização disparada por leitura).
+
+    A cada `interval_s`:
+    1. pega o lock `lock:forecast-sweeper` no Redis (`SET NX PX`, TTL = intervalo) — só um
+       worker varre por intervalo; o lock não é liberado, ele expira sozinho;
+    2. busca eventos dos próximos `horizon_days` com previsão ausente ou mais velha que
+       `stale_after_s` (consulta por índice de data no repositório, no executor limitado);
+    3. atualiza em lotes de `batch_size` (no máximo `max_batches` por rodada), ordenados por
+       cidade, pela `ForecastRefreshQueue` — que agrupa por cidade/horário com workers limitados
+       (ou publica um job por lote, se houver fila de jobs configurada).
+    """
+
+    def __init__(
+        self,
+        queue: ForecastRefreshQueue,
+        *,
+        interval_s: float = 300,
+        stale_after_s: float = 86400,
+        horizon_days: int = 10,
+        batch_size: int = 100,
+        max_batches: int = 10,
+        repo_factory: Callable[[Session], AbstractEventRepo] | None = None,
+    ):
+        self.queue = queue
+        self.interval_s = interval_s
+        self.stale_after_s = stale_after_s
+        self.horizon_days = horizon_days
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self._repo_factory = repo_factory or provide_event_repo
+        self._task: asyncio.Task | None = None
+
+    # ── ciclo de vida ─────────────────────────────────
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                FORECAST_SWEEP_RUNS.labels("failed").inc()
+                logger.error("Falha na varredura de previsões", error=str(e))
+            await asyncio.sleep(self.interval_s)
+
+    # ── uma rodada ────────────────────────────────────
+    async def run_once(self) -> int:
+        """Executa uma varredura (se conseguir o lock); devolve quantos eventos foram enviados."""
+        if not await self._acquire_lock():
+            FORECAST_SWEEP_RUNS.labels("locked").inc()
+            logger.debug("Varredura de previsões em andamento em outro worker")
+            return 0
+
+        now = datetime.now(timezone.utc)
+        with closing(SessionLocal()) as db:
+            stale = await run_blocking(
+                self._repo_factory(db).list_stale_forecasts,
+                start=now,
+                end=now + timedelta(days=self.horizon_days),
+                stale_before=now - timedelta(seconds=self.stale_after_s),
+                limit=self.batch_size * self.max_batches,
+            )
+
+        # lotes por cidade: eventos da mesma cidade caem no mesmo lote → menos chamadas ao provedor
+        stale.sort(key=lambda e: (normalize_city(e.city), ensure_aware(e.event_date)))
+        for i in range(0, len(stale), self.batch_size):
+            await self.queue.dispatch(e.id for e in stale[i:i + self.batch_size])
+        total = len(stale)
+
+        FORECAST_SWEEP_RUNS.labels("ok").inc()
+        FORECAST_SWEEP_EVENTS.inc(total)
+        logger.info("Varredura de previsões concluída", events=total)
+        return total
+
+    async def _acquire_lock(self) -> bool:
+        try:
+            redis_client = await provide_redis()
+            return bool(await redis_client.set(
+                LOCK_KEY, uuid.uuid4().hex, nx=True, px=int(self.interval_s * 1000),
+            ))
+        except Exception as e:
+            # sem Redis não há como coordenar os workers: pula a rodada
+            logger.warning("Não foi possível obter o lock da varredura de previsões", error=str(e))
+            return False
+
+# ──────────────────────────────────────────────────────
+# instância única do processo
+# ──────────────────────────────────────────────────────
+forecast_sweeper = ForecastSweeper(
+    forecast_refresh_queue,
+    interval_s=_settings.forecast_sweep_interval_s,
+    stale_after_s=_settings.forecast_sweep_stale_after_s,
+    horizon_days=_settings.forecast_sweep_horizon_days,
+    batch_size=_settings.forecast_sweep_batch_size,
+    max_batches=_settings.forecast_sweep_max_batches,
+)
+
+async def _main() -> None:
+    """Worker dedicado: `python -m app.services.forecast_sweeper` (com FORECAST_SWEEP_ENABLED=false na API)."""
+    from app.services.http_client import start_http_client, close_http_client
+
+    await start_http_client()
+    try:
+        await forecast_sweeper._loop()
+    finally:
+        await close_http_client()
+
+if __name__ == "__main__":
+    asyncio.run(_main())
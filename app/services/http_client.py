@@ -0,0 +1,103 @@
+# app/services/http_client.py
+import asyncio
+import importlib.util
+from urllib.parse import urlsplit
+
+import httpx
+from structlog import get_logger
+
+from app.core.config import get_settings
+from app.utils.service_url import service_urls
+
+logger = get_logger().bind(module="http_client")
+
+_settings = get_settings()
+
+# Um único AsyncClient por processo: pool de conexões com keep-alive (e HTTP/2, se o `h2`
+# estiver instalado) reaproveitado por todos os clientes de APIs externas.
+# Criado e fechado no `lifespan` (app/main.py).
+_client: httpx.AsyncClient | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+
+def build_http_client(transport: httpx.AsyncBaseTransport | None = None) -> httpx.AsyncClient:
+    """Monta o cliente com limites de pool, timeouts explícitos e HTTP/2 opcional."""
+    http2 = _settings.http_http2 and importlib.util.find_spec("h2") is not None
+    if _settings.http_http2 and not http2:
+        logger.info("Pacote h2 ausente; cliente HTTP usando HTTP/1.1")
+    return httpx.AsyncClient(
+        http2=http2,
+        transport=transport,
+        limits=httpx.Limits(
+            max_connections=_settings.http_max_connections,
+            max_keepalive_connections=_settings.http_max_keepalive,
+            keepalive_expiry=_settings.http_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            _settings.http_read_timeout,
+            connect=_settings.http_connect_timeout,
+            pool=_settings.http_pool_timeout,
+        ),
+    )
+
+async def start_http_client(transport: httpx.AsyncBaseTransport | None = None) -> httpx.AsyncClient:
+    """Cria o cliente compartilhado no loop atual (startup)."""
+    global _client, _loop
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = build_http_client(transport)
+    _loop = asyncio.get_running_loop()
+    logger.info("Cliente HTTP compartilhado iniciado", max_connections=_settings.http_max_connections)
+    return _client
+
+async def close_http_client() -> None:
+    """Fecha o pool (shutdown)."""
+    global _client, _loop
+    if _client is not None:
+        await _client.aclose()
+        logger.info("Cliente HTTP compartilhado encerrado")
+    _client = None
+    _loop = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Cliente compartilhado; fora do lifespan (scripts, testes) é criado sob demanda."""
+    global _client, _loop
+    if _client is None or _client.is_closed:
+        _client = build_http_client()
+        _loop = asyncio.get_running_loop()
+    return _client
+
+def http_client_loop() -> asyncio.AbstractEventLoop | None:
+    """Loop dono do cliente — usado pelas pontes síncronas (`run_coroutine_threadsafe`)."""
+    return _loop
+
+def _origin(url: str) -> tuple[str, str]:
+    parts = urlsplit(url)
+    return parts.scheme, parts.netloc
+
+def rotate_http_client() -> None:
+    """
+    Troca o cliente compartilhado por um novo (pool vazio). O antigo é fechado depois
+    de `HTTP_READ_TIMEOUT`, dando tempo às requisições em andamento.
+    """
+    global _client
+    old, loop = _client, _loop
+    if old is None or old.is_closed or loop is None:
+        return
+    _client = build_http_client()
+    loop.call_later(_settings.http_read_timeout, lambda: loop.create_task(old.aclose()))
+    logger.info("Pool HTTP recriado após mudança de URL de serviço")
+
+def _on_service_url_change(service: str, old: str, new: str) -> None:
+    # mesmo host (só o caminho mudou): as conexões abertas continuam valendo
+    if _origin(old) == _origin(new) or _loop is None or _loop.is_closed():
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is _loop:
+        rotate_http_client()
+    else:
+        _loop.call_soon_threadsafe(rotate_http_client)
+
+service_urls.on_change(_on_service_url_change)
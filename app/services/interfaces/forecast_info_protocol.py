@@ -1,7 +1,15 @@
 # app/services/interfaces/forecast_info.py
+from collections.abc import Sequence
 from datetime import datetime
 from app.schemas.weather_forecast import ForecastInfo
 from typing import Protocol
 
 class AbstractForecastService(Protocol):
     def get_by_city_and_datetime(self, city: str, date: datetime) -> ForecastInfo | None: ...
+
+class AbstractAsyncForecastService(Protocol):
+    """
+    Variante assíncrona: previsões de várias datas da mesma cidade em uma chamada,
+    sem bloquear o event loop. Resultado na mesma ordem de `dates`.
+    """
+    async def aget_many(self, city: str, dates: Sequence[datetime]) -> list[ForecastInfo | None]: ...
@@ -3,4 +3,6 @@ from typing import Protocol
 from app.schemas.local_info import LocalInfoResponse
 
 class AbstractLocalInfoService(Protocol):
-    async def get_by_name(self, location_name: str) -> LocalInfoResponse | None: ...
\ No newline at end of file
+    async def get_by_name(self, location_name: str) -> LocalInfoResponse | None: ...
+
+    async def suggest(self, query: str, limit: int = 8) -> list[LocalInfoResponse]: ...
@@ -4,3 +4,4 @@ from app.schemas.user import UserInDB
 
 class AbstractUserRepo(Protocol):
     def get_by_username(self, username: str) -> UserInDB | None: ...
+    def update_roles(self, username: str, roles: list[str]) -> UserInDB | None: ...
@@ -1,8 +1,8 @@
 # app\services\local_info_api.py
-import httpx
 from app.services.interfaces.local_info_protocol import AbstractLocalInfoService
 from app.schemas.local_info import LocalInfo
 from app.utils.service_url import get_service_url
+from app.services.http_client import get_http_client
 
 class LocalInfoService(AbstractLocalInfoService):
     """
@@ -13,9 +13,9 @@ class LocalInfoService(AbstractLocalInfoService):
         base_url = get_service_url("local_info_url")
         url = f"{base_url}/local_info?lat={lat}&lon={lon}"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+        # cliente compartilhado (keep-alive): sem abrir pool/TLS novo a cada chamada
+        response = await get_http_client().get(url, timeout=10)
+        response.raise_for_status()
+        data = response.json()
 
         return LocalInfo(**data)
@@ -1,4 +1,7 @@
 # app/services/mock_forecast_info.py
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
 from datetime import datetime, timedelta
 from structlog import get_logger
 
@@ -7,54 +10,110 @@ from app.services.interfaces.forecast_info_protocol import AbstractForecastServi
 
 logger = get_logger().bind(module="mock_forecast_info")
 
+# Definições por cidade para variar um pouco
+_BASE_TEMP = {
+    "recife": 28,
+    "porto alegre": 21,
+    "são paulo": 23,
+    "fortaleza": 30,
+    "curitiba": 19,
+}
+_WEATHER_MAIN = ("Clear", "Rain", "Clouds", "Thunderstorm")
+_WEATHER_DESC = ("Céu limpo", "Chuva leve", "Nuvens dispersas", "Tempestade elétrica")
+
+_DAYS = 10
+_HOURS = (0, 6, 12, 18)
+
+class _CityGrid:
+    """
+    Grade de previsões de uma cidade, calculada uma única vez.
+    Arrays compactos indexados pelo slot: deslocamento (s) a partir da meia-noite
+    do dia pedido, temperatura e índice da condição.
+    """
+    __slots__ = ("offsets", "temperatures", "conditions")
+
+    def __init__(self, temp_base: int):
+        self.offsets = array("d")
+        self.temperatures = array("d")
+        self.conditions = array("b")
+        for day in range(_DAYS):
+            for hour in _HOURS:
+                idx = (day * 4 + hour // 6) % 4
+                self.offsets.append((day * 24 + hour) * 3600)
+                self.temperatures.append(temp_base + (idx * 2) + (hour / 8))
+                self.conditions.append(idx)
+
+    def nearest(self, offset: float) -> int:
+        """Slot mais próximo (empate → o mais cedo, como o antigo `min()`)."""
+        i = bisect_left(self.offsets, offset)
+        if i == 0:
+            return 0
+        if i == len(self.offsets):
+            return i - 1
+        return i - 1 if offset - self.offsets[i - 1] <= self.offsets[i] - offset else i
+
+    def build(self, start: datetime, slot: int) -> ForecastInfo:
+        idx = self.conditions[slot]
+        # valores já válidos por construção: dispensa a validação do Pydantic
+        return ForecastInfo.model_construct(
+            forecast_datetime=start + timedelta(seconds=self.offsets[slot]),
+            temperature=self.temperatures[slot],
+            weather_main=_WEATHER_MAIN[idx],
+            weather_desc=_WEATHER_DESC[idx],
+            humidity=65 + idx,
+            wind_speed=2.5 + idx,
+        )
+
+_GRIDS = {city: _CityGrid(temp) for city, temp in _BASE_TEMP.items()}
+
 class MockForecastService(AbstractForecastService):
     def get_by_city_and_datetime(self, city: str, date: datetime) -> ForecastInfo | None:
         """
-        Gera previsões simuladas a cada 6h para os próximos 10 dias para uma cidade,
-        e retorna a previsão mais próxima do datetime solicitado.
+        Simula previsões a cada 6h para os próximos 10 dias (a partir da meia-noite
+        do dia pedido) e retorna a mais próxima do datetime solicitado.
         Caso a cidade não exista na lista, retorna None.
         """
-        logger.info("Usando serviço de forecast mockado", city=city, date=date)
-        # Definições por cidade para variar um pouco
-        base_temp = {
-            "recife": 28,
-            "porto alegre": 21,
-            "são paulo": 23,
-            "fortaleza": 30,
-            "curitiba": 19
-        }
-        temp_base = base_temp.get(city.lower())  # Não define default, retorna None se não existir
-        
-        if temp_base is None:
-            logger.warning("Cidade não suportada na simulação de previsão", city=city, date=str(date))
+        grid = self._grid(city, date)
+        if grid is None:
             return None
-
-        previsoes = []
-        # start = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        start = date.replace(hour=0, minute=0)
-        for day in range(10):
-            for hour in [0, 6, 12, 18]:
-                dt = start + timedelta(days=day, hours=hour)
-                idx = (day * 4 + hour // 6) % 4
-                previsoes.append(
-                    ForecastInfo(
-                        forecast_datetime=dt,
-                        temperature=temp_base + (idx * 2) + (hour / 8),
-                        weather_main=["Clear", "Rain", "Clouds", "Thunderstorm"][idx],
-                        weather_desc=["Céu limpo", "Chuva leve", "Nuvens dispersas", "Tempestade elétrica"][idx],
-                        humidity=65 + idx,
-                        wind_speed=2.5 + idx,
-                    )
-                )
-        
-        # Compara todas as distâncias em segundos e devolve o objeto ForecastInfo cuja data/hora está mais próxima
-        forecast = min(previsoes, key=lambda p: abs((p.forecast_datetime - date).total_seconds()))
-        logger.info(
+        start = date.replace(hour=0, minute=0, second=0, microsecond=0)   # slots em horas cheias: segundos do pedido não vazam para `forecast_datetime`
+        forecast = grid.build(start, grid.nearest((date - start).total_seconds()))
+        logger.debug(
             "Previsão simulada gerada",
             city=city,
             data_solicitada=str(date),
             data_prevista=str(forecast.forecast_datetime),
             condicao=forecast.weather_main
         )
-        
-        return forecast
\ No newline at end of file
+        return forecast
+
+    def get_many(self, city: str, dates: Iterable[datetime]) -> list[ForecastInfo | None]:
+        """
+        Versão em lote: uma busca de cidade para todas as datas e um único modelo
+        por slot distinto (datas no mesmo slot recebem o mesmo objeto).
+        """
+        dates = list(dates)
+        grid = self._grid(city, dates[0] if dates else None)
+        if grid is None:
+            return [None] * len(dates)
+
+        built: dict[tuple[datetime, int], ForecastInfo] = {}
+        result: list[ForecastInfo | None] = []
+        for date in dates:
+            start = date.replace(hour=0, minute=0, second=0, microsecond=0)
+            key = (start, grid.nearest((date - start).total_seconds()))
+            if (forecast := built.get(key)) is None:
+                forecast = built[key] = grid.build(*key)
+            result.append(forecast)
+        return result
+
+    async def aget_many(self, city: str, dates: Sequence[datetime]) -> list[ForecastInfo | None]:
+        """Variante assíncrona: a grade é pré-calculada (sem I/O), então roda direto no loop."""
+        return self.get_many(city, dates)
+
+    @staticmethod
+    def _grid(city: str, date: datetime | None) -> _CityGrid | None:
+        grid = _GRIDS.get(city.lower())  # Não define default, retorna None se não existir
+        if grid is None:
+            logger.warning("Cidade não suportada na simulação de previsão", city=city, date=str(date))
+        return grid
@@ -1,53 +1,109 @@
 # app/services/mock_local_info.py
+import csv
+import re
 import unicodedata
+from collections.abc import Iterable
+from functools import cached_property
+from pathlib import Path
+
+from pydantic import TypeAdapter
 from structlog import get_logger
 
 from app.schemas.local_info import LocalInfoResponse
 from app.services.interfaces.local_info_protocol import AbstractLocalInfoService
+from app.utils.suggest_index import SuggestIndex
 
 from app.schemas.venue_type import VenueTypes
 
 logger = get_logger().bind(module="mock_local_info")
 
+_SEPARATORS = re.compile(r"[\s_\-–—/.,]+")
+_venues_adapter = TypeAdapter(list[LocalInfoResponse])
+
+DEFAULT_VENUES = [
+    LocalInfoResponse(location_name="cesar", capacity=200, venue_type=VenueTypes.AUDITORIO, is_accessible=True, address="Rua Bione, 220", manually_edited=False),
+    LocalInfoResponse(location_name="auditorio central", capacity=350, venue_type=VenueTypes.AUDITORIO, is_accessible=True, address="Av. Central, 123", manually_edited=False),
+    LocalInfoResponse(location_name="salao azul", capacity=100, venue_type=VenueTypes.SALAO, is_accessible=False, address="Rua Azul, 10", manually_edited=False),
+    LocalInfoResponse(location_name="teatro municipal", capacity=500, venue_type=VenueTypes.AUDITORIO, is_accessible=True, address="Praça Matriz, 5", manually_edited=False),
+    LocalInfoResponse(location_name="espaço verde", capacity=150, venue_type=VenueTypes.SALAO, is_accessible=False, address="Rua das Palmeiras, 200", manually_edited=False),
+    LocalInfoResponse(location_name="galpão criativo", capacity=80, venue_type=VenueTypes.SALAO, is_accessible=True, address="Rua do Comércio, 45", manually_edited=False),
+    LocalInfoResponse(location_name="centro cultural", capacity=400, venue_type=VenueTypes.AUDITORIO, is_accessible=True, address="Av. Cultura, 555", manually_edited=False),
+    LocalInfoResponse(location_name="biblioteca", capacity=60, venue_type=VenueTypes.SALAO, is_accessible=True, address="Rua do Saber, 77", manually_edited=False),
+    LocalInfoResponse(location_name="sala amarela", capacity=40, venue_type=VenueTypes.SALAO, is_accessible=False, address="Rua Sol, 33", manually_edited=False),
+    LocalInfoResponse(location_name="auditorio beta", capacity=220, venue_type=VenueTypes.AUDITORIO, is_accessible=True, address="Av. Beta, 101", manually_edited=False),
+]
+
+def normalize_venue_name(text: str) -> str:
+    """Remove acentos, troca separadores (_ - – / . ,) por espaço, colapsa espaços e coloca em minúsculas."""
+    text = unicodedata.normalize("NFD", text.lower())
+    text = "".join(c for c in text if unicodedata.category(c) != "Mn")
+    return _SEPARATORS.sub(" ", text).strip()
+
+def load_venues(path: str | Path) -> list[LocalInfoResponse]:
+    """
+    Lê locais de um arquivo `.json` (lista de objetos) ou `.csv` (cabeçalho com os
+    campos de `LocalInfoResponse`). A validação é feita em lote pelo Pydantic.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8") as f:
+            rows = [{k: v for k, v in row.items() if v != ""} for row in csv.DictReader(f)]
+        return _venues_adapter.validate_python(rows)
+    return _venues_adapter.validate_json(path.read_bytes())
+
 class MockLocalInfoService(AbstractLocalInfoService):
-    def __init__(self):
-        self._db = [  # já tem essa lista de mocks
-            LocalInfoResponse(location_name="cesar", capacity=200, venue_type=VenueTypes.AUDITORIO, is_accessible=True, address="Rua Bione, 220", manually_edited=False),
-            LocalInfoResponse(location_name="auditorio central", capacity=350, venue_type=VenueTypes.AUDITORIO, is_accessible=True, address="Av. Central, 123", manually_edited=False),
-            LocalInfoResponse(location_name="salao azul", capacity=100, venue_type=VenueTypes.SALAO, is_accessible=False, address="Rua Azul, 10", manually_edited=False),
-            LocalInfoResponse(location_name="teatro municipal", capacity=500, venue_type=VenueTypes.AUDITORIO, is_accessible=True, address="Praça Matriz, 5", manually_edited=False),
-            LocalInfoResponse(location_name="espaço verde", capacity=150, venue_type=VenueTypes.SALAO, is_accessible=False, address="Rua das Palmeiras, 200", manually_edited=False),
-            LocalInfoResponse(location_name="galpão criativo", capacity=80, venue_type=VenueTypes.SALAO, is_accessible=True, address="Rua do Comércio, 45", manually_edited=False),
-            LocalInfoResponse(location_name="centro cultural", capacity=400, venue_type=VenueTypes.AUDITORIO, is_accessible=True, address="Av. Cultura, 555", manually_edited=False),
-            LocalInfoResponse(location_name="biblioteca", capacity=60, venue_type=VenueTypes.SALAO, is_accessible=True, address="Rua do Saber, 77", manually_edited=False),
-            LocalInfoResponse(location_name="sala amarela", capacity=40, venue_type=VenueTypes.SALAO, is_accessible=False, address="Rua Sol, 33", manually_edited=False),
-            LocalInfoResponse(location_name="auditorio beta", capacity=220, venue_type=VenueTypes.AUDITORIO, is_accessible=True, address="Av. Beta, 101", manually_edited=False),
-        ]
+    """
+    Locais em memória indexados pelo nome normalizado — busca O(1).
+    Feito para viver o processo inteiro (ver `provide_local_info_service`):
+    o índice é montado uma vez, no construtor.
+    """
+
+    def __init__(self, venues: Iterable[LocalInfoResponse] | None = None):
+        self._index: dict[str, LocalInfoResponse] = {}
+        for item in DEFAULT_VENUES if venues is None else venues:
+            key = normalize_venue_name(item.location_name)
+            if key in self._index:
+                logger.debug("Local duplicado; mantendo o primeiro", location_name=item.location_name, normalizado=key)
+                continue
+            self._index[key] = item
+        logger.info("Índice de locais montado", total=len(self._index))
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "MockLocalInfoService":
+        return cls(load_venues(path))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @cached_property
+    def _suggest_index(self) -> SuggestIndex:
+        index = SuggestIndex(list(self._index))
+        logger.info("Índice de autocomplete montado", total=len(index))
+        return index
+
+    def build_suggest_index(self) -> SuggestIndex:
+        """Monta (uma vez) o índice de autocomplete; chamado no startup para não pesar no 1º request."""
+        return self._suggest_index
 
     def _normalize(self, text: str) -> str:
-        """Remove acentos, _/–, espaços duplicados e coloca tudo em minúsculas."""
-        original = text
-        
-        text = text.strip().lower()
-        text = text.replace("_", " ").replace("-", " ")
-
-        # remove acentos
-        text = unicodedata.normalize("NFD", text)
-        text = "".join(c for c in text if unicodedata.category(c) != "Mn")
-
-        # colapsa espaços múltiplos
-        normalized = " ".join(text.split())
-        
-        logger.debug("Nome normalizado", original=original, normalizado=normalized)
-        return normalized
+        return normalize_venue_name(text)
 
     # era: async def get_by_name(…)
     async def get_by_name(self, location_name: str) -> LocalInfoResponse | None:
-        name = self._normalize(location_name)
-        for item in self._db:
-            if item.location_name == name:
-                logger.info("Local encontrado", original=location_name, normalizado=name)
-                return item
+        name = normalize_venue_name(location_name)
+        item = self._index.get(name)
+        if item is not None:
+            logger.info("Local encontrado", original=location_name, normalizado=name)
+            return item
 
         logger.warning("Local não encontrado", original=location_name, normalizado=name)
-        return None
\ No newline at end of file
+        return None
+
+    async def get_many_by_name(self, names: Iterable[str]) -> dict[str, LocalInfoResponse | None]:
+        """Vários nomes de uma vez (importação em lote): um acesso ao índice por nome."""
+        return {name: self._index.get(normalize_venue_name(name)) for name in names}
+
+    async def suggest(self, query: str, limit: int = 8) -> list[LocalInfoResponse]:
+        """Autocomplete: até `limit` locais por prefixo do nome, prefixo de palavra e similaridade."""
+        index = self.build_suggest_index()
+        return [self._index[index.names[i]] for i in index.search(normalize_venue_name(query), limit)]
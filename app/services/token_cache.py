@@ -0,0 +1,155 @@
+# app/services/token_cache.py
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from structlog import get_logger
+
+from app.core.config import get_settings
+from app.core.metrics import CACHE_REQUESTS
+from app.schemas.user import UserInDB
+from app.utils.circuit_breaker import redis_breaker
+
+logger = get_logger().bind(module="token_cache")
+
+_settings = get_settings()
+
+_PREFIX = "auth-token"
+
+_LISTEN_POLL = 1.0      # espera máxima por mensagem (s); substitui o `socket_timeout` do cliente compartilhado
+
+class VerifiedTokenCache:
+    """
+    Tokens JWT já verificados → usuário resolvido (com papéis), por processo.
+
+    - Chave: digest do token (o token em si não fica na memória do cache).
+    - Validade: o menor entre o `exp` do token e `ttl` segundos — um token expirado
+      nunca é aceito e mudanças no usuário aparecem em no máximo `ttl`.
+    - LRU limitado a `max_entries`.
+    - `invalidate_user` derruba todos os tokens de um usuário (remoção, troca de papéis)
+      neste worker; `revoke_user` também publica o nome no canal `AUTH_TOKEN_CACHE_CHANNEL`,
+      e `listen` (iniciado no lifespan) aplica nos demais workers. Se a conexão cair,
+      o cache é esvaziado ao reconectar (avisos perdidos no meio-tempo); canal ocioso não conta.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, tuple[UserInDB, float]] = OrderedDict()
+        self._by_user: dict[str, set[bytes]] = {}
+        self._lock = threading.Lock()                      # get_current_user roda no threadpool
+        self._task: asyncio.Task | None = None
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token: str) -> UserInDB | None:
+        if self.ttl <= 0:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(key)
+                CACHE_REQUESTS.labels("l1", _PREFIX, "hit").inc()
+                return entry[0]
+            if entry is not None:
+                self._drop(key)
+        CACHE_REQUESTS.labels("l1", _PREFIX, "miss").inc()
+        return None
+
+    def put(self, token: str, user: UserInDB, exp: float | None) -> None:
+        if self.ttl <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        key = self._key(token)
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (user, expires_at)
+            self._by_user.setdefault(user.username, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: bytes) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_user.get(entry[0].username)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[entry[0].username]
+
+    def invalidate_user(self, username: str) -> int:
+        with self._lock:
+            keys = list(self._by_user.get(username, ()))
+            for key in keys:
+                self._drop(key)
+        if keys:
+            logger.info("Tokens em cache invalidados", username=username, total=len(keys))
+        return len(keys)
+
+    def revoke_user(self, username: str, redis=None) -> int:
+        """Invalida aqui e avisa os outros workers — falha no Redis só é logada (lá vale o `ttl`)."""
+        total = self.invalidate_user(username)
+        if redis is None:
+            return total
+        try:
+            with redis_breaker.guard():
+                redis.publish(_settings.auth_token_cache_channel, username)
+        except Exception as e:
+            logger.warning("Falha ao publicar invalidação de tokens; outros workers expiram pelo TTL", username=username, error=str(e))
+        return total
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    # ── sincronização entre workers ───────────────────
+    async def listen(self, redis, *, retry_delay: float = 5.0) -> None:
+        """Aplica as invalidações publicadas por outros workers; reconecta se o Redis cair."""
+        missed = False
+        while True:
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(_settings.auth_token_cache_channel)
+                if missed:
+                    self.clear()                           # avisos enquanto estava fora: não dá para saber quais
+                    missed = False
+                while True:
+                    # canal ocioso devolve None (não é erro); o PING de saúde do cliente segue valendo
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=_LISTEN_POLL)
+                    if message is not None and message.get("type") == "message":
+                        data = message["data"]
+                        self.invalidate_user(data.decode() if isinstance(data, bytes) else data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                missed = True
+                logger.warning("Canal de invalidação de tokens indisponível; tentando de novo", error=str(e), retry_in=retry_delay)
+            finally:
+                await pubsub.aclose()
+            await asyncio.sleep(retry_delay)
+
+    async def start(self, redis=None) -> None:
+        loop = asyncio.get_running_loop()
+        if redis is None or (self._task is not None and not self._task.done() and self._task.get_loop() is loop):
+            return
+        self._task = loop.create_task(self.listen(redis))  # tarefa de um loop antigo (já encerrado) é descartada
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+verified_tokens = VerifiedTokenCache(_settings.auth_token_cache_ttl, _settings.auth_token_cache_max_entries)
@@ -4,6 +4,15 @@ from app.schemas.user import UserInDB
 from app.services.interfaces.user_protocol import AbstractUserRepo
 from app.models.models_user import User  # supondo que você terá um modelo SQLAlchemy
 
+def _to_schema(db_user: User) -> UserInDB:
+    # papéis ficam na coluna como string separada por vírgula
+    return UserInDB(
+        username=db_user.username,
+        full_name=db_user.full_name,
+        hashed_password=db_user.hashed_password,
+        roles=[role for role in (db_user.roles or "").split(",") if role],
+    )
+
 class UserRepo(AbstractUserRepo):
     def __init__(self, db: Session):
         self.db = db
@@ -12,4 +21,13 @@ class UserRepo(AbstractUserRepo):
         db_user = self.db.query(User).filter_by(username=username).first()
         if not db_user:
             return None
-        return UserInDB.model_validate(db_user)
+        return _to_schema(db_user)
+
+    def update_roles(self, username: str, roles: list[str]) -> UserInDB | None:
+        db_user = self.db.query(User).filter_by(username=username).first()
+        if not db_user:
+            return None
+        db_user.roles = ",".join(roles)
+        self.db.commit()
+        self.db.refresh(db_user)
+        return _to_schema(db_user)
@@ -0,0 +1,92 @@
+# app/services/venue_resolver.py
+import asyncio
+import inspect
+from collections.abc import Iterable
+
+from structlog import get_logger
+
+from app.schemas.local_info import LocalInfoResponse
+from app.services.interfaces.local_info_protocol import AbstractLocalInfoService
+from app.services.mock_local_info import normalize_venue_name
+
+logger = get_logger().bind(module="venue_resolver")
+
+async def get_venues_by_name(
+    service: AbstractLocalInfoService, names: Iterable[str],
+) -> dict[str, LocalInfoResponse | None]:
+    """Locais de vários nomes: usa `get_many_by_name` se o serviço tiver; senão um `get_by_name` por nome, em paralelo."""
+    names = list(dict.fromkeys(names))
+    get_many = getattr(service, "get_many_by_name", None)
+    if inspect.iscoroutinefunction(get_many):
+        return await get_many(names)
+    found = await asyncio.gather(*(service.get_by_name(name) for name in names))
+    return dict(zip(names, found))
+
+class VenueResolver:
+    """
+    Resolve cada local distinto **uma vez por lote** (upload CSV, `/lote`) e compartilha
+    o mesmo objeto entre as linhas — `LocalInfoResponse` é imutável (frozen).
+
+    Na coluna `local_info` do CSV vale:
+    - JSON do local (`{"location_name": ..., ...}`): validado uma vez por texto distinto;
+    - só o nome (`Teatro Municipal`): buscado no serviço de locais em um único lote (`prefetch`).
+    """
+
+    def __init__(self, service: AbstractLocalInfoService | None = None):
+        self.service = service
+        self._by_raw: dict[str, LocalInfoResponse | Exception] = {}
+        self._by_name: dict[str, LocalInfoResponse | None] = {}
+        self._interned: dict[tuple, LocalInfoResponse] = {}
+        self.parsed = 0                                   # validações de fato feitas (métrica de reuso)
+
+    @staticmethod
+    def _is_json(raw: str) -> bool:
+        return raw.lstrip().startswith("{")
+
+    def intern(self, venue: LocalInfoResponse | None) -> LocalInfoResponse | None:
+        """Mesmo local (nome normalizado + demais campos) → mesma instância."""
+        if venue is None:
+            return None
+        key = (
+            normalize_venue_name(venue.location_name), venue.capacity, venue.venue_type,
+            venue.is_accessible, venue.address, venue.manually_edited,
+        )
+        return self._interned.setdefault(key, venue)
+
+    async def prefetch(self, raws: Iterable[str | None]) -> None:
+        """Busca no serviço, em uma chamada, todos os locais referenciados só pelo nome."""
+        names = {
+            normalize_venue_name(raw) for raw in raws
+            if raw and raw.strip() and not self._is_json(raw)
+        } - self._by_name.keys()
+        if not names or self.service is None:
+            return
+        found = await get_venues_by_name(self.service, names)
+        for name in names:
+            self._by_name[name] = self.intern(found.get(name))
+        logger.info("Locais do lote buscados no serviço", total=len(names), encontrados=sum(v is not None for v in found.values()))
+
+    def resolve(self, raw: str | None) -> LocalInfoResponse:
+        """Local de uma linha; erros de validação também são memoizados (e relançados)."""
+        if raw is None or not raw.strip():
+            raise ValueError("local_info ausente")
+        cached = self._by_raw.get(raw)
+        if cached is None:
+            try:
+                cached = self._resolve(raw)
+            except (ValueError, TypeError) as e:
+                cached = e
+            self._by_raw[raw] = cached
+        if isinstance(cached, Exception):
+            raise cached.with_traceback(None)
+        return cached
+
+    def _resolve(self, raw: str) -> LocalInfoResponse:
+        if not self._is_json(raw):
+            name = normalize_venue_name(raw)
+            venue = self._by_name.get(name)
+            if venue is None:
+                raise ValueError(f"Local não encontrado: {raw.strip()}")
+            return venue
+        self.parsed += 1
+        return self.intern(LocalInfoResponse.model_validate_json(raw))
@@ -0,0 +1,47 @@
+# app/utils/blocking.py
+import asyncio
+import contextvars
+import functools
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+from app.core.config import get_settings
+
+T = TypeVar("T")
+
+_settings = get_settings()
+
+# ──────────────────────────────────────────────────────
+# Executor limitado para chamadas síncronas feitas a partir de código async
+# (repositório SQL, serviços síncronos). Diferente do `asyncio.to_thread`, que usa o
+# executor padrão do loop, o tamanho aqui é explícito: N chamadas bloqueantes
+# simultâneas no máximo — o resto espera na fila sem abrir mais conexões ao banco.
+# ──────────────────────────────────────────────────────
+_executor: ThreadPoolExecutor | None = None
+_lock = threading.Lock()
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_settings.blocking_executor_workers,
+                thread_name_prefix="blocking",
+            )
+        return _executor
+
+async def run_blocking(fn: Callable[..., T], /, *args, **kwargs) -> T:
+    """Executa `fn(*args, **kwargs)` no executor limitado sem travar o event loop (preserva contextvars)."""
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(get_blocking_executor(), functools.partial(ctx.run, fn, *args, **kwargs))
+
+def shutdown_blocking_executor(wait: bool = True) -> None:
+    """Encerra o executor (shutdown do app); uma nova chamada cria outro sob demanda."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
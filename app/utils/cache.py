@@ -1,61 +1,608 @@
 # app/utils/cache.py
 import json
+import time
+import hashlib
+import struct
+import zlib
+import uuid
+import asyncio
 import functools
 import inspect
-from typing import TypeVar
+import anyio.from_thread
+from collections import OrderedDict
+from typing import Any, TypeVar
 
 from collections.abc import Callable, Awaitable
 from redis.asyncio import Redis
+from fastapi import HTTPException, Request, Response
 from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
 from structlog import get_logger
 
-from app.deps import provide_redis
+from app.deps import provide_redis_bytes as provide_redis
+from app.core.config import get_settings
+from app.core.metrics import CACHE_REQUESTS, CACHE_COALESCED
+from app.utils.circuit_breaker import CircuitOpenError, redis_breaker
+from app.utils.http import etag_matches, not_modified_since, not_modified, cache_headers
 
 logger = get_logger().bind(module="cache")
 
+_settings = get_settings()
+
 T = TypeVar("T")
 
-def _make_key(prefix: str, bound_args: dict) -> str:
-    """Gera uma chave determinística e curta."""
-    """Evita tipos não determinísticos na key."""
+_MISSING = object()   # sentinela: distingue "não está no cache" de um valor `None`
+
+# ──────────────────────────────────────────────────────
+# disjuntor: Redis lento/fora ⇒ fallback imediato, sem esperar timeout a cada request.
+# Toda chamada ao Redis deste módulo passa por `_guarded` (leitura, escrita, locks, polling).
+# ──────────────────────────────────────────────────────
+_guarded = redis_breaker.call
+
+class LocalLRUCache:
+    """
+    Cache L1 em memória do processo (um por worker).
+
+    LRU limitado por nº de entradas **e** por bytes (tamanho do JSON),
+    com TTL individual por entrada. Não é compartilhado entre workers:
+    a coerência vem do TTL curto (limitado por `CACHE_L1_MAX_TTL`).
+    """
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()   # key → (expira_em, bytes, valor)
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return _MISSING
+        expires_at, _, value = item
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return _MISSING
+        self._data.move_to_end(key)         # marca como usado recentemente
+        return value
+
+    def set(self, key: str, value: Any, size: int, ttl: float) -> None:
+        if ttl <= 0 or size > self.max_bytes:
+            return                          # não cabe (ou não deve ser guardado)
+        self.delete(key)
+        self._data[key] = (time.monotonic() + ttl, size, value)
+        self._bytes += size
+        while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, old_size, _) = self._data.popitem(last=False)   # remove o menos usado
+            self._bytes -= old_size
+
+    def delete(self, key: str) -> None:
+        item = self._data.pop(key, None)
+        if item is not None:
+            self._bytes -= item[1]
+
+    def delete_prefix(self, prefix: str) -> int:
+        keys = [k for k in self._data if k.startswith(prefix)]
+        for k in keys:
+            self.delete(k)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._bytes = 0
+
+_local_cache = LocalLRUCache(
+    max_entries=_settings.cache_l1_max_entries,
+    max_bytes=_settings.cache_l1_max_bytes,
+)
+
+def invalidate_local(prefix: str | None = None) -> int:
+    """Descarta entradas do L1 deste worker (todas, ou só as de um prefixo)."""
+    if prefix is None:
+        total = len(_local_cache)
+        _local_cache.clear()
+        return total
+    return _local_cache.delete_prefix(prefix + ":")
+
+# ──────────────────────────────────────────────────────
+# single-flight: 1 recomputação por chave, mesmo com N requisições simultâneas
+# ──────────────────────────────────────────────────────
+_inflight: dict[str, asyncio.Future] = {}   # key → cálculo em andamento neste worker
+
+def _consume_exception(fut: asyncio.Future) -> None:
+    """Evita o aviso 'Future exception was never retrieved' quando ninguém mais espera."""
+    if not fut.cancelled():
+        fut.exception()
+
+async def _single_flight(key: str, prefix: str, fill: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Coalesce *misses* concorrentes dentro do processo: o primeiro chamador
+    executa `fill()`, os demais aguardam o mesmo future.
+    """
+    if (pending := _inflight.get(key)) is not None:
+        CACHE_COALESCED.labels(prefix, "local").inc()
+        logger.debug("Aguardando cálculo em andamento (single-flight)", prefix=prefix, key=key)
+        return await asyncio.shield(pending)
+
+    fut: asyncio.Future = asyncio.get_running_loop().create_future()
+    fut.add_done_callback(_consume_exception)
+    _inflight[key] = fut
+    try:
+        value = await fill()
+    except asyncio.CancelledError:
+        fut.cancel()
+        raise
+    except BaseException as exc:
+        fut.set_exception(exc)
+        raise
+    else:
+        fut.set_result(value)
+        return value
+    finally:
+        _inflight.pop(key, None)
+
+async def _acquire_lock(redis_client: Redis, key: str) -> str | None:
+    """Tenta `SET lock:<key> <token> NX PX`; devolve o token se conseguiu."""
+    token = uuid.uuid4().hex
+    if await _guarded(redis_client.set, f"lock:{key}", token, nx=True, px=_settings.cache_lock_timeout_ms):
+        return token
+    return None
+
+async def _release_lock(redis_client: Redis, key: str, token: str) -> None:
+    """
+    Libera só se o lock ainda for nosso (pode ter expirado e sido pego por outro).
+    Nunca levanta: roda depois do cálculo, e uma falha aqui não pode descartar o valor
+    (o lock expira sozinho em `CACHE_LOCK_TIMEOUT_MS`).
+    """
+    try:
+        if await _guarded(redis_client.get, f"lock:{key}") == token.encode():
+            await _guarded(redis_client.delete, f"lock:{key}")
+    except Exception as e:
+        logger.warning("Erro ao liberar lock do cache", key=key, error=str(e))
+
+async def _fill_with_lock(
+    redis_client: Redis,
+    key: str,
+    prefix: str,
+    compute: Callable[[], Awaitable[Any]],
+    load: Callable[[bytes], Any],
+) -> Any:
+    """
+    Coalesce *misses* entre workers com `SET lock:<key> NX PX`.
+
+    - Quem obtém o lock recalcula e grava o valor.
+    - Os demais fazem *polling* da chave até ela ser preenchida.
+    - Se o lock expirar sem preenchimento (dono travou/caiu), recalcula localmente.
+    """
+    lock_ms = _settings.cache_lock_timeout_ms
+
+    if (token := await _acquire_lock(redis_client, key)):
+        try:
+            return await compute()
+        finally:
+            await _release_lock(redis_client, key, token)
+
+    CACHE_COALESCED.labels(prefix, "redis").inc()
+    logger.debug("Lock ocupado por outro worker; aguardando preenchimento", prefix=prefix, key=key)
+    deadline = time.monotonic() + lock_ms / 1000
+    while time.monotonic() < deadline:
+        await asyncio.sleep(_settings.cache_lock_poll_ms / 1000)
+        if (cached := await _guarded(redis_client.get, key)) and (value := load(cached)) is not _MISSING:
+            CACHE_REQUESTS.labels("l2", prefix, "hit").inc()
+            return value
+
+    logger.warning("Timeout aguardando lock do cache; recalculando", prefix=prefix, key=key, lock_ms=lock_ms)
+    return await compute()
+
+# ──────────────────────────────────────────────────────
+# stale-while-revalidate: devolve o valor velho e recalcula em background
+# ──────────────────────────────────────────────────────
+_background_tasks: set[asyncio.Task] = set()   # mantém referência forte às tasks de revalidação
+
+def _revalidate(redis_client: Redis, key: str, prefix: str, compute: Callable[[], Awaitable[Any]]) -> None:
+    """
+    Agenda **uma** revalidação da chave: ignora se já há recálculo neste worker
+    (`_inflight`) ou em outro worker (lock no Redis ocupado).
+    """
+    if key in _inflight:
+        return
+
+    async def _refresh() -> None:
+        if not (token := await _acquire_lock(redis_client, key)):
+            logger.debug("Revalidação já em andamento em outro worker", prefix=prefix, key=key)
+            return
+        try:
+            await compute()
+            logger.debug("Entrada revalidada em background", prefix=prefix, key=key)
+        finally:
+            await _release_lock(redis_client, key, token)
+
+    async def _run() -> None:
+        try:
+            await _single_flight(key, prefix, _refresh)
+        except Exception as e:
+            logger.warning("Falha ao revalidar entrada do cache", prefix=prefix, key=key, error=str(e))
+
+    task = asyncio.create_task(_run())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+# ──────────────────────────────────────────────────────
+# tags: contador de versão por tag, embutido na chave
+# ──────────────────────────────────────────────────────
+_TAG_KEY = "cache:tag:{}"
+_tag_versions: dict[str, tuple[int, float]] = {}   # tag → (versão, válida_até) — cópia local curta
+
+async def _resolve_tag_versions(redis_client: Redis, tags: list[str]) -> list[int]:
+    """
+    Versões atuais das tags. Usa a cópia local (válida por `CACHE_L1_MAX_TTL`)
+    para não custar um round trip a cada hit; só faz `MGET` do que expirou.
+    """
+    now = time.monotonic()
+    missing = [t for t in tags if (v := _tag_versions.get(t)) is None or v[1] <= now]
+    if missing:
+        values = await _guarded(redis_client.mget, [_TAG_KEY.format(t) for t in missing])
+        for tag, value in zip(missing, values):
+            _tag_versions[tag] = (int(value or 0), now + _settings.cache_l1_max_ttl)
+    return [_tag_versions[t][0] for t in tags]
+
+async def invalidate_tags(*tags: str) -> None:
+    """
+    Invalida todas as entradas marcadas com as tags (`INCR cache:tag:<tag>`).
+
+    As chaves antigas não são apagadas: como a versão faz parte da chave, elas
+    simplesmente deixam de ser lidas e expiram pelo TTL. Outros workers enxergam
+    a nova versão em até `CACHE_L1_MAX_TTL` segundos.
+    """
+    if not tags:
+        return
+    try:
+        redis_client: Redis = await provide_redis()
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(_TAG_KEY.format(tag))
+            versions = await _guarded(pipe.execute)
+        now = time.monotonic()
+        for tag, version in zip(tags, versions):
+            _tag_versions[tag] = (int(version), now + _settings.cache_l1_max_ttl)
+        logger.info("Tags do cache invalidadas", tags=list(tags))
+    except Exception as e:
+        # sem Redis não há o que invalidar no L2; descarta as versões locais para reler depois
+        for tag in tags:
+            _tag_versions.pop(tag, None)
+        logger.warning("Erro ao invalidar tags do cache", tags=list(tags), error=str(e))
+
+async def tags_etag(*tags: str, salt: str = "", weak: bool = False) -> str | None:
+    """
+    ETag derivada das versões atuais das tags (+ `salt`, ex.: filtros da consulta).
+    Permite responder 304 **antes** de ir ao repositório. `None` se o Redis estiver fora.
+    `weak=True` (`W/"…"`) quando o corpo muda sem invalidar as tags (ex.: contador de views).
+    """
+    try:
+        redis_client: Redis = await provide_redis()
+        versions = await _resolve_tag_versions(redis_client, list(tags))
+    except Exception as e:
+        logger.warning("Erro ao ler versões das tags para ETag", tags=list(tags), error=str(e))
+        return None
+    raw = "|".join(f"{t}={v}" for t, v in zip(tags, versions)) + "|" + salt
+    etag = '"' + hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest() + '"'
+    return "W/" + etag if weak else etag
+
+def tags_etag_sync(*tags: str, salt: str = "", weak: bool = False) -> str | None:
+    """Versão de `tags_etag` para handlers `def` (threadpool do AnyIO)."""
+    try:
+        return anyio.from_thread.run(functools.partial(tags_etag, *tags, salt=salt, weak=weak))
+    except RuntimeError:
+        return None
+
+def invalidate_tags_sync(*tags: str) -> None:
+    """Versão de `invalidate_tags` para handlers `def` (rodam no threadpool do FastAPI/AnyIO)."""
+    try:
+        anyio.from_thread.run(invalidate_tags, *tags)
+    except RuntimeError as e:
+        # fora de uma worker thread do AnyIO (ex.: script): não há event loop para falar com o Redis
+        for tag in tags:
+            _tag_versions.pop(tag, None)
+        logger.warning("Invalidação de tags fora do event loop ignorada", tags=list(tags), error=str(e))
+
+# ──────────────────────────────────────────────────────
+# envelope binário: cabeçalho fixo + corpo JSON já codificado (zlib opcional)
+# ──────────────────────────────────────────────────────
+_HEADER = struct.Struct("!BBd")   # formato, flags, fresh_until (epoch)
+_ENTRY_FORMAT = 1                 # entradas antigas (JSON puro, começam com "{") viram *miss*
+_FLAG_ZLIB = 0x01
+_FLAG_NEGATIVE = 0x02             # corpo = `detail` de um 404 (cache negativo)
+
+def _dump_entry(body: bytes, fresh_for: int, negative: bool = False) -> bytes:
+    """
+    Envelope gravado no Redis: cabeçalho com o instante até quando o corpo é
+    "fresco" + o corpo. Acima de `CACHE_COMPRESS_MIN_BYTES` tenta zlib e só
+    mantém a versão comprimida se ela for de fato menor.
+    """
+    flags = _FLAG_NEGATIVE if negative else 0
+    if len(body) >= _settings.cache_compress_min_bytes:
+        compressed = zlib.compress(body, _settings.cache_compress_level)
+        if len(compressed) < len(body):
+            body, flags = compressed, flags | _FLAG_ZLIB
+    return _HEADER.pack(_ENTRY_FORMAT, flags, time.time() + fresh_for) + body
+
+def _parse_entry(raw: bytes) -> tuple[bytes, float, bool] | None:
+    """Devolve `(corpo, fresh_until, negativo)`, ou `None` se a entrada não estiver no formato atual."""
+    if len(raw) < _HEADER.size or raw[0] != _ENTRY_FORMAT:
+        return None
+    _, flags, fresh_until = _HEADER.unpack_from(raw)
+    body = raw[_HEADER.size:]
+    if flags & _FLAG_ZLIB:
+        body = zlib.decompress(body)
+    return body, fresh_until, bool(flags & _FLAG_NEGATIVE)
+
+class _NegativeEntry:
+    """Valor de um 404 cacheado (L1/single-flight): vira `HTTPException` na saída."""
+    __slots__ = ("detail",)
+
+    def __init__(self, detail: Any):
+        self.detail = detail
+
+class _FunctionError(Exception):
+    """Erro da própria função cacheada (não do Redis): propaga sem fallback nem 2ª execução."""
+
+    def __init__(self, original: Exception):
+        super().__init__(str(original))
+        self.original = original
+
+# ──────────────────────────────────────────────────────
+# chaves: estáveis entre processos + versão por prefixo
+# ──────────────────────────────────────────────────────
+_namespaces: dict[str, int] = {}   # prefixo → versão do schema (registrado pelo decorator)
+
+def _make_key(prefix: str, bound_args: dict, version: int = 1, exclude: frozenset[str] = frozenset()) -> str:
+    """
+    Gera uma chave determinística e curta: `<prefix>:v<version>:<blake2b>`.
+    `exclude`: parâmetros que nunca entram na chave, qualquer que seja o valor
+    (ex.: `request: Request`, que vale `None` quando o endpoint é chamado direto).
+
+    ⚠️ Não usar `hash()`: ele é aleatório por processo (`PYTHONHASHSEED`),
+    então cada worker/restart gravaria chaves diferentes para os mesmos args.
+    """
+    # Evita tipos não determinísticos na key (Request, repos, sessões...)
     SAFE_TYPES = (str, int, float, bool, type(None))
-    clean = {k: v for k, v in bound_args.items() if isinstance(v, SAFE_TYPES)}
-    return prefix + ":" + str(hash(tuple(sorted(clean.items()))))
+    clean = {k: v for k, v in bound_args.items() if k not in exclude and isinstance(v, SAFE_TYPES)}
+    canonical = json.dumps(clean, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    digest = hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+    return f"{prefix}:v{version}:{digest}"
+
+def namespace_versions() -> dict[str, int]:
+    """Prefixos registrados pelo `cached_json` → versão do schema (cópia ordenada, para diagnóstico)."""
+    return dict(sorted(_namespaces.items()))
+
+async def inspect_keys(prefix: str, limit: int = 50) -> list[dict[str, Any]]:
+    """Amostra de chaves de um prefixo no Redis (TTL, bytes e frescor), para diagnóstico."""
+    redis_client: Redis = await provide_redis()
+    keys: list[str] = []
+    async for key in redis_client.scan_iter(match=f"{prefix}:*", count=200):
+        keys.append(key.decode())
+        if len(keys) >= limit:
+            break
+
+    result = []
+    for key in sorted(keys):
+        raw = await redis_client.get(key)
+        if raw is None:   # expirou entre o SCAN e o GET
+            continue
+        entry = _parse_entry(raw)
+        result.append({
+            "key": key,
+            "ttl": await redis_client.ttl(key),
+            "bytes": len(raw),
+            "fresh_until": entry[1] if entry else None,
+            "negative": bool(entry) and entry[2],
+            "compressed": bool(entry) and bool(raw[1] & _FLAG_ZLIB),
+        })
+    return result
 
-def cached_json(prefix: str, ttl: int = 60):
+def cached_json(
+    prefix: str,
+    ttl: int = 60,
+    local_ttl: int | None = None,
+    stale_ttl: int = 0,
+    tags: tuple[str, ...] = (),
+    version: int = 1,
+    response_model: Any = None,
+    negative_ttl: int = 0,
+):
     """Cachea o resultado JSON-serializável de um *endpoint* ou service async."""
-    """Decorator para cachear o retorno JSON-serializável de uma função async."""
+    """
+    Decorator para cachear o retorno JSON-serializável de uma função async.
+
+    - L2: Redis (`ttl` segundos), compartilhado entre workers.
+    - L1: memória local opcional (`local_ttl`), consultada antes do Redis.
+      O TTL efetivo do L1 nunca passa do `ttl` do Redis nem de `CACHE_L1_MAX_TTL`.
+    - stale-while-revalidate (`stale_ttl`): após `ttl`, por mais `stale_ttl` segundos
+      o valor antigo ainda é devolvido na hora e um único recálculo roda em background.
+    - `tags`: marcações para invalidação (`invalidate_tags`). Aceitam placeholders
+      com os argumentos da função, ex.: `"event:{event_id}"`.
+    - `version`: versão do schema do prefixo; incrementar ao mudar o formato do
+      payload faz o deploy novo ignorar as chaves antigas (que expiram sozinhas).
+    - `response_model`: para *endpoints*. O corpo final (validado e serializado
+      uma única vez, no miss) é guardado em bytes e devolvido como `Response`
+      crua — nos hits o FastAPI não valida nem serializa de novo.
+      Se o endpoint recebe `request: Request`, a resposta leva `ETag` (hash do corpo)
+      e `Last-Modified`, e `If-None-Match`/`If-Modified-Since` devolvem 304 sem corpo.
+    - `negative_ttl`: se > 0, um `HTTPException` 404 da função também é cacheado
+      (por esse TTL curto) e relançado nos hits. Outros erros da função nunca são
+      cacheados e propagam direto — só falhas do Redis levam ao fallback sem cache.
+    """
+    l1_ttl = min(local_ttl, ttl, _settings.cache_l1_max_ttl) if local_ttl else 0
+    adapter = TypeAdapter(response_model) if response_model is not None else None
+
+    def _encode(result: Any) -> bytes:
+        # mesma validação/serialização que o FastAPI faria com `response_model`
+        serializable = jsonable_encoder(result)
+        if adapter is not None:
+            return adapter.dump_json(adapter.validate_python(serializable), by_alias=True)
+        return json.dumps(serializable, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def _decode(body: bytes, fresh_until: float, negative: bool = False) -> Any:
+        # o que fica no L1 e é compartilhado pelo single-flight:
+        # (corpo, etag, last_modified) para endpoints, ou o objeto Python
+        if negative:
+            return _NegativeEntry(json.loads(body))
+        if adapter is None:
+            return json.loads(body)
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        return body, etag, fresh_until - ttl
+
+    def _output(value: Any, request: Request | None) -> Any:
+        if isinstance(value, _NegativeEntry):
+            raise HTTPException(status_code=404, detail=value.detail)
+        if adapter is None:
+            return value
+        body, etag, last_modified = value
+        if request is not None:
+            if etag_matches(request, etag) or not_modified_since(request, last_modified):
+                return not_modified(etag, last_modified)
+            headers = cache_headers(etag, last_modified)
+        else:
+            headers = None
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    if _namespaces.get(prefix, version) != version:
+        logger.warning("Prefixo de cache registrado com versões diferentes", prefix=prefix, version=version)
+    _namespaces[prefix] = version
+
     def decorator(func: Callable[..., Awaitable[T]]):
         sig = inspect.signature(func)
+        # `request: Request` fica fora da chave mesmo quando vem `None` (aquecimento, chamada direta)
+        not_in_key = frozenset(
+            name for name, param in sig.parameters.items()
+            if inspect.isclass(param.annotation) and issubclass(param.annotation, Request)
+        )
 
         @functools.wraps(func)
         async def wrapper(*args, **kwargs, ):
             # 🔑  pega (ou reaproveita) a conexão Redis
             redis_client: Redis = await provide_redis()
-            
+
             bound = sig.bind_partial(*args, **kwargs)
             bound.apply_defaults()
-            key = _make_key(prefix, bound.arguments)
+            key = _make_key(prefix, bound.arguments, version, not_in_key)
+            request = next((v for v in bound.arguments.values() if isinstance(v, Request)), None)
+
+            if tags:
+                # 🏷️ a versão atual de cada tag entra na chave: invalidar = trocar de chave
+                entry_tags = [t.format(**bound.arguments) for t in tags]
+                try:
+                    versions = await _resolve_tag_versions(redis_client, entry_tags)
+                except CircuitOpenError:
+                    CACHE_REQUESTS.labels("l2", prefix, "bypass").inc()
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    logger.warning("Erro ao ler versões das tags; seguindo sem cache", prefix=prefix, error=str(e))
+                    return await func(*args, **kwargs)
+                key += ":t" + ".".join(map(str, versions))
+
+            # 🔹 1) L1 — memória local, sem round trip nem json.loads
+            if l1_ttl:
+                if (local := _local_cache.get(key)) is not _MISSING:
+                    CACHE_REQUESTS.labels("l1", prefix, "hit").inc()
+                    logger.debug("Cache hit (L1)", prefix=prefix, key=key)
+                    return _output(local, request)
+                CACHE_REQUESTS.labels("l1", prefix, "miss").inc()
+
+            def _remember(value: Any, size: int, fresh_until: float) -> None:
+                # o L1 nunca guarda além do instante em que a entrada deixa de ser fresca
+                if l1_ttl:
+                    _local_cache.set(key, value, size, min(l1_ttl, fresh_until - time.time()))
+
+            def _load(cached: bytes) -> Any:
+                if (entry := _parse_entry(cached)) is None:
+                    return _MISSING
+                body, fresh_until, negative = entry
+                value = _decode(body, fresh_until, negative)
+                _remember(value, len(body), fresh_until)
+                return value
+
+            async def _store_negative(exc: HTTPException) -> _NegativeEntry:
+                body = json.dumps(exc.detail, ensure_ascii=False).encode("utf-8")
+                try:
+                    await _guarded(redis_client.setex, key, negative_ttl, _dump_entry(body, negative_ttl, negative=True))
+                except Exception as e:
+                    logger.warning("Erro ao gravar cache negativo", prefix=prefix, key=key, error=str(e))
+                value = _NegativeEntry(exc.detail)
+                _remember(value, len(body), time.time() + negative_ttl)
+                logger.debug("404 armazenado no cache negativo", prefix=prefix, key=key, ttl=negative_ttl)
+                return value
+
+            async def _compute() -> Any:
+                try:
+                    result: T = await func(*args, **kwargs)
+                    body = _encode(result)
+                except HTTPException as exc:
+                    if negative_ttl and exc.status_code == 404:
+                        await _store_negative(exc)
+                    raise _FunctionError(exc) from exc
+                except Exception as exc:
+                    raise _FunctionError(exc) from exc
 
+                raw = _dump_entry(body, ttl)
+                try:
+                    await _guarded(redis_client.setex, key, ttl + stale_ttl, raw)
+                except Exception as e:
+                    # a função já rodou: falha ao gravar não pode virar 2ª execução no fallback
+                    logger.warning("Erro ao gravar no cache Redis", prefix=prefix, key=key, error=str(e))
+                fresh_until = time.time() + ttl
+                value = _decode(body, fresh_until)
+                _remember(value, len(body), fresh_until)
+                logger.debug(
+                    "Valor armazenado no cache", prefix=prefix, key=key, ttl=ttl,
+                    stale_ttl=stale_ttl, bytes=len(body), stored_bytes=len(raw),
+                )
+                return value
+
+            # 🔸 2) L2 — Redis (se o disjuntor estiver aberto, nem tenta)
             try:
-                if (cached := await redis_client.get(key)):
-                    logger.info("Cache hit", prefix=prefix, key=key)
-                    return json.loads(cached)
-
-                logger.debug("Cache miss", prefix=prefix, key=key)
-                result: T = await func(*args, **kwargs)
-                
-                # await redis_client.setex(key, ttl, json.dumps(result, default=str))
-                serializable = jsonable_encoder(result)
-                await redis_client.setex(key, ttl, json.dumps(serializable))
-                logger.debug("Valor armazenado no cache", prefix=prefix, key=key, ttl=ttl)
-                # return result
-                return serializable
-            
-            # 🔽 2) Qualquer problema ⇒ segue sem cache ----------------
+                if (cached := await _guarded(redis_client.get, key)) and (entry := _parse_entry(cached)):
+                    body, fresh_until, negative = entry
+                    value = _decode(body, fresh_until, negative)
+                    if fresh_until > time.time():
+                        CACHE_REQUESTS.labels("l2", prefix, "hit").inc()
+                        logger.info("Cache hit", prefix=prefix, key=key, negative=negative)
+                        _remember(value, len(body), fresh_until)
+                    else:
+                        # ⏳ venceu o TTL "fresco", mas ainda está na janela stale
+                        CACHE_REQUESTS.labels("l2", prefix, "stale").inc()
+                        logger.info("Cache stale; revalidando em background", prefix=prefix, key=key)
+                        _revalidate(redis_client, key, prefix, _compute)
+                else:
+                    CACHE_REQUESTS.labels("l2", prefix, "miss").inc()
+                    logger.debug("Cache miss", prefix=prefix, key=key)
+
+                    # 🔒 3) MISS ⇒ apenas 1 recomputação (no worker e entre workers)
+                    value = await _single_flight(
+                        key, prefix,
+                        lambda: _fill_with_lock(redis_client, key, prefix, _compute, _load),
+                    )
+
+            # ❗ erro da função (ex.: 404): propaga como veio, sem executar de novo
+            except _FunctionError as e:
+                raise e.original from None
+
+            except CircuitOpenError:
+                CACHE_REQUESTS.labels("l2", prefix, "bypass").inc()
+                logger.debug("Disjuntor do Redis aberto; seguindo sem cache", prefix=prefix)
+                return await func(*args, **kwargs)
+
+            # 🔽 4) Falha do Redis ⇒ segue sem cache ----------------
             except Exception as e:
                 logger.warning("Erro ao acessar o cache Redis", prefix=prefix, key=key, error=str(e))
                 return await func(*args, **kwargs)
-            
+
+            return _output(value, request)
+
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
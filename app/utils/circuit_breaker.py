@@ -0,0 +1,176 @@
+# app/utils/circuit_breaker.py
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Generator
+from contextlib import contextmanager
+from typing import TypeVar
+
+from structlog import get_logger
+
+from app.core.config import get_settings
+from app.core.metrics import CIRCUIT_STATE
+
+logger = get_logger().bind(module="circuit_breaker")
+
+_settings = get_settings()
+
+T = TypeVar("T")
+
+class CircuitOpenError(Exception):
+    """Disjuntor aberto: a dependência nem foi chamada."""
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUE = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+class CircuitBreaker:
+    """
+    Disjuntor para dependências de infraestrutura (ex.: Redis).
+
+    - **closed**: chamadas passam; cada resultado entra numa janela deslizante.
+      Chamadas mais lentas que `slow_ms` contam como falha. Com pelo menos
+      `min_calls` na janela e taxa de falha ≥ `failure_rate`, o disjuntor abre.
+    - **open**: `allow()` devolve False imediatamente (quem chama usa o fallback)
+      durante `open_seconds`.
+    - **half_open**: libera **uma** chamada de prova por vez; sucesso fecha,
+      falha reabre. Prova sem resultado após `probe_timeout` conta como falha.
+
+    Lógica puramente síncrona (com lock), então serve tanto para código async
+    quanto para o threadpool. `call` (async) e `guard` (síncrono) fazem o
+    `allow` + registro do resultado em volta de uma chamada.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_rate: float = 0.5,
+        min_calls: int = 10,
+        window: int = 20,
+        slow_ms: float = 200,
+        open_seconds: float = 5,
+        probe_timeout: float | None = None,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.slow_ms = slow_ms
+        self.open_seconds = open_seconds
+        self.probe_timeout = open_seconds if probe_timeout is None else probe_timeout
+        self._results: deque[bool] = deque(maxlen=window)   # True = falha
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+        CIRCUIT_STATE.labels(name).set(_STATE_VALUE[CLOSED])
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow(self) -> bool:
+        """True se a chamada deve ir à dependência; False ⇒ usar o fallback já."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self._probe_started = time.monotonic()
+                return True
+            return False
+
+    async def call(self, fn: Callable[..., Awaitable[T]], /, *args, **kwargs) -> T:
+        """
+        `await breaker.call(redis.get, k)`: aberto ⇒ `CircuitOpenError` sem tocar na dependência.
+        Qualquer saída conta — inclusive cancelamento —, então a prova do half-open não fica presa.
+        """
+        if not self.allow():
+            raise CircuitOpenError(self.name)
+        start = time.monotonic()
+        try:
+            result = await fn(*args, **kwargs)
+        except BaseException:
+            self.record_failure()
+            raise
+        self.record_success(time.monotonic() - start)
+        return result
+
+    @contextmanager
+    def guard(self) -> Generator[None]:
+        """Versão síncrona de `call`, para clientes síncronos: `with breaker.guard(): redis.get(k)`."""
+        if not self.allow():
+            raise CircuitOpenError(self.name)
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException:
+            self.record_failure()
+            raise
+        self.record_success(time.monotonic() - start)
+
+    def record_success(self, elapsed: float) -> None:
+        """Registra uma chamada concluída em `elapsed` segundos (lenta demais conta como falha)."""
+        if elapsed * 1000 > self.slow_ms:
+            self.record_failure(slow=True)
+            return
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(CLOSED)
+                self._results.clear()
+            else:
+                self._results.append(False)
+
+    def record_failure(self, *, slow: bool = False) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(OPEN)
+                return
+            self._results.append(True)
+            if len(self._results) >= self.min_calls:
+                rate = sum(self._results) / len(self._results)
+                if rate >= self.failure_rate:
+                    logger.warning(
+                        "Disjuntor aberto", name=self.name, failure_rate=round(rate, 2), slow=slow,
+                    )
+                    self._transition(OPEN)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self._transition(CLOSED)
+
+    # ------------------------------------------------------------------
+    def _maybe_half_open(self) -> None:
+        now = time.monotonic()
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+        elif self._state == HALF_OPEN and self._probe_in_flight and now - self._probe_started >= self.probe_timeout:
+            # a prova nunca registrou resultado (ex.: quem chamou sumiu): conta como falha
+            logger.warning("Prova do disjuntor sem resultado; reabrindo", name=self.name, probe_timeout=self.probe_timeout)
+            self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        if state != self._state:
+            logger.info("Disjuntor mudou de estado", name=self.name, de=self._state, para=state)
+        self._state = state
+        CIRCUIT_STATE.labels(self.name).set(_STATE_VALUE[state])
+
+# ──────────────────────────────────────────────────────
+# disjuntor único do Redis: cached_json (async) e clientes síncronos
+# (CachedEventRepo, CachedForecastService) — mesma dependência, mesmo estado
+# ──────────────────────────────────────────────────────
+redis_breaker = CircuitBreaker(
+    "redis-cache",
+    failure_rate=_settings.redis_breaker_failure_rate,
+    min_calls=_settings.redis_breaker_min_calls,
+    window=_settings.redis_breaker_window,
+    slow_ms=_settings.redis_breaker_slow_ms,
+    open_seconds=_settings.redis_breaker_open_seconds,
+)
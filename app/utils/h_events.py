@@ -57,4 +57,11 @@ def ensure_aware(dt):
     """
     if dt.tzinfo is None:
         return dt.replace(tzinfo=timezone.utc)
-    return dt
\ No newline at end of file
+    return dt
+
+def normalize_city(city):
+    """
+    Canonical form of a city name for grouping and unique keys:
+    lowercase with collapsed whitespace ("  São   Paulo " → "são paulo").
+    """
+    return " ".join(city.split()).lower()
@@ -1,5 +1,7 @@
 # app/utils/http.py
-from fastapi import HTTPException
+from email.utils import formatdate, parsedate_to_datetime
+
+from fastapi import HTTPException, Request, Response
 
 def raise_http(log_func, status_code, detail, **log_data):
     """
@@ -21,3 +23,60 @@ def raise_http(log_func, status_code, detail, **log_data):
     """
     log_func(detail, **log_data)
     raise HTTPException(status_code=status_code, detail=detail)
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Checks `If-None-Match` against an ETag (weak comparison, as RFC 9110 requires for GET).
+
+    Args:
+        request (Request): Incoming request.
+        etag (str): Current ETag of the resource, quoted (e.g. `"abc123"`).
+
+    Returns:
+        bool: True if the client already holds this representation.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+def not_modified_since(request: Request, last_modified: float) -> bool:
+    """
+    Checks `If-Modified-Since` (ignored when `If-None-Match` is present).
+
+    Args:
+        request (Request): Incoming request.
+        last_modified (float): Epoch of the last change of the resource.
+
+    Returns:
+        bool: True if the resource did not change after the date sent by the client.
+    """
+    header = request.headers.get("if-modified-since")
+    if not header or "if-none-match" in request.headers:
+        return False
+    try:
+        since = parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(last_modified) <= since
+
+def cache_headers(etag: str | None, last_modified: float | None = None) -> dict[str, str]:
+    """
+    Builds the validator headers (`ETag`, `Last-Modified`) for a response.
+
+    Example:
+        response.headers.update(cache_headers(etag))
+    """
+    headers = {}
+    if etag:
+        headers["ETag"] = etag
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+    return headers
+
+def not_modified(etag: str | None, last_modified: float | None = None) -> Response:
+    """Returns an empty `304 Not Modified` carrying the same validators."""
+    return Response(status_code=304, headers=cache_headers(etag, last_modified))
@@ -1,25 +1,196 @@
 # app\utils\service_url.py
+import asyncio
 import json
+import os
+import tempfile
+import threading
+from collections.abc import Callable
 from pathlib import Path
+
+from structlog import get_logger
+
 from app.core.config import get_settings
 
-RUNTIME_PATH = Path("runtime_urls.json")
+try:                                    # trava entre processos (POSIX); no Windows fica só a trava local
+    import fcntl
+except ImportError:                     # pragma: no cover
+    fcntl = None
+
+logger = get_logger().bind(module="service_url")
+
 settings = get_settings()
 
-def get_service_url(service: str) -> str:
+RUNTIME_PATH = Path(settings.service_urls_path)
+
+_LISTEN_POLL = 1.0      # espera máxima por mensagem (s); substitui o `socket_timeout` do cliente compartilhado
+
+UrlListener = Callable[[str, str, str], None]   # (serviço, url antiga, url nova)
+
+class ServiceUrlRegistry:
     """
-    Retorna a URL do serviço, priorizando override em runtime_urls.json.
+    URLs dos serviços externos em memória: padrões do `Settings` + overrides do
+    `runtime_urls.json`. `get` é um acesso a dicionário.
+
+    - Carregado uma vez; `reload_if_changed()` relê o arquivo só quando o mtime muda
+      (chamado pelo laço de `start`, a cada `SERVICE_URLS_POLL_S`).
+    - `update()` grava o arquivo de forma atômica (temporário + `os.replace`, sob trava)
+      e publica no canal Redis `SERVICE_URLS_CHANNEL`: os outros workers aplicam na hora.
+    - Ouvintes (`on_change`) só são chamados quando uma URL muda de fato.
     """
-    if RUNTIME_PATH.exists():
+
+    def __init__(self, path: Path, defaults: dict[str, str]):
+        self.path = Path(path)
+        self.defaults = dict(defaults)
+        self._urls: dict[str, str] = dict(defaults)
+        self._mtime: int | None = None
+        self._listeners: list[UrlListener] = []
+        self._write_lock = threading.Lock()
+        self._tasks: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.reload_if_changed()
+
+    # ── leitura ───────────────────────────────────────
+    def get(self, service: str) -> str:
+        return self._urls.get(service, "")
+
+    def snapshot(self) -> dict[str, str]:
+        return dict(self._urls)
+
+    def on_change(self, listener: UrlListener) -> None:
+        self._listeners.append(listener)
+
+    def _apply(self, overrides: dict[str, str]) -> None:
+        urls = {**self.defaults, **overrides}
+        changed = [(k, self._urls.get(k, ""), v) for k, v in urls.items() if self._urls.get(k) != v]
+        self._urls = urls                     # troca atômica: leitores veem o dict antigo ou o novo
+        for service, old, new in changed:
+            logger.info("URL de serviço alterada", service=service, old=old, new=new)
+            for listener in self._listeners:
+                try:
+                    listener(service, old, new)
+                except Exception as e:
+                    logger.error("Falha no ouvinte de URL", service=service, error=str(e))
+
+    def _read_file(self) -> dict[str, str]:
         try:
-            with RUNTIME_PATH.open("r", encoding="utf-8") as f:
+            with self.path.open("r", encoding="utf-8") as f:
                 data = json.load(f)
-                if service in data:
-                    return data[service]
+        except FileNotFoundError:
+            return {}
+        return {k: str(v) for k, v in data.items()}
+
+    def reload_if_changed(self) -> bool:
+        """Relê o arquivo se o mtime mudou (ou se ele sumiu); devolve se releu."""
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._mtime:
+            return False
+        try:
+            overrides = self._read_file()
+        except Exception as e:
+            logger.warning("Falha ao ler URLs de runtime; mantendo as atuais", path=str(self.path), error=str(e))
+            return False
+        self._mtime = mtime
+        self._apply(overrides)
+        return True
+
+    # ── escrita ───────────────────────────────────────
+    def write(self, service: str, url: str) -> dict[str, str]:
+        """Lê-modifica-grava o arquivo sob trava e troca de forma atômica; devolve os overrides gravados."""
+        lock_path = self.path.with_name(self.path.name + ".lock")
+        with self._write_lock, open(lock_path, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                overrides = self._read_file()
+            except Exception as e:
+                logger.warning("URLs de runtime ilegíveis; recriando o arquivo", path=str(self.path), error=str(e))
+                overrides = {}
+            overrides[service] = url
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent or ".", prefix=f".{self.path.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(overrides, f, indent=2, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        self._mtime = self.path.stat().st_mtime_ns
+        self._apply(overrides)
+        return overrides
+
+    async def update(self, service: str, url: str, redis=None) -> None:
+        """Grava o override e avisa os outros workers (pub/sub) — falha no Redis não desfaz a gravação."""
+        from app.utils.blocking import run_blocking
+
+        overrides = await run_blocking(self.write, service, url)
+        if redis is None:
+            return
+        try:
+            await redis.publish(settings.service_urls_channel, json.dumps(overrides))
         except Exception as e:
-            print(f"[WARN] Falha ao ler runtime_urls.json: {e}")
+            logger.warning("Falha ao publicar mudança de URL; outros workers verão pelo mtime", error=str(e))
+
+    # ── sincronização entre workers ───────────────────
+    async def _poll(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                logger.warning("Falha ao verificar URLs de runtime", error=str(e))
 
-    return {
-        "local_info_url": settings.local_info_url,
-        "forecast_info_url": settings.forecast_info_url
-    }.get(service, "")
+    async def listen(self, redis, *, retry_delay: float = 5.0) -> None:
+        """Aplica os overrides publicados por outros workers; reconecta se o Redis cair."""
+        while True:
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(settings.service_urls_channel)
+                while True:
+                    # canal ocioso devolve None (não é erro); o PING de saúde do cliente segue valendo
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=_LISTEN_POLL)
+                    if message is None or message.get("type") != "message":
+                        continue
+                    try:
+                        self._apply(json.loads(message["data"]))
+                    except Exception as e:
+                        logger.warning("Mensagem de URL inválida", error=str(e))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Canal de URLs indisponível; tentando de novo", error=str(e), retry_in=retry_delay)
+            finally:
+                await pubsub.aclose()
+            await asyncio.sleep(retry_delay)
+
+    async def start(self, redis=None) -> None:
+        loop = asyncio.get_running_loop()
+        if self._tasks and self._loop is loop:
+            return
+        self._tasks, self._loop = [], loop      # tarefas de um loop antigo (já encerrado) são descartadas
+        self._tasks.append(loop.create_task(self._poll(settings.service_urls_poll_s)))
+        if redis is not None:
+            self._tasks.append(loop.create_task(self.listen(redis)))
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        if self._loop is not asyncio.get_running_loop():
+            return
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+service_urls = ServiceUrlRegistry(RUNTIME_PATH, {
+    "local_info_url": settings.local_info_url,
+    "forecast_info_url": settings.forecast_info_url,
+})
+
+def get_service_url(service: str) -> str:
+    """
+    Retorna a URL do serviço, priorizando override em runtime_urls.json.
+    """
+    return service_urls.get(service)
@@ -0,0 +1,91 @@
+# app/utils/suggest_index.py
+"""
+Índice de autocomplete sobre nomes já normalizados.
+
+- Prefixo do nome e prefixo a partir de qualquer palavra: listas ordenadas + `bisect` (a mesma
+  busca de uma trie, sem um objeto por nó).
+- Aproximado (erros de digitação): índice invertido de trigramas, similaridade
+  de Jaccard entre os trigramas da consulta e os do candidato.
+
+Ranking: nome exato > prefixo do nome > prefixo de alguma palavra > similaridade.
+"""
+import heapq
+import re
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from collections.abc import Sequence
+
+_POSTINGS_BUDGET = 4_000    # entradas de índice lidas por consulta aproximada (trigramas raros primeiro)
+_MAX_CANDIDATES = 50        # candidatos aproximados pontuados por consulta
+_MIN_SIMILARITY = 0.3
+
+_WORD_STARTS = re.compile(r"(?<= )\S")
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class SuggestIndex:
+    def __init__(self, names: Sequence[str]):
+        """`names[i]` é o nome normalizado do item `i`; o índice devolve posições."""
+        self.names = list(names)
+        self._by_name = sorted((name, i) for i, name in enumerate(self.names))
+        # sufixos a partir de cada palavra: "teatro 1" acha "local teatro 12"
+        self._by_word = sorted(
+            (name[m.start():], i) for i, name in enumerate(self.names) for m in _WORD_STARTS.finditer(name)
+        )
+        postings: dict[str, list[int]] = defaultdict(list)
+        for i, name in enumerate(self.names):
+            for gram in trigrams(name):
+                postings[gram].append(i)
+        self._postings = dict(postings)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @staticmethod
+    def _prefixed(entries: list[tuple[str, int]], prefix: str, limit: int, seen: set[int]) -> list[int]:
+        found: list[int] = []
+        pos = bisect_left(entries, (prefix, -1))
+        while pos < len(entries) and len(found) < limit:
+            text, i = entries[pos]
+            if not text.startswith(prefix):
+                break
+            if i not in seen:
+                seen.add(i)
+                found.append(i)
+            pos += 1
+        return found
+
+    def _similar(self, query: str, limit: int, seen: set[int]) -> list[int]:
+        grams = trigrams(query)
+        lists = sorted((self._postings[g] for g in grams if g in self._postings), key=len)
+        if not lists:
+            return []
+        usable, budget = [], _POSTINGS_BUDGET
+        for posting in lists:
+            if usable and len(posting) > budget:
+                break
+            usable.append(posting)
+            budget -= len(posting)
+        shared = Counter(i for posting in usable for i in posting if i not in seen)
+        scored = []
+        for i, _ in shared.most_common(_MAX_CANDIDATES):
+            other = trigrams(self.names[i])
+            common = len(grams & other)
+            score = common / (len(grams) + len(other) - common)
+            if score >= _MIN_SIMILARITY:
+                scored.append((score, i))
+        return [i for _, i in heapq.nlargest(limit, scored, key=lambda s: (s[0], -len(self.names[s[1]])))]
+
+    def search(self, query: str, limit: int = 8) -> list[int]:
+        """Até `limit` posições, da melhor para a pior. `query` já deve vir normalizada."""
+        if not query or limit <= 0:
+            return []
+        seen: set[int] = set()
+        result = self._prefixed(self._by_name, query, limit, seen)
+        if len(result) < limit:
+            result += self._prefixed(self._by_word, query, limit - len(result), seen)
+        if len(result) < limit and len(query) >= 3:
+            result += self._similar(query, limit - len(result), seen)
+        return result
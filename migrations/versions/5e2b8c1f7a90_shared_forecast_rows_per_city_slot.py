@@ -0,0 +1,69 @@
+"""Shared forecast rows per (city, forecast_datetime)
+
+Revision ID: 5e2b8c1f7a90
+Revises: 9c1e7a4d2b36
+Create Date: 2026-10-19 04:10:00.000000
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2b8c1f7a90'
+down_revision: str | None = '9c1e7a4d2b36'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: uma linha de previsão por (cidade, slot), consolidando as existentes."""
+    op.add_column('forecast_infos', sa.Column('city', sa.String(), nullable=True))
+
+    # 1) cidade de cada previsão = cidade (normalizada) do evento que aponta para ela
+    op.execute("""
+        UPDATE forecast_infos f
+           SET city = lower(regexp_replace(btrim(e.city), '\\s+', ' ', 'g'))
+          FROM events e
+         WHERE e.forecast_info_id = f.id
+    """)
+
+    # 2) por (cidade, slot), fica a linha atualizada por último; os eventos passam a apontar para ela
+    op.execute("""
+        WITH ranked AS (
+            SELECT id,
+                   first_value(id) OVER (
+                       PARTITION BY city, forecast_datetime
+                       ORDER BY updated_at DESC NULLS LAST, id DESC
+                   ) AS keep_id
+              FROM forecast_infos
+             WHERE city IS NOT NULL
+        )
+        UPDATE events e
+           SET forecast_info_id = r.keep_id
+          FROM ranked r
+         WHERE e.forecast_info_id = r.id
+           AND r.id <> r.keep_id
+    """)
+
+    # 3) duplicatas e órfãs (sem evento) saem
+    op.execute("""
+        DELETE FROM forecast_infos f
+         WHERE NOT EXISTS (SELECT 1 FROM events e WHERE e.forecast_info_id = f.id)
+    """)
+
+    op.alter_column('forecast_infos', 'city', existing_type=sa.String(), nullable=False)
+    op.create_unique_constraint('uq_forecast_infos_city_slot', 'forecast_infos', ['city', 'forecast_datetime'])
+    op.create_index(op.f('ix_events_forecast_info_id'), 'events', ['forecast_info_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    As linhas continuam compartilhadas entre eventos — válido no esquema anterior
+    (FK muitos-para-um); só a chave única e a coluna `city` são removidas.
+    """
+    op.drop_index(op.f('ix_events_forecast_info_id'), table_name='events')
+    op.drop_constraint('uq_forecast_infos_city_slot', 'forecast_infos', type_='unique')
+    op.drop_column('forecast_infos', 'city')
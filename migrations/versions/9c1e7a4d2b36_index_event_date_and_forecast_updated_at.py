@@ -0,0 +1,29 @@
+"""Index events.event_date and add forecast_infos.updated_at
+
+Revision ID: 9c1e7a4d2b36
+Revises: 4b8f4515e23b
+Create Date: 2026-10-19 03:30:00.000000
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1e7a4d2b36'
+down_revision: str | None = '4b8f4515e23b'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('forecast_infos', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(op.f('ix_events_event_date'), 'events', ['event_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_events_event_date'), table_name='events')
+    op.drop_column('forecast_infos', 'updated_at')
@@ -0,0 +1,27 @@
+"""Add events.updated_at (Last-Modified of GET /events)
+
+Revision ID: b3d9e6f1c2a4
+Revises: 5e2b8c1f7a90
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d9e6f1c2a4'
+down_revision: str | None = '5e2b8c1f7a90'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('events', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('events', 'updated_at')
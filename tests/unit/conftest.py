@@ -295,6 +295,93 @@ def fake_redis(monkeypatch):
     )
     yield r
 
+@pytest.fixture(autouse=True)
+def _clear_local_cache():
+    """Zera o cache L1, as versões de tags, o disjuntor do Redis e os tokens verificados entre os testes."""
+    from app.utils.cache import invalidate_local, _tag_versions
+    from app.utils.circuit_breaker import redis_breaker
+    from app.services.token_cache import verified_tokens
+    invalidate_local()
+    _tag_versions.clear()
+    redis_breaker.reset()
+    verified_tokens.clear()
+    yield
+    invalidate_local()
+    _tag_versions.clear()
+    redis_breaker.reset()
+    verified_tokens.clear()
+
+@pytest.fixture
+def fake_async_redis(monkeypatch):
+    """Redis assíncrono falso usado diretamente pelo decorator `cached_json`."""
+    r = fakeredis.FakeAsyncRedis()   # binário, como `provide_redis_bytes`
+
+    async def _provide():
+        return r
+
+    monkeypatch.setattr("app.utils.cache.provide_redis", _provide)
+    yield r
+
+def _resp(items: list) -> bytes:
+    out = b"*%d\r\n" % len(items)
+    for item in items:
+        out += b":%d\r\n" % item if isinstance(item, int) else b"$%d\r\n%s\r\n" % (len(item), item)
+    return out
+
+class _PubSubServer:
+    """Redis mínimo (RESP2: SUBSCRIBE, PING): fica em silêncio até `publish`, como um canal ocioso."""
+
+    def __init__(self):
+        self.subscribers: list[tuple[asyncio.StreamWriter, bytes]] = []
+        self.subscribe_calls = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                args = []
+                for _ in range(int(line[1:])):
+                    size = int((await reader.readline())[1:])
+                    args.append((await reader.readexactly(size + 2))[:-2])
+                command = args[0].upper()
+                if command == b"SUBSCRIBE":
+                    self.subscribe_calls += 1
+                    for total, channel in enumerate(args[1:], 1):
+                        self.subscribers.append((writer, channel))
+                        writer.write(_resp([b"subscribe", channel, total]))
+                elif command == b"PING" and any(w is writer for w, _ in self.subscribers):
+                    writer.write(_resp([b"pong", args[1] if len(args) > 1 else b""]))
+                elif command == b"PING":
+                    writer.write(b"$%d\r\n%s\r\n" % (len(args[1]), args[1]) if len(args) > 1 else b"+PONG\r\n")
+                else:
+                    writer.write(b"+OK\r\n")      # CLIENT SETINFO etc.
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.subscribers = [(w, c) for w, c in self.subscribers if w is not writer]
+            writer.close()
+
+    def publish(self, channel: str, data: str) -> None:
+        for writer, subscribed in self.subscribers:
+            if subscribed == channel.encode():
+                writer.write(_resp([b"message", subscribed, data.encode()]))
+
+@pytest.fixture
+async def idle_redis():
+    """
+    Cliente redis-py de verdade, com `socket_timeout` curto (como o de `provide_redis`),
+    ligado a um servidor pub/sub local — o fakeredis não reproduz timeout de leitura.
+    """
+    from redis.asyncio import Redis
+
+    server = _PubSubServer()
+    tcp = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    port = tcp.sockets[0].getsockname()[1]
+    client = Redis(host="127.0.0.1", port=port, decode_responses=True, socket_timeout=0.05, health_check_interval=30)
+    yield client, server
+    await client.aclose()
+    tcp.close()
+
 @pytest.fixture(autouse=True)
 def patch_create_task(monkeypatch):
     """
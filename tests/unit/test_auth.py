@@ -1,6 +1,17 @@
 # tests/unit/test_auth.py
 # (autenticação & autorização)
 
+import asyncio
+import time
+
+import fakeredis
+
+from app.core.config import get_settings
+from app.core.security import create_access_token
+from app.deps import provide_user_repo
+from app.services import auth_service
+from app.services.token_cache import VerifiedTokenCache, verified_tokens
+
 def test_login_success(client, login_data):
     r = client.post(
         "/api/v1/auth/login",
@@ -28,4 +39,109 @@ def test_eventos_with_auth(client, auth_header):
 
 # def test_acesso_autenticado(client, auth_header):
 #     resp = client.get("/api/v1/events", headers=auth_header)
-#     assert resp.status_code == 200
\ No newline at end of file
+#     assert resp.status_code == 200
+# ── cache de tokens verificados ──────────────────────
+
+def _token(client, username, password):
+    r = client.post("/api/v1/auth/login", data={"username": username, "password": password})
+    assert r.status_code == 200
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+def test_verified_token_skips_decode_and_repo(client, auth_header, monkeypatch):
+    decodes = []
+    original = auth_service.jwt.decode
+    monkeypatch.setattr(auth_service.jwt, "decode", lambda *a, **k: decodes.append(1) or original(*a, **k))
+
+    for _ in range(5):
+        assert client.get("/api/v1/users/", headers=auth_header).status_code == 200
+    assert len(decodes) == 1
+    assert len(verified_tokens) == 1
+
+def test_cache_entry_expires_with_token_and_is_bounded():
+    cache = VerifiedTokenCache(ttl=60, max_entries=2)
+    user = provide_user_repo().get_by_username("alice")
+
+    cache.put("vencido", user, exp=time.time() - 1)
+    assert cache.get("vencido") is None
+
+    for token in ("a", "b", "c"):
+        cache.put(token, user, exp=None)
+    assert cache.get("a") is None and cache.get("c") is user     # LRU: "a" saiu
+    assert cache.invalidate_user("alice") == 2
+    assert len(cache) == 0
+
+def test_deleting_user_revokes_cached_tokens(client, auth_header):
+    novo = {"username": "zed", "password": "zed12345", "full_name": "Zed", "roles": ["admin"]}
+    assert client.post("/api/v1/users/", json=novo, headers=auth_header).status_code == 201
+    zed = _token(client, "zed", "zed12345")
+    assert client.get("/api/v1/users/", headers=zed).status_code == 200
+
+    assert client.delete("/api/v1/users/zed", headers=auth_header).status_code == 204
+    assert client.get("/api/v1/users/", headers=zed).status_code == 401
+
+def test_role_change_applies_to_cached_tokens(client, auth_header):
+    carol = _token(client, "carol", "pass123")
+    assert client.get("/api/v1/users/", headers=carol).status_code == 403      # viewer
+    try:
+        r = client.put("/api/v1/users/carol/roles", json={"roles": ["editor"]}, headers=auth_header)
+        assert r.status_code == 200 and r.json()["roles"] == ["editor"]
+        assert client.get("/api/v1/users/", headers=carol).status_code == 200
+    finally:
+        client.put("/api/v1/users/carol/roles", json={"roles": ["viewer"]}, headers=auth_header)
+    assert client.get("/api/v1/users/", headers=carol).status_code == 403
+    assert client.put("/api/v1/users/ninguem/roles", json={"roles": []}, headers=auth_header).status_code == 404
+
+def test_cached_token_skips_decode_and_user_lookup(monkeypatch):
+    """`get_current_user`: sem cache, jwt.decode + repositório a cada request; com cache, uma vez por token."""
+    token = create_access_token("alice")
+    repo = provide_user_repo()
+    decodes, lookups = [], []
+    decode, lookup = auth_service.jwt.decode, repo.get_by_username
+    monkeypatch.setattr(auth_service.jwt, "decode", lambda *a, **k: decodes.append(1) or decode(*a, **k))
+    monkeypatch.setattr(repo, "get_by_username", lambda *a: lookups.append(1) or lookup(*a))
+
+    monkeypatch.setattr(verified_tokens, "ttl", 0)
+    for _ in range(5):
+        auth_service.get_current_user(token=token, repo=repo)
+    assert (len(decodes), len(lookups)) == (5, 5)
+
+    monkeypatch.setattr(verified_tokens, "ttl", 60)
+    for _ in range(5):
+        assert auth_service.get_current_user(token=token, repo=repo).username == "alice"
+    assert (len(decodes), len(lookups)) == (6, 6)
+
+async def test_revocation_reaches_other_workers():
+    server = fakeredis.FakeServer()                                    # um Redis, dois workers
+    redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    user = provide_user_repo().get_by_username("alice")
+    this, other = VerifiedTokenCache(ttl=60, max_entries=10), VerifiedTokenCache(ttl=60, max_entries=10)
+    other.put("tok", user, exp=None)
+    await other.start(redis)
+    await asyncio.sleep(0.05)
+
+    assert this.revoke_user("alice", fakeredis.FakeRedis(server=server)) == 0   # cliente síncrono, como nas rotas
+    for _ in range(50):
+        if other.get("tok") is None:
+            break
+        await asyncio.sleep(0.01)
+    assert other.get("tok") is None
+    await other.stop()
+
+async def test_idle_channel_keeps_cached_tokens(idle_redis):
+    client, server = idle_redis
+    user = provide_user_repo().get_by_username("alice")
+    cache = VerifiedTokenCache(ttl=60, max_entries=10)
+    cache.put("tok", user, exp=None)
+    task = asyncio.create_task(cache.listen(client, retry_delay=0.01))
+    await asyncio.sleep(0.3)                                           # ocioso por ~6× o socket_timeout
+
+    assert cache.get("tok") is not None                                # canal ocioso não esvazia o cache
+    assert server.subscribe_calls == 1
+    server.publish(get_settings().auth_token_cache_channel, "alice")
+    for _ in range(50):
+        if cache.get("tok") is None:
+            break
+        await asyncio.sleep(0.01)
+    assert cache.get("tok") is None
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,472 @@
+# tests/unit/test_cache.py
+# (decorator cached_json: L1 em memória + L2 Redis)
+
+import json
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.utils.cache import (
+    cached_json, LocalLRUCache, invalidate_local, invalidate_tags, invalidate_tags_sync,
+    inspect_keys, _MISSING, _dump_entry, _parse_entry, _make_key, _tag_versions,
+)
+from app.constants.cache_tags import EVENT_TAG, EVENT_TAG_TEMPLATE
+
+def _sample(tier: str, prefix: str, result: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "cache_requests_total", {"tier": tier, "prefix": prefix, "result": result}
+    )
+    return value or 0.0
+
+# ------------------ LocalLRUCache ------------------
+
+def test_lru_evicts_least_recently_used_by_entries():
+    lru = LocalLRUCache(max_entries=2, max_bytes=1_000)
+    lru.set("a", 1, size=1, ttl=60)
+    lru.set("b", 2, size=1, ttl=60)
+    lru.get("a")                        # "a" passa a ser o mais recente
+    lru.set("c", 3, size=1, ttl=60)
+
+    assert lru.get("a") == 1
+    assert lru.get("c") == 3
+    assert lru.get("b") is _MISSING     # "b" foi descartado
+    assert len(lru) == 2
+
+def test_lru_respects_byte_budget():
+    lru = LocalLRUCache(max_entries=100, max_bytes=10)
+    lru.set("a", "x", size=6, ttl=60)
+    lru.set("b", "y", size=6, ttl=60)
+
+    assert len(lru) == 1
+    assert lru.size_bytes == 6
+
+    lru.set("grande", "z", size=11, ttl=60)   # maior que o orçamento: ignorado
+    assert len(lru) == 1
+
+def test_lru_entry_expires(monkeypatch):
+    lru = LocalLRUCache(max_entries=10, max_bytes=100)
+    now = [1000.0]
+    monkeypatch.setattr("app.utils.cache.time.monotonic", lambda: now[0])
+    lru.set("a", 1, size=1, ttl=2)
+
+    now[0] += 1
+    assert lru.get("a") == 1
+    now[0] += 2
+    assert lru.get("a") is _MISSING
+    assert len(lru) == 0
+
+# ------------------ cached_json (L1 + L2) ------------------
+
+async def test_cached_json_serves_from_l1_then_l2(fake_async_redis):
+    calls = 0
+
+    @cached_json("t-l1", ttl=30, local_ttl=5)
+    async def compute(n: int):
+        nonlocal calls
+        calls += 1
+        return {"n": n}
+
+    l1_hits, l2_hits = _sample("l1", "t-l1", "hit"), _sample("l2", "t-l1", "hit")
+
+    assert await compute(1) == {"n": 1}           # miss → calcula
+    assert await compute(1) == {"n": 1}           # hit L1
+    assert _sample("l1", "t-l1", "hit") == l1_hits + 1
+
+    invalidate_local("t-l1")
+    assert await compute(1) == {"n": 1}           # hit L2 (Redis)
+    assert _sample("l2", "t-l1", "hit") == l2_hits + 1
+    assert calls == 1
+
+async def test_cached_json_without_local_ttl_skips_l1(fake_async_redis):
+    @cached_json("t-nol1", ttl=30)
+    async def compute():
+        return [1, 2]
+
+    await compute()
+    await compute()
+    assert _sample("l1", "t-nol1", "hit") == 0
+    assert _sample("l2", "t-nol1", "hit") == 1
+
+async def test_cached_json_falls_back_when_redis_fails(monkeypatch):
+    class _Broken:
+        async def get(self, *_):
+            raise ConnectionError("redis fora")
+
+    async def _provide():
+        return _Broken()
+
+    monkeypatch.setattr("app.utils.cache.provide_redis", _provide)
+
+    @cached_json("t-down", ttl=30)
+    async def compute():
+        return {"ok": True}
+
+    assert await compute() == {"ok": True}
+
+# ------------------ single-flight (stampede) ------------------
+
+async def test_concurrent_misses_recompute_once(fake_async_redis):
+    calls = 0
+
+    @cached_json("t-stampede", ttl=30)
+    async def compute(limit: int):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)      # simula list_all() + sort
+        return list(range(limit))
+
+    results = await asyncio.gather(*(compute(3) for _ in range(50)))
+
+    assert calls == 1
+    assert all(r == [0, 1, 2] for r in results)
+    assert await fake_async_redis.keys("lock:*") == []     # lock liberado após o preenchimento
+
+async def test_waits_for_fill_from_other_worker(fake_async_redis):
+    calls = 0
+
+    @cached_json("t-remote", ttl=30)
+    async def compute():
+        nonlocal calls
+        calls += 1
+        return "local"
+
+    await compute()                                  # descobre a chave usada
+    key = (await fake_async_redis.keys("t-remote:*"))[0].decode()
+    await fake_async_redis.delete(key)
+
+    # outro worker "segura" o lock e preenche a chave logo depois
+    await fake_async_redis.set(f"lock:{key}", "outro-worker", px=5000)
+
+    async def _other_worker_fills():
+        await asyncio.sleep(0.1)
+        await fake_async_redis.set(key, _dump_entry(b'"remoto"', 30))
+
+    filler = asyncio.create_task(_other_worker_fills())
+    assert await compute() == "remoto"
+    await filler
+    assert calls == 1
+
+async def test_lock_timeout_falls_back_to_compute(fake_async_redis, monkeypatch):
+    monkeypatch.setattr("app.utils.cache._settings.cache_lock_timeout_ms", 100)
+    monkeypatch.setattr("app.utils.cache._settings.cache_lock_poll_ms", 10)
+
+    @cached_json("t-timeout", ttl=30)
+    async def compute():
+        return "recalculado"
+
+    await compute()
+    key = (await fake_async_redis.keys("t-timeout:*"))[0].decode()
+    await fake_async_redis.delete(key)
+    await fake_async_redis.set(f"lock:{key}", "travado", px=60_000)   # dono nunca preenche
+
+    assert await compute() == "recalculado"
+
+# ------------------ stale-while-revalidate ------------------
+
+async def test_stale_value_is_served_and_refreshed_once(fake_async_redis, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr("app.utils.cache.time.time", lambda: now[0])
+    version = 0
+
+    @cached_json("t-swr", ttl=10, stale_ttl=60)
+    async def compute():
+        nonlocal version
+        version += 1
+        await asyncio.sleep(0.01)
+        return {"v": version}
+
+    assert await compute() == {"v": 1}
+    key = (await fake_async_redis.keys("t-swr:*"))[0].decode()
+    assert 60 < await fake_async_redis.ttl(key) <= 70        # ttl + stale_ttl no Redis
+
+    now[0] += 15                                             # passou do TTL "fresco"
+    stale = await asyncio.gather(*(compute() for _ in range(20)))
+    assert all(r == {"v": 1} for r in stale)                 # resposta imediata com o valor velho
+
+    await asyncio.sleep(0.05)                                # deixa a revalidação terminar
+    assert version == 2                                      # um único recálculo
+    assert await compute() == {"v": 2}
+
+async def test_stale_refresh_skipped_when_other_worker_holds_lock(fake_async_redis, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr("app.utils.cache.time.time", lambda: now[0])
+    calls = 0
+
+    @cached_json("t-swr-lock", ttl=10, stale_ttl=60)
+    async def compute():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    await compute()
+    key = (await fake_async_redis.keys("t-swr-lock:*"))[0].decode()
+
+    now[0] += 15
+    await fake_async_redis.set(f"lock:{key}", "outro-worker", px=5000)
+    assert await compute() == 1
+    await asyncio.sleep(0.01)
+    assert calls == 1
+
+# ───────────── tags ─────────────
+async def test_invalidate_tags_forces_recompute(fake_async_redis):
+    calls = 0
+
+    @cached_json("t-tags", ttl=60, tags=("lista",))
+    async def compute():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await compute() == 1
+    assert await compute() == 1                              # hit (L1)
+
+    await invalidate_tags("lista")
+    assert await fake_async_redis.get("cache:tag:lista") == b"1"
+    assert await compute() == 2                              # chave nova ⇒ recalcula
+    assert await compute() == 2
+
+async def test_tag_template_uses_function_args(fake_async_redis):
+    calls: list[int] = []
+
+    @cached_json("t-tag-tpl", ttl=60, tags=(EVENT_TAG_TEMPLATE,))
+    async def compute(event_id: int):
+        calls.append(event_id)
+        return event_id
+
+    await compute(1)
+    await compute(2)
+    await invalidate_tags(EVENT_TAG(1))
+    await compute(1)
+    await compute(2)
+    assert calls == [1, 2, 1]                                # só o evento 1 foi invalidado
+
+async def test_invalidate_tags_swallows_redis_errors(monkeypatch):
+    async def _broken():
+        raise ConnectionError("redis fora")
+
+    monkeypatch.setattr("app.utils.cache.provide_redis", _broken)
+    _tag_versions["lista"] = (3, float("inf"))
+    await invalidate_tags("lista")                           # não propaga o erro
+    assert "lista" not in _tag_versions                      # cópia local descartada
+
+def test_invalidate_tags_sync_outside_threadpool():
+    _tag_versions["lista"] = (3, float("inf"))
+    invalidate_tags_sync("lista")                            # sem event loop: só loga
+    assert "lista" not in _tag_versions
+
+# ───────────── chaves ─────────────
+def test_make_key_is_stable_across_processes():
+    code = "from app.utils.cache import _make_key; print(_make_key('p', {'city': 'São Paulo', 'n': 3}))"
+    keys = {
+        subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+        ).stdout.strip().splitlines()[-1]
+        for seed in ("1", "2")
+    }
+    assert keys == {_make_key("p", {"n": 3, "city": "São Paulo"})}   # ordem dos args não importa
+
+def test_make_key_ignores_unsafe_args_and_uses_version():
+    base = _make_key("p", {"n": 1, "repo": object()})
+    assert base == _make_key("p", {"n": 1})
+    assert base.startswith("p:v1:")
+    assert _make_key("p", {"n": 1}, version=2).startswith("p:v2:")
+
+async def test_version_bump_changes_namespace(fake_async_redis):
+    @cached_json("t-ver", ttl=60, version=1)
+    async def old():
+        return "antigo"
+
+    @cached_json("t-ver", ttl=60, version=2)
+    async def new():
+        return "novo"
+
+    assert await old() == "antigo"
+    assert await new() == "novo"                             # não lê a entrada da versão 1
+    assert sorted(k.decode().split(":")[1] for k in await fake_async_redis.keys("t-ver:*")) == ["v1", "v2"]
+
+async def test_inspect_keys(fake_async_redis):
+    @cached_json("t-inspect", ttl=60, stale_ttl=30)
+    async def compute(n: int):
+        return list(range(n))
+
+    await compute(3)
+    await fake_async_redis.set("t-inspect:lixo", "não-json")
+    keys = await inspect_keys("t-inspect")
+    assert len(keys) == 2
+    entry = next(k for k in keys if k["key"] != "t-inspect:lixo")
+    assert 60 < entry["ttl"] <= 90 and entry["bytes"] > 0 and entry["fresh_until"]
+
+def test_admin_cache_routes(client, auth_header, fake_async_redis):
+    r = client.get("/api/v1/admin/cache/namespaces", headers=auth_header)
+    assert r.status_code == 200 and r.json()["top-soon"] == 1
+
+    r = client.get("/api/v1/admin/cache/keys", params={"prefix": "top-soon"}, headers=auth_header)
+    assert r.status_code == 200
+    assert r.json()["version"] == 1
+
+    assert client.get("/api/v1/admin/cache/namespaces").status_code == 401
+
+def test_admin_cache_keys_returns_503_when_redis_is_down(client, auth_header, fake_async_redis, monkeypatch):
+    from redis.exceptions import ConnectionError as RedisConnectionError
+
+    def _down(*args, **kwargs):
+        raise RedisConnectionError("redis fora do ar")
+
+    monkeypatch.setattr(fake_async_redis, "scan_iter", _down)
+    r = client.get("/api/v1/admin/cache/keys", params={"prefix": "top-soon"}, headers=auth_header)
+    assert r.status_code == 503 and r.json()["detail"] == "Redis indisponível"
+
+# ───────────── corpo pré-codificado ─────────────
+async def test_response_model_returns_raw_response(fake_async_redis):
+    from fastapi import Response
+    from pydantic import BaseModel
+
+    class Item(BaseModel):
+        id: int
+        name: str
+
+    calls = 0
+
+    @cached_json("t-raw", ttl=60, response_model=list[Item])
+    async def compute():
+        nonlocal calls
+        calls += 1
+        return [{"id": 1, "name": "a", "extra": "filtrado"}]
+
+    miss = await compute()
+    hit = await compute()
+    assert calls == 1
+    assert isinstance(miss, Response) and isinstance(hit, Response)
+    assert hit.media_type == "application/json"
+    assert hit.body == miss.body == b'[{"id":1,"name":"a"}]'   # validado/filtrado pelo response_model
+
+async def test_large_bodies_are_compressed(fake_async_redis):
+    @cached_json("t-zlib", ttl=60)
+    async def compute():
+        return [{"title": "Evento repetido", "n": i % 3} for i in range(500)]
+
+    expected = await compute()
+    key = (await fake_async_redis.keys("t-zlib:*"))[0]
+    stored = await fake_async_redis.get(key)
+    assert len(stored) < len(json.dumps(expected)) / 4     # zlib no Redis
+    invalidate_local()
+    assert await compute() == expected                      # descomprime no hit
+
+    (info,) = await inspect_keys("t-zlib")
+    assert info["compressed"] is True
+
+async def test_legacy_entry_is_treated_as_miss(fake_async_redis):
+    @cached_json("t-legacy", ttl=60)
+    async def compute():
+        return "novo"
+
+    await compute()
+    key = (await fake_async_redis.keys("t-legacy:*"))[0]
+    await fake_async_redis.set(key, json.dumps({"fresh_until": 9e18, "data": "velho"}))
+    assert await compute() == "novo"
+    assert _parse_entry(await fake_async_redis.get(key)) is not None   # regravado no formato novo
+
+def test_top_soon_serves_cached_body(client, auth_header, repo, fake_async_redis):
+    from datetime import datetime, timedelta, timezone
+    from app.schemas.event_create import EventCreate
+
+    repo.add(EventCreate(
+        title="futuro", description="f", city="Recife",
+        event_date=datetime.now(tz=timezone.utc) + timedelta(days=1), participants=[],
+    ))
+    first = client.get("/api/v1/events/top/soon", headers=auth_header)
+    second = client.get("/api/v1/events/top/soon", headers=auth_header)
+    assert first.status_code == second.status_code == 200
+    assert first.headers["content-type"] == "application/json"
+    assert second.content == first.content
+    assert first.json()[0]["title"] == "Futuro"             # `limpar_texto` capitaliza
+
+async def test_top_soon_is_never_more_than_seconds_old(repo, fake_async_redis):
+    from datetime import datetime, timedelta, timezone
+    from app.api.v1.endpoints.events import get_events_top_soon
+    from app.schemas.event_create import EventCreate
+
+    repo.add(EventCreate(
+        title="logo", description="l", city="Recife",
+        event_date=datetime.now(tz=timezone.utc) + timedelta(minutes=1), participants=[],
+    ))
+    await get_events_top_soon(request=None, limit=10, repo=repo)
+    [key] = await fake_async_redis.keys("top-soon:*")
+    assert 0 < await fake_async_redis.ttl(key) <= 15        # ttl + stale_ttl: quem já começou sai logo
+
+# ───────────── erros da função / cache negativo ─────────────
+async def test_http_errors_are_not_executed_twice(fake_async_redis):
+    from fastapi import HTTPException
+    calls = 0
+
+    @cached_json("t-404", ttl=60)
+    async def compute():
+        nonlocal calls
+        calls += 1
+        raise HTTPException(status_code=404, detail="não achei")
+
+    with pytest.raises(HTTPException):
+        await compute()
+    assert calls == 1                                        # sem 2ª execução
+    assert await fake_async_redis.keys("t-404:*") == []      # sem cache negativo por padrão
+
+async def test_redis_write_errors_do_not_rerun_function(fake_async_redis, monkeypatch):
+    calls = 0
+
+    async def _fail(*args, **kwargs):
+        raise ConnectionError("redis caiu no meio")
+
+    monkeypatch.setattr(fake_async_redis, "setex", _fail)
+    monkeypatch.setattr(fake_async_redis, "delete", _fail)  # liberação do lock também falha
+
+    @cached_json("t-write-fail", ttl=60)
+    async def compute():
+        nonlocal calls
+        calls += 1
+        return "valor"
+
+    assert await compute() == "valor"
+    assert calls == 1
+
+async def test_negative_cache_for_404(fake_async_redis):
+    from fastapi import HTTPException
+    calls = 0
+
+    @cached_json("t-neg", ttl=60, local_ttl=5, negative_ttl=10)
+    async def compute(name: str):
+        nonlocal calls
+        calls += 1
+        raise HTTPException(status_code=404, detail=f"{name} não encontrado")
+
+    for _ in range(3):
+        with pytest.raises(HTTPException) as exc:
+            await compute("x")
+        assert exc.value.status_code == 404 and exc.value.detail == "x não encontrado"
+    invalidate_local()
+    with pytest.raises(HTTPException):                       # hit negativo vindo do Redis
+        await compute("x")
+    assert calls == 1
+
+    key = (await fake_async_redis.keys("t-neg:*"))[0]
+    assert 0 < await fake_async_redis.ttl(key) <= 10
+    assert (await inspect_keys("t-neg"))[0]["negative"] is True
+
+async def test_other_errors_propagate_without_caching(fake_async_redis):
+    calls = 0
+
+    @cached_json("t-boom", ttl=60, negative_ttl=10)
+    async def compute():
+        nonlocal calls
+        calls += 1
+        raise ValueError("boom")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            await compute()
+    assert calls == 2
+    assert await fake_async_redis.keys("t-boom:*") == []
@@ -0,0 +1,102 @@
+# tests/unit/test_cache_warmup.py
+# (aquecimento do cache no startup + log de consultas de locais)
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import fakeredis
+import pytest
+
+from app.schemas.event_create import EventCreate
+from app.services import cache_warmup
+from app.services.cache_warmup import warm_up_cache, most_requested_venues, venue_hits, VENUE_HITS_KEY
+
+@pytest.fixture
+def hits_redis(monkeypatch):
+    """Redis (str) usado pelo log de consultas."""
+    r = fakeredis.FakeAsyncRedis(decode_responses=True)
+
+    async def _provide():
+        return r
+
+    monkeypatch.setattr("app.services.cache_warmup.provide_redis", _provide)
+    venue_hits.clear()
+    yield r
+    venue_hits.clear()
+
+def test_local_info_requests_are_logged(client, auth_header, hits_redis):
+    for name in ("cesar", "cesar", "biblioteca"):
+        client.get("/api/v1/events/local_info", params={"location_name": name}, headers=auth_header)
+    assert asyncio.run(most_requested_venues(5)) == []       # só em memória até o próximo envio
+    assert asyncio.run(venue_hits.flush()) == 2
+    assert asyncio.run(most_requested_venues(5)) == ["cesar", "biblioteca"]
+
+async def test_hits_are_flushed_in_one_batch_and_kept_on_failure(monkeypatch, hits_redis):
+    pipelines = 0
+    original = hits_redis.pipeline
+
+    def _pipeline(*args, **kwargs):
+        nonlocal pipelines
+        pipelines += 1
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(hits_redis, "pipeline", _pipeline)
+    for i in range(100):
+        venue_hits.record(f"local {i % 3}")
+    assert await venue_hits.flush() == 3
+    assert pipelines == 1
+    assert await hits_redis.zscore(VENUE_HITS_KEY, "local 0") == 34
+
+    async def _down():
+        raise ConnectionError("redis fora")
+
+    monkeypatch.setattr("app.services.cache_warmup.provide_redis", _down)
+    venue_hits.record("local 0")
+    assert await venue_hits.flush() == 0                     # falhou: contagem preservada
+    monkeypatch.setattr("app.services.cache_warmup.provide_redis", lambda: asyncio.sleep(0, hits_redis))
+    assert await venue_hits.flush() == 1
+    assert await hits_redis.zscore(VENUE_HITS_KEY, "local 0") == 35
+
+async def test_warm_up_fills_top_lists_and_venues(monkeypatch, repo, hits_redis, fake_async_redis):
+    monkeypatch.setattr(cache_warmup, "provide_event_repo", lambda db: repo)
+    repo.add(EventCreate(
+        title="futuro", description="d", city="Recife",
+        event_date=datetime.now(tz=timezone.utc) + timedelta(days=1), participants=[],
+    ))
+    await hits_redis.zincrby(VENUE_HITS_KEY, 3, "cesar")
+    await hits_redis.zincrby(VENUE_HITS_KEY, 1, "lugar inexistente")
+
+    stats = await warm_up_cache()
+    await asyncio.sleep(0)                                   # tasks de websocket agendadas pelos endpoints
+
+    assert stats == {"ok": 3, "empty": 1, "failed": 0, "cancelled": 0}
+    keys = {k.decode().split(":")[0] for k in await fake_async_redis.keys("*")}
+    assert {"top-soon", "top-viewed", "local-info"} <= keys
+
+def test_warmed_top_list_serves_the_real_request(monkeypatch, client, auth_header, repo, hits_redis, fake_async_redis):
+    monkeypatch.setattr(cache_warmup, "provide_event_repo", lambda db: repo)
+    repo.add(EventCreate(
+        title="futuro", description="d", city="Recife",
+        event_date=datetime.now(tz=timezone.utc) + timedelta(days=1), participants=[],
+    ))
+    asyncio.run(warm_up_cache())
+
+    def _no_repo():
+        raise AssertionError("top-soon aquecido não deveria ir ao repositório")
+
+    monkeypatch.setattr(repo, "list_all", _no_repo)
+    resp = client.get("/api/v1/events/top/soon", headers=auth_header)    # limit=10, o mesmo do aquecimento
+    assert resp.status_code == 200 and resp.json()[0]["title"] == "Futuro"
+
+async def test_warm_up_respects_time_budget(monkeypatch, hits_redis):
+    async def _slow():
+        await asyncio.sleep(10)
+
+    async def _jobs():
+        return [("lento", _slow), ("rapido", lambda: asyncio.sleep(0))]
+
+    monkeypatch.setattr(cache_warmup, "_build_jobs", _jobs)
+    monkeypatch.setattr(cache_warmup._settings, "cache_warmup_budget_s", 0.05)
+
+    stats = await warm_up_cache()
+    assert stats["ok"] == 1 and stats["cancelled"] == 1
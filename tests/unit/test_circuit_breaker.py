@@ -0,0 +1,142 @@
+# tests/unit/test_circuit_breaker.py
+# (disjuntor do Redis usado pelo cached_json)
+
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, HALF_OPEN, OPEN, redis_breaker
+from app.utils.cache import cached_json, invalidate_tags
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.utils.circuit_breaker.time.monotonic", lambda: now[0])
+    return now
+
+def _state(name: str) -> float:
+    return REGISTRY.get_sample_value("circuit_breaker_state", {"name": name})
+
+def test_opens_on_failure_rate_and_probes_after_cooldown(clock):
+    cb = CircuitBreaker("t-rate", failure_rate=0.5, min_calls=4, window=4, open_seconds=5)
+    for _ in range(2):
+        cb.record_success(0.001)
+    cb.record_failure()
+    assert cb.state == CLOSED                                # só 3 chamadas na janela
+    cb.record_failure()
+    assert cb.state == OPEN and _state("t-rate") == 2
+    assert cb.allow() is False
+
+    clock[0] += 5
+    assert cb.allow() is True                                # uma chamada de prova
+    assert cb.state == HALF_OPEN
+    assert cb.allow() is False                               # só uma por vez
+    cb.record_success(0.001)
+    assert cb.state == CLOSED and _state("t-rate") == 0
+
+def test_failed_probe_reopens(clock):
+    cb = CircuitBreaker("t-probe", min_calls=1, window=1, open_seconds=5)
+    cb.record_failure()
+    clock[0] += 5
+    assert cb.allow()
+    cb.record_failure()
+    assert cb.state == OPEN
+    assert not cb.allow()
+
+def test_probe_without_result_expires(clock):
+    cb = CircuitBreaker("t-deadline", min_calls=1, window=1, open_seconds=5, probe_timeout=2)
+    cb.record_failure()
+    clock[0] += 5
+    assert cb.allow()                                        # prova sai e nunca registra resultado
+    clock[0] += 2
+    assert cb.state == OPEN and not cb.allow()               # prazo vencido = falha
+    clock[0] += 5
+    assert cb.allow()
+
+async def test_cancelled_probe_is_recorded(clock):
+    cb = CircuitBreaker("t-cancel", min_calls=1, window=1, open_seconds=5)
+    cb.record_failure()
+    clock[0] += 5
+
+    async def _hang():
+        await asyncio.sleep(10)
+
+    task = asyncio.create_task(cb.call(_hang))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert cb.state == OPEN                                  # não fica em half-open com prova "em voo"
+
+def test_guard_skips_call_when_open(clock):
+    cb = CircuitBreaker("t-guard", min_calls=1, window=1, open_seconds=5)
+    with pytest.raises(ConnectionError), cb.guard():
+        raise ConnectionError("redis fora")
+    assert cb.state == OPEN
+    with pytest.raises(CircuitOpenError), cb.guard():
+        raise AssertionError("não deveria executar")
+
+def test_slow_calls_count_as_failures():
+    cb = CircuitBreaker("t-slow", min_calls=2, window=2, slow_ms=100)
+    cb.record_success(0.5)
+    cb.record_success(0.5)
+    assert cb.state == OPEN
+
+async def test_cached_json_skips_redis_when_open(monkeypatch):
+    touched = []
+
+    async def _provide():
+        class _Redis:
+            def __getattr__(self, name):
+                async def _call(*args, **kwargs):
+                    touched.append(name)
+                    raise AssertionError("não deveria tocar no Redis")
+                return _call
+        return _Redis()
+
+    monkeypatch.setattr("app.utils.cache.provide_redis", _provide)
+    for _ in range(redis_breaker.min_calls):
+        redis_breaker.record_failure()
+    assert redis_breaker.state == OPEN
+
+    @cached_json("t-breaker", ttl=60)
+    async def compute():
+        return "direto"
+
+    before = REGISTRY.get_sample_value(
+        "cache_requests_total", {"tier": "l2", "prefix": "t-breaker", "result": "bypass"}
+    ) or 0.0
+    assert await compute() == "direto"
+    assert touched == []
+    assert REGISTRY.get_sample_value(
+        "cache_requests_total", {"tier": "l2", "prefix": "t-breaker", "result": "bypass"}
+    ) == before + 1
+
+async def test_redis_failures_trip_the_breaker(monkeypatch):
+    async def _provide():
+        class _Down:
+            async def get(self, key):
+                raise ConnectionError("redis fora")
+        return _Down()
+
+    monkeypatch.setattr("app.utils.cache.provide_redis", _provide)
+
+    @cached_json("t-breaker-trip", ttl=60)
+    async def compute():
+        return 1
+
+    for _ in range(redis_breaker.min_calls):
+        assert await compute() == 1
+    assert redis_breaker.state == OPEN
+
+async def test_invalidate_tags_does_not_take_probe_without_redis(monkeypatch, clock):
+    async def _broken():
+        raise ConnectionError("sem conexão")
+
+    monkeypatch.setattr("app.utils.cache.provide_redis", _broken)
+    for _ in range(redis_breaker.min_calls):
+        redis_breaker.record_failure()
+    clock[0] += redis_breaker.open_seconds
+    await invalidate_tags("lista")
+    assert redis_breaker.state == HALF_OPEN and redis_breaker.allow()   # prova ainda disponível
@@ -0,0 +1,114 @@
+# tests/unit/test_etag.py
+# (ETag / If-None-Match / If-Modified-Since → 304)
+
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import formatdate
+
+from starlette.requests import Request
+
+from app.schemas.event_create import EventCreate
+from app.utils.http import etag_matches, not_modified_since, cache_headers
+
+def _request(**headers) -> Request:
+    raw = [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "headers": raw})
+
+def _future_event(repo, title="futuro"):
+    return repo.add(EventCreate(
+        title=title, description="d", city="Recife",
+        event_date=datetime.now(tz=timezone.utc) + timedelta(days=1), participants=[],
+    ))
+
+# ───────────── helpers ─────────────
+def test_etag_matches_list_weak_and_star():
+    assert etag_matches(_request(if_none_match='"a", W/"b"'), '"b"')
+    assert etag_matches(_request(if_none_match="*"), '"x"')
+    assert not etag_matches(_request(if_none_match='"a"'), '"b"')
+    assert not etag_matches(_request(), '"b"')
+
+def test_not_modified_since():
+    now = time.time()
+    assert not_modified_since(_request(if_modified_since=formatdate(now, usegmt=True)), now - 10)
+    assert not not_modified_since(_request(if_modified_since=formatdate(now - 60, usegmt=True)), now)
+    assert not not_modified_since(_request(if_modified_since="lixo"), now)
+    # If-None-Match tem precedência
+    assert not not_modified_since(_request(if_modified_since=formatdate(now, usegmt=True), if_none_match='"x"'), 0)
+
+def test_cache_headers():
+    assert cache_headers(None) == {}
+    assert set(cache_headers('"x"', 0.0)) == {"ETag", "Last-Modified"}
+
+# ───────────── endpoints ─────────────
+def test_event_by_id_conditional_get(client, auth_header, repo, fake_async_redis):
+    event = _future_event(repo)
+    url = f"/api/v1/events/{event.id}"
+
+    first = client.get(url, headers=auth_header)
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and etag.startswith('W/"')   # views muda o corpo: validador fraco
+
+    again = client.get(url, headers={**auth_header, "If-None-Match": etag})
+    assert again.status_code == 304 and again.content == b""
+    assert repo.get(event.id).views == 2                    # revalidação também conta view
+
+    client.patch(url, json={"title": "Mudou"}, headers=auth_header)
+    changed = client.get(url, headers={**auth_header, "If-None-Match": etag})
+    assert changed.status_code == 200 and changed.json()["title"] == "Mudou"
+
+def test_event_views_do_not_change_etag(client, auth_header, repo, fake_async_redis):
+    event = _future_event(repo)
+    url = f"/api/v1/events/{event.id}"
+
+    etags = {client.get(url, headers=auth_header).headers["etag"] for _ in range(3)}
+    assert len(etags) == 1                                  # leitura não faz INCR da tag
+    assert repo.get(event.id).views == 3
+    assert client.get(url, headers={**auth_header, "If-None-Match": etags.pop()}).status_code == 304
+
+def test_event_by_id_last_modified(client, auth_header, repo, fake_async_redis):
+    event = _future_event(repo)
+    url = f"/api/v1/events/{event.id}"
+
+    first = client.get(url, headers=auth_header)
+    last_modified = first.headers["last-modified"]
+    assert first.headers["last-modified"] == formatdate(repo.get(event.id).updated_at.timestamp(), usegmt=True)
+    assert client.get(url, headers={**auth_header, "If-Modified-Since": last_modified}).status_code == 304
+    assert client.get(url, headers=auth_header).headers["last-modified"] == last_modified   # views++ não conta
+
+    repo.get(event.id).updated_at -= timedelta(minutes=1)                                   # escrita "antiga"
+    old = client.get(url, headers=auth_header).headers["last-modified"]
+    client.patch(url, json={"title": "Mudou"}, headers=auth_header)                         # escrita carimba de novo
+    assert client.get(url, headers={**auth_header, "If-Modified-Since": old}).status_code == 200
+
+def test_list_events_conditional_get(client, auth_header, repo, fake_async_redis):
+    _future_event(repo)
+    first = client.get("/api/v1/events/", headers=auth_header)
+    etag = first.headers["etag"]
+
+    assert client.get("/api/v1/events/", headers={**auth_header, "If-None-Match": etag}).status_code == 304
+    other_page = client.get("/api/v1/events/?limit=5", headers={**auth_header, "If-None-Match": etag})
+    assert other_page.status_code == 200                     # filtros entram na ETag
+
+    last_modified = first.headers["last-modified"]
+    assert client.get("/api/v1/events/", headers={**auth_header, "If-Modified-Since": last_modified}).status_code == 304
+    repo.get(_future_event(repo, title="outro").id).updated_at += timedelta(minutes=1)      # escrita mais nova na página
+    assert client.get("/api/v1/events/", headers={**auth_header, "If-Modified-Since": last_modified}).status_code == 200
+
+def test_top_soon_conditional_get(client, auth_header, repo, fake_async_redis):
+    _future_event(repo)
+    first = client.get("/api/v1/events/top/soon", headers=auth_header)
+    assert first.status_code == 200
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+
+    by_etag = client.get("/api/v1/events/top/soon", headers={**auth_header, "If-None-Match": etag})
+    assert by_etag.status_code == 304 and by_etag.headers["etag"] == etag
+
+    by_date = client.get("/api/v1/events/top/soon", headers={**auth_header, "If-Modified-Since": last_modified})
+    assert by_date.status_code == 304
+
+    client.post("/api/v1/events", json={
+        "title": "novo", "description": "d", "city": "Recife", "participants": [],
+        "event_date": (datetime.now(tz=timezone.utc) + timedelta(hours=1)).isoformat(),
+    }, headers=auth_header)                                  # invalida EVENTS_LIST_TAG
+    after = client.get("/api/v1/events/top/soon", headers={**auth_header, "If-None-Match": etag})
+    assert after.status_code == 200 and after.headers["etag"] != etag
@@ -0,0 +1,123 @@
+# tests/unit/test_event_cached.py
+# (CachedEventRepo: cache read-through/write-through em volta do repositório)
+
+from datetime import datetime, timedelta, timezone
+import fakeredis
+import pytest
+from prometheus_client import REGISTRY
+
+from app.repositories.event_mem import InMemoryEventRepo
+from app.repositories.event_cached import CachedEventRepo
+from app.schemas.event_create import EventCreate
+from app.utils.circuit_breaker import redis_breaker
+
+def _new_event(title: str = "show", city: str = "Recife") -> EventCreate:
+    return EventCreate(
+        title=title, description="d", city=city,
+        event_date=datetime.now(tz=timezone.utc) + timedelta(days=1), participants=[],
+    )
+
+def _hits(op: str) -> float:
+    return REGISTRY.get_sample_value("repo_cache_requests_total", {"op": op, "result": "hit"}) or 0.0
+
+class _CountingRepo(InMemoryEventRepo):
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def get(self, event_id):
+        self.reads += 1
+        return super().get(event_id)
+
+    def list_partial(self, **kwargs):
+        self.reads += 1
+        return super().list_partial(**kwargs)
+
+@pytest.fixture
+def inner():
+    return _CountingRepo()
+
+@pytest.fixture
+def cached(inner):
+    return CachedEventRepo(inner, fakeredis.FakeRedis(), ttl=60, list_ttl=60)
+
+def test_get_is_read_through(cached, inner):
+    event = inner.add(_new_event())
+    before = _hits("get")
+
+    assert cached.get(event.id) == event
+    assert cached.get(event.id) == event
+    assert inner.reads == 1
+    assert _hits("get") == before + 1
+
+def test_writes_are_written_through(cached, inner):
+    event = cached.add(_new_event())
+    cached.update(event.id, {"title": "Novo"})
+    assert cached.get(event.id).title == "Novo"
+    assert inner.reads == 0                                  # entidade veio do cache
+
+    cached.delete_by_id(event.id)
+    assert cached.get(event.id) is None
+
+def test_list_partial_invalidated_by_collection_version(cached, inner):
+    cached.add(_new_event("a"))
+    assert len(cached.list_partial(skip=0, limit=10, city="Recife")) == 1
+    assert len(cached.list_partial(skip=0, limit=10, city="Recife")) == 1
+    assert inner.reads == 1
+
+    cached.add(_new_event("b"))                              # INCR da versão
+    assert len(cached.list_partial(skip=0, limit=10, city="Recife")) == 2
+    assert inner.reads == 2
+
+def test_views_update_keeps_lists_cached(cached, inner):
+    event = cached.add(_new_event())
+    cached.list_partial(skip=0, limit=10)
+    cached.update(event.id, {"views": 5})
+    cached.list_partial(skip=0, limit=10)
+    assert inner.reads == 1                                  # views++ não invalida listas
+    assert cached.get(event.id).views == 5
+
+def test_bulk_operations_drop_entities(cached, inner):
+    event = cached.add(_new_event())
+    cached.get(event.id)
+    cached.delete_all()
+    assert cached.get(event.id) is None
+    assert cached.list_all() == []
+
+def test_redis_errors_fall_back_to_inner_repo(inner):
+    class _Broken:
+        def __getattr__(self, name):
+            def _fail(*args, **kwargs):
+                raise ConnectionError("redis fora")
+            return _fail
+
+    cached = CachedEventRepo(inner, _Broken())
+    event = cached.add(_new_event())                         # escrita não falha
+    assert cached.get(event.id) == event
+    assert cached.list_partial(skip=0, limit=10) == [event]
+
+def test_provide_event_repo_wraps_when_enabled(monkeypatch):
+    from app import deps
+
+    monkeypatch.setattr(deps._settings, "event_repo_cache", True)
+    monkeypatch.setattr(deps._settings, "redis_url", "redis://fake")
+    monkeypatch.setattr(deps, "provide_redis_sync", lambda: fakeredis.FakeRedis())
+    assert isinstance(deps.provide_event_repo(None), CachedEventRepo)
+
+    monkeypatch.setattr(deps._settings, "event_repo_cache", False)
+    assert not isinstance(deps.provide_event_repo(None), CachedEventRepo)
+
+def test_open_breaker_skips_redis():
+    class _Redis(fakeredis.FakeRedis):
+        calls = 0
+
+        def execute_command(self, *args, **kwargs):
+            type(self).calls += 1
+            return super().execute_command(*args, **kwargs)
+
+    repo = CachedEventRepo(InMemoryEventRepo(), _Redis())
+    for _ in range(redis_breaker.min_calls):
+        redis_breaker.record_failure()
+
+    assert repo.get(1) is None and repo.list_all() == []
+    assert _Redis.calls == 0
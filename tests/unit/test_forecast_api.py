@@ -0,0 +1,153 @@
+# tests/unit/test_forecast_api.py
+# (HttpForecastService contra um provedor ASGI local: retry, semáforo, ponte síncrona, pool compartilhado)
+
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
+
+from app.schemas.weather_forecast import ForecastInfo
+from app.services import http_client
+from app.services.forecast_api import HttpForecastService
+
+WHEN = datetime(2030, 1, 10, 12, 0, tzinfo=timezone.utc)
+
+class _Provider:
+    """Provedor de previsões falso (ASGI) que conta chamadas e concorrência."""
+
+    def __init__(self, failures: int = 0, latency: float = 0):
+        self.failures = failures
+        self.latency = latency
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.app = FastAPI()
+        self.app.get("/forecast")(self.forecast)
+
+    async def forecast(self, city: str = Query(...), datetime: str = Query(...)):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if self.calls <= self.failures:
+                return JSONResponse({"detail": "indisponível"}, status_code=503)
+            if city == "Atlântida":
+                return JSONResponse({"detail": "sem previsão"}, status_code=404)
+            return ForecastInfo(
+                forecast_datetime=datetime, temperature=27.5, weather_main="Clear",
+                weather_desc="Céu limpo", humidity=65, wind_speed=2.5,
+            ).model_dump(mode="json")
+        finally:
+            self.in_flight -= 1
+
+class _HandshakeTransport(httpx.ASGITransport):
+    """Cobra um "handshake" (TCP + TLS) na primeira request de cada transporte, como uma conexão nova."""
+
+    HANDSHAKE_S = 0.005
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._connected = False
+
+    async def handle_async_request(self, request):
+        if not self._connected:
+            await asyncio.sleep(self.HANDSHAKE_S)
+            self._connected = True
+        return await super().handle_async_request(request)
+
+@pytest.fixture(autouse=True)
+def _provider_url(monkeypatch):
+    monkeypatch.setattr("app.services.forecast_api.get_service_url", lambda _: "http://provider/forecast")
+
+def _service(provider: _Provider, **kwargs) -> HttpForecastService:
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=provider.app))
+    kwargs.setdefault("backoff_base", 0)
+    return HttpForecastService(client, **kwargs)
+
+async def test_fetch_parses_forecast():
+    service = _service(_Provider())
+    forecast = await service.fetch("Recife", WHEN)
+    assert isinstance(forecast, ForecastInfo)
+    assert forecast.forecast_datetime == WHEN
+
+async def test_not_found_means_no_forecast():
+    assert await _service(_Provider()).fetch("Atlântida", WHEN) is None
+
+async def test_transient_errors_are_retried():
+    provider = _Provider(failures=2)
+    assert await _service(provider, retries=3).fetch("Recife", WHEN) is not None
+    assert provider.calls == 3
+
+async def test_gives_up_after_retries():
+    provider = _Provider(failures=10)
+    with pytest.raises(httpx.HTTPStatusError):
+        await _service(provider, retries=2).fetch("Recife", WHEN)
+    assert provider.calls == 3
+
+async def test_aget_many_fetches_each_distinct_date_once():
+    provider = _Provider()
+    later = WHEN.replace(hour=18)
+    result = await _service(provider).aget_many("Recife", [WHEN, later, WHEN])
+    assert provider.calls == 2
+    assert [f.forecast_datetime for f in result] == [WHEN, later, WHEN]
+
+def test_backoff_has_jitter_and_cap():
+    service = HttpForecastService(backoff_base=0.1, backoff_max=0.5)
+    delays = [service._backoff(6) for _ in range(50)]
+    assert all(0 <= d <= 0.5 for d in delays)
+    assert len(set(delays)) > 1
+
+async def test_semaphore_bounds_concurrent_calls():
+    provider = _Provider(latency=0.01)
+    service = _service(provider, max_concurrency=3)
+    await asyncio.gather(*(service.fetch("Recife", WHEN) for _ in range(20)))
+    assert provider.calls == 20
+    assert provider.max_in_flight <= 3
+
+async def test_sync_protocol_bridges_to_client_loop():
+    service = _service(_Provider())
+    await service.fetch("Recife", WHEN)                     # fixa o loop dono do cliente
+
+    forecast = await asyncio.to_thread(service.get_by_city_and_datetime, "Recife", WHEN)
+    assert forecast is not None
+
+    with pytest.raises(RuntimeError):                       # no próprio loop travaria
+        service.get_by_city_and_datetime("Recife", WHEN)
+
+async def test_shared_client_beats_client_per_call():
+    provider = _Provider()
+    calls = 30
+
+    async def per_call() -> None:
+        async with httpx.AsyncClient(transport=_HandshakeTransport(app=provider.app)) as client:
+            (await client.get("http://provider/forecast", params={"city": "Recife", "datetime": WHEN.isoformat()})).raise_for_status()
+
+    started = time.perf_counter()
+    for _ in range(calls):
+        await per_call()
+    per_call_s = time.perf_counter() - started
+
+    service = HttpForecastService(httpx.AsyncClient(transport=_HandshakeTransport(app=provider.app)))
+    started = time.perf_counter()
+    for _ in range(calls):
+        await service.fetch("Recife", WHEN)
+    shared_s = time.perf_counter() - started
+
+    assert per_call_s >= calls * _HandshakeTransport.HANDSHAKE_S
+    assert shared_s < per_call_s / 2
+
+async def test_shared_client_lifecycle():
+    client = await http_client.start_http_client()
+    try:
+        assert http_client.get_http_client() is client
+        assert http_client.http_client_loop() is asyncio.get_running_loop()
+    finally:
+        await http_client.close_http_client()
+    assert client.is_closed
+    assert http_client.http_client_loop() is None
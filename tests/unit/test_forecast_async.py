@@ -0,0 +1,149 @@
+# tests/unit/test_forecast_async.py
+# (forecast sem bloquear o loop: executor limitado, variante assíncrona do protocolo, lote = 1 chamada, benchmark de lag)
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import fakeredis
+import pytest
+
+from app.services.forecast import fetch_forecasts
+from app.services.forecast_cached import CachedForecastService
+from app.services.forecast_queue import ForecastRefreshQueue
+from app.services.mock_forecast_info import MockForecastService
+from app.utils import blocking
+from app.schemas.event_create import EventCreate
+
+BASE = datetime.now(tz=timezone.utc).replace(hour=10, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+class _BlockingProvider:
+    """Provedor síncrono lento (ex.: SDK com `requests`): cada chamada segura a thread."""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.batches: list[tuple[str, list[datetime]]] = []
+        self._inner = MockForecastService()
+
+    def get_by_city_and_datetime(self, city, date):
+        time.sleep(self.latency)
+        return self._inner.get_by_city_and_datetime(city, date)
+
+    def get_many(self, city, dates):
+        self.batches.append((city, list(dates)))
+        time.sleep(self.latency)
+        return self._inner.get_many(city, dates)
+
+class _AsyncProvider(MockForecastService):
+    def __init__(self):
+        self.batches: list[tuple[str, list[datetime]]] = []
+
+    async def aget_many(self, city, dates):
+        self.batches.append((city, list(dates)))
+        return await super().aget_many(city, dates)
+
+async def _max_loop_lag(work, tick: float = 0.005) -> float:
+    """Maior atraso (s) de um `sleep(tick)` enquanto `work` roda — mede quanto o loop ficou travado."""
+    lag = 0.0
+    done = asyncio.Event()
+
+    async def _probe():
+        nonlocal lag
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(tick)
+            lag = max(lag, time.perf_counter() - started - tick)
+
+    probe = asyncio.create_task(_probe())
+    await asyncio.sleep(0)
+    try:
+        await work
+    finally:
+        done.set()
+        await probe
+    return lag
+
+@pytest.fixture
+def small_executor(monkeypatch):
+    blocking.shutdown_blocking_executor()
+    monkeypatch.setattr(blocking._settings, "blocking_executor_workers", 2)
+    yield
+    blocking.shutdown_blocking_executor()
+
+async def test_run_blocking_is_bounded(small_executor):
+    running = peak = 0
+    lock = threading.Lock()
+
+    def _work():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+
+    await asyncio.gather(*(blocking.run_blocking(_work) for _ in range(6)))
+    assert peak == 2
+
+async def test_fetch_forecasts_uses_async_variant_or_one_executor_hop():
+    dates = [BASE, BASE + timedelta(hours=6)]
+
+    async_provider = _AsyncProvider()
+    assert len(await fetch_forecasts(async_provider, "Recife", dates)) == 2
+    assert async_provider.batches == [("Recife", dates)]
+
+    sync_provider = _BlockingProvider(latency=0)
+    assert len(await fetch_forecasts(sync_provider, "Recife", dates)) == 2
+    assert sync_provider.batches == [("Recife", dates)]
+
+async def test_cached_aget_many_only_asks_for_misses():
+    provider = _AsyncProvider()
+    r = fakeredis.FakeRedis()
+    cached = CachedForecastService(provider, r, slot_hours=6)
+    near = BASE + timedelta(minutes=30)                              # mesmo slot de BASE
+
+    first = await cached.aget_many("Recife", [BASE, near, BASE + timedelta(hours=6)])
+    assert first[0] is first[1]
+    assert provider.batches == [("Recife", [BASE, BASE + timedelta(hours=6)])]
+
+    # L1 do outro "worker" vazio: vem do Redis em um MGET, sem chamar o provedor
+    other = CachedForecastService(provider, r, slot_hours=6)
+    again = await other.aget_many("Recife", [BASE, BASE + timedelta(days=1)])
+    assert again[0] == first[0]
+    assert provider.batches[1:] == [("Recife", [BASE + timedelta(days=1)])]
+    assert await other.aget_many("Atlântida", [BASE]) == [None]
+
+def _add(repo, city: str, when: datetime) -> int:
+    return repo.add(EventCreate(title="show", description="d", city=city, event_date=when, participants=[])).id
+
+async def test_batch_costs_one_async_call_per_city(repo, fake_async_redis):
+    provider = _AsyncProvider()
+    queue = ForecastRefreshQueue(service_factory=lambda: provider, repo_factory=lambda db: repo)
+    ids = [_add(repo, "Recife", BASE + timedelta(hours=h)) for h in (0, 0, 6, 30)]
+
+    assert await queue.refresh(ids) == set()
+    assert len(provider.batches) == 1
+    assert len(provider.batches[0][1]) == 3                          # um representante por bucket
+    assert all(repo.get(i).forecast_info is not None for i in ids)
+
+async def test_event_loop_lag_benchmark(repo, fake_async_redis):
+    """Refresh de 8 cidades com provedor síncrono de 50 ms: chamado no loop vs. pelo executor."""
+    cities = ["Recife", "Curitiba", "Fortaleza", "São Paulo", "Porto Alegre", "recife ", "curitiba ", "fortaleza "]
+    ids = [_add(repo, city, BASE + timedelta(days=i)) for i, city in enumerate(cities)]
+    provider = _BlockingProvider(latency=0.05)
+
+    async def _inline():
+        # como era antes: provedor e repositório síncronos chamados direto na coroutine
+        for event_id in ids:
+            event = repo.get(event_id)
+            provider.get_by_city_and_datetime(event.city, event.event_date)
+
+    queue = ForecastRefreshQueue(workers=4, service_factory=lambda: provider, repo_factory=lambda db: repo)
+    inline_lag = await _max_loop_lag(_inline())
+    offloaded_lag = await _max_loop_lag(queue.refresh(ids))
+
+    assert inline_lag >= 8 * provider.latency * 0.9                  # o loop ficou parado o lote inteiro
+    assert offloaded_lag < provider.latency                         # no máximo um "soluço" de agendamento
+    assert offloaded_lag < inline_lag / 4
@@ -0,0 +1,133 @@
+# tests/unit/test_forecast_cached.py
+# (cache de previsões por cidade + slot do provedor em volta do AbstractForecastService)
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import fakeredis
+import pytest
+from prometheus_client import REGISTRY
+
+from app.services.forecast_cached import CachedForecastService, provider_slot
+from app.services.mock_forecast_info import MockForecastService
+
+SLOT = datetime(2030, 1, 10, 12, 0, tzinfo=timezone.utc)
+BRT = timezone(timedelta(hours=-3))
+
+class _CountingService(MockForecastService):
+    def __init__(self, delay: float = 0):
+        self.calls = 0
+        self.delay = delay
+
+    def get_by_city_and_datetime(self, city, date):
+        self.calls += 1
+        if self.delay:
+            threading.Event().wait(self.delay)
+        return super().get_by_city_and_datetime(city, date)
+
+    async def aget_many(self, city, dates):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return [super(_CountingService, self).get_by_city_and_datetime(city, date) for date in dates]
+
+class _BrokenRedis:
+    def get(self, *_):
+        raise ConnectionError("redis fora do ar")
+
+    def set(self, *_, **__):
+        raise ConnectionError("redis fora do ar")
+
+@pytest.fixture
+def inner():
+    return _CountingService()
+
+def _hits(tier: str, result: str) -> float:
+    return REGISTRY.get_sample_value(
+        "cache_requests_total", {"tier": tier, "prefix": "forecast-service", "result": result},
+    ) or 0.0
+
+def test_same_city_and_slot_share_one_call(inner):
+    service = CachedForecastService(inner)
+    before = _hits("l1", "hit")
+
+    first = service.get_by_city_and_datetime("Recife", SLOT)
+    again = service.get_by_city_and_datetime("  recife ", SLOT + timedelta(hours=2))
+
+    assert inner.calls == 1
+    assert again == first
+    assert _hits("l1", "hit") - before == 1
+
+def test_other_slot_or_city_misses(inner):
+    service = CachedForecastService(inner)
+    service.get_by_city_and_datetime("Recife", SLOT)
+    service.get_by_city_and_datetime("Recife", SLOT + timedelta(hours=4))
+    service.get_by_city_and_datetime("Curitiba", SLOT)
+    assert inner.calls == 3
+
+def test_unknown_city_is_cached_too(inner):
+    service = CachedForecastService(inner)
+    assert service.get_by_city_and_datetime("Atlântida", SLOT) is None
+    assert service.get_by_city_and_datetime("atlântida", SLOT) is None
+    assert inner.calls == 1
+
+def test_redis_tier_is_shared_between_workers(inner):
+    redis = fakeredis.FakeRedis()
+    worker_a = CachedForecastService(inner, redis, ttl=60)
+    worker_b = CachedForecastService(inner, redis, ttl=60)
+    before = _hits("l2", "hit")
+
+    expected = worker_a.get_by_city_and_datetime("Recife", SLOT)
+    assert worker_b.get_by_city_and_datetime("Recife", SLOT) == expected
+
+    assert inner.calls == 1
+    assert _hits("l2", "hit") - before == 1
+    assert 0 < redis.ttl(worker_a.key_for("Recife", SLOT)) <= 60
+
+def test_redis_errors_fall_back_to_provider(inner):
+    service = CachedForecastService(inner, _BrokenRedis())
+    before = _hits("l2", "error")
+
+    assert service.get_by_city_and_datetime("Recife", SLOT) is not None
+    assert inner.calls == 1
+    assert _hits("l2", "error") - before == 1
+
+def test_concurrent_misses_are_coalesced():
+    inner = _CountingService(delay=0.1)
+    service = CachedForecastService(inner)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: service.get_by_city_and_datetime("Recife", SLOT), range(8)))
+
+    assert inner.calls == 1
+    assert all(r == results[0] for r in results)
+
+def test_key_follows_provider_grid_in_local_timezone(inner):
+    direct = MockForecastService()
+    service = CachedForecastService(inner)
+    morning, late_morning = datetime(2030, 1, 10, 7, 0, tzinfo=BRT), datetime(2030, 1, 10, 11, 0, tzinfo=BRT)
+
+    assert service.key_for("Recife", morning) != service.key_for("Recife", late_morning)
+    assert service.get_by_city_and_datetime("Recife", morning) == direct.get_by_city_and_datetime("Recife", morning)
+    cached = service.get_by_city_and_datetime("Recife", late_morning)
+    assert cached == direct.get_by_city_and_datetime("Recife", late_morning)
+    assert cached.forecast_datetime == datetime(2030, 1, 10, 12, 0, tzinfo=BRT)
+    assert inner.calls == 2
+
+@pytest.mark.parametrize("hour", [3, 9, 15, 21])
+def test_ties_round_to_the_earlier_slot_like_the_provider(hour):
+    date = datetime(2030, 1, 10, hour, 0, tzinfo=BRT)
+    expected = MockForecastService().get_by_city_and_datetime("Recife", date).forecast_datetime
+    assert provider_slot(date, 6 * 3600) == expected == date - timedelta(hours=3)
+
+async def test_concurrent_async_misses_are_coalesced():
+    inner = _CountingService(delay=0.1)
+    service = CachedForecastService(inner)
+
+    results = await asyncio.gather(*(service.aget_many("Recife", [SLOT]) for _ in range(5)))
+
+    assert inner.calls == 1                                  # uma busca, não uma por corrotina
+    assert all(r == results[0] for r in results)
+    assert service._ainflight == {}
@@ -1,38 +1,80 @@
 # tests/test_forecast_info.py
 import pytest
-from unittest.mock import MagicMock, call
 from datetime import datetime, timedelta, timezone
 
 from app.main import app
 from app.deps import provide_forecast_service
-from app.services.forecast import atualizar_forecast_em_background
 from app.utils.patch import should_update_forecast, update_event_forecast, update_event
 from app.schemas.event_create import EventResponse
 from app.schemas.event_update import ForecastInfoUpdate, EventUpdate
 
-# TODO Corrigir endpoint para habilitar os testes
-# def test_get_forecast_info(client, auth_header, dt_now_iso):
-#     resp = client.get("/api/v1/events/forecast_info",
-#         params={
-#             "city": "Recife",
-#             "date": dt_now_iso
-#         },
-#         headers=auth_header
-#     )
-#     assert resp.status_code == 200
-#     assert "temperature" in resp.json()
-
-# def test_get_forecast_info_nao_encontrada(client, auth_header):
-#     resp = client.get(
-#         "/api/v1/events/forecast_info",
-#         params={
-#             "city": "cidade_inexistente_zzz",
-#             "date": "2030-01-01T00:00:00"
-#         },
-#         headers=auth_header
-#     )
-#     assert resp.status_code == 404
-#     assert resp.json()["detail"] == "Previsão não encontrada"
+class _BatchSpy:
+    """Serviço de previsão que registra cada chamada em lote."""
+
+    def __init__(self):
+        from app.services.mock_forecast_info import MockForecastService
+        self.inner = MockForecastService()
+        self.batches: list[list[datetime]] = []
+
+    def get_by_city_and_datetime(self, city, date):
+        return self.inner.get_by_city_and_datetime(city, date)
+
+    async def aget_many(self, city, dates):
+        self.batches.append(list(dates))
+        return await self.inner.aget_many(city, dates)
+
+@pytest.fixture
+def forecast_spy():
+    spy = _BatchSpy()
+    app.dependency_overrides[provide_forecast_service] = lambda: spy
+    yield spy
+    app.dependency_overrides.pop(provide_forecast_service, None)
+
+def _range(client, auth_header, city, start, end=None):
+    params = {"city": city, "start": start} | ({"end": end} if end else {})
+    return client.get("/api/v1/events/forecast_info", params=params, headers=auth_header)
+
+def test_get_forecast_info_single_day(client, auth_header, forecast_spy, fake_async_redis):
+    resp = _range(client, auth_header, "Recife", "2030-01-10")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert (body["start"], body["end"]) == ("2030-01-10", "2030-01-10")
+    assert [f["forecast_datetime"][11:16] for f in body["forecasts"]] == ["00:00", "06:00", "12:00", "18:00"]
+
+def test_get_forecast_info_range_is_one_batch_and_reuses_day_entries(client, auth_header, forecast_spy, fake_async_redis):
+    import asyncio
+
+    resp = _range(client, auth_header, "Recife", "2030-01-10", "2030-01-12")
+    assert resp.status_code == 200
+    assert len(resp.json()["forecasts"]) == 12
+    assert [len(b) for b in forecast_spy.batches] == [12]              # 3 dias, uma chamada
+
+    # sub-intervalo e outra grafia da cidade: servidos pelas entradas diárias, sem chave nova
+    resp = _range(client, auth_header, " recife ", "2030-01-11", "2030-01-12")
+    assert len(resp.json()["forecasts"]) == 8
+    assert len(forecast_spy.batches) == 1
+    keys = asyncio.run(fake_async_redis.keys("forecast-day:*"))
+    assert len(keys) == 3
+
+def test_get_forecast_info_range_fetches_only_missing_days(client, auth_header, forecast_spy, fake_async_redis):
+    assert _range(client, auth_header, "Recife", "2030-01-11", "2030-01-12").status_code == 200
+
+    # 10 e 13 faltam; 11 e 12 vêm do cache e ficam fora do lote
+    resp = _range(client, auth_header, "Recife", "2030-01-10", "2030-01-13")
+    assert resp.status_code == 200
+    assert len(resp.json()["forecasts"]) == 16
+    assert len(forecast_spy.batches) == 2
+    assert sorted({d.date().isoformat() for d in forecast_spy.batches[1]}) == ["2030-01-10", "2030-01-13"]
+    assert len(forecast_spy.batches[1]) == 8
+
+def test_get_forecast_info_nao_encontrada(client, auth_header, forecast_spy, fake_async_redis):
+    resp = _range(client, auth_header, "cidade_inexistente_zzz", "2030-01-01")
+    assert resp.status_code == 404
+    assert resp.json()["detail"] == "Previsão não encontrada"
+
+@pytest.mark.parametrize("start, end", [("2030-01-10", "2030-01-09"), ("2030-01-01", "2030-01-20")])
+def test_get_forecast_info_invalid_range(client, auth_header, forecast_spy, start, end):
+    assert _range(client, auth_header, "Recife", start, end).status_code == 422
 
 # Simular erro na atualização de forecast_info (try/except de forecast)
 @pytest.mark.parametrize("event", ["evento_valido"], indirect=True)
@@ -109,86 +151,6 @@ def test_criar_evento_forecast_exception(client, auth_header, event):
 
     app.dependency_overrides = {}
 
-@pytest.mark.asyncio
-async def test_atualizar_forecast_em_background_com_sucesso(monkeypatch):
-    """
-    Testa execução direta da função de forecast, simulando repositório e serviço.
-    """
-
-    # Mocks
-    fake_event = MagicMock()
-    fake_event.city = "Recife"
-    fake_event.event_date = datetime(2025, 6, 1, 20, 0, tzinfo=timezone.utc)
-    fake_event.forecast_info = None
-
-    repo = MagicMock()
-    repo.get.return_value = fake_event
-    repo.replace_by_id.return_value = None
-
-    # forecast = MagicMock()
-    # forecast.model_dump.return_value = {"temperature": 30, "humidity": 70}
-    # forecast_data = {"temperature": 30, "humidity": 70}
-    forecast_data = {
-        "temperature": 30,
-        "humidity": 70,
-        "forecast_datetime": datetime(2025, 6, 1, 20, 0, tzinfo=timezone.utc),
-        "weather_main": "Clouds",
-        "weather_desc": "few clouds",
-        "wind_speed": 3.5,
-    }
-
-    service = MagicMock()
-    # service.get_by_city_and_datetime.return_value = forecast
-    service.get_by_city_and_datetime.side_effect = [
-        MagicMock(model_dump=MagicMock(return_value=forecast_data.copy())),
-        MagicMock(model_dump=MagicMock(return_value=forecast_data.copy())),
-        MagicMock(model_dump=MagicMock(return_value=forecast_data.copy())),
-    ]
-
-    monkeypatch.setattr("app.services.forecast.provide_forecast_service", lambda: service)
-    monkeypatch.setattr("app.services.forecast.provide_event_repo", lambda: repo)
-
-    # Executa
-    await atualizar_forecast_em_background(event_id=123)
-    
-    # repo.get.assert_called_once_with(123)
-    
-    # expected_call = call(123)
-    expected_get_call = call(123)
-    # repo.get.assert_has_calls([expected_call, expected_call, expected_call])
-    # assert repo.get.call_count == 3
-    # repo.get.assert_has_calls([expected_get_call] * 3)
-    assert repo.get.call_count == 1
-    repo.get.assert_called_once_with(123)
-
-    # service.get_by_city_and_datetime.assert_called_once_with("Recife", fake_event.event_date)
-    
-    # Verifica que foi chamado 3 vezes com os mesmos argumentos
-    # expected_call = call("Recife", fake_event.event_date)
-    # expected_forecast_call = call("Recife", fake_event.event_date)
-    # service.get_by_city_and_datetime.assert_has_calls([expected_call] * 3)
-    # assert service.get_by_city_and_datetime.call_count == 3
-    # service.get_by_city_and_datetime.assert_has_calls([expected_forecast_call] * 3)
-    assert service.get_by_city_and_datetime.call_count == 1
-    service.get_by_city_and_datetime.assert_called_once_with("Recife", fake_event.event_date)
-
-    repo.replace_by_id.assert_called_once()
-
-@pytest.mark.asyncio
-async def test_atualizar_forecast_em_background_falha_com_retry(monkeypatch):
-    repo = MagicMock()
-    repo.get.return_value = MagicMock(city="Recife", event_date=datetime.now(timezone.utc))
-
-    service = MagicMock()
-    service.get_by_city_and_datetime.side_effect = Exception("Erro fake")
-
-    monkeypatch.setattr("app.services.forecast.provide_forecast_service", lambda: service)
-    monkeypatch.setattr("app.services.forecast.provide_event_repo", lambda: repo)
-
-    await atualizar_forecast_em_background(event_id=1, retries=2, delay=0)
-
-    assert service.get_by_city_and_datetime.call_count == 2
-
 # ------------------ should_update_forecast ------------------
 
 def test_should_update_forecast_none():
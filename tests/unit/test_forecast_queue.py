@@ -0,0 +1,145 @@
+# tests/unit/test_forecast_queue.py
+# (fila de atualização de forecast: deduplicação, agrupamento por cidade/bucket, pool limitado)
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+import anyio.to_thread
+import pytest
+from prometheus_client import REGISTRY
+
+from app.schemas.event_create import EventCreate
+from app.services import forecast_queue
+from app.services.forecast_queue import ForecastRefreshQueue
+from app.services.mock_forecast_info import MockForecastService
+
+BASE = datetime.now(tz=timezone.utc).replace(hour=10, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+class _CountingService:
+    """Provedor síncrono (sem `aget_many`): conta as chamadas em lote e a concorrência."""
+
+    def __init__(self, fail: bool = False, delay: float = 0):
+        self.calls: list[tuple[str, list[datetime]]] = []
+        self.fail = fail
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+        self._inner = MockForecastService()
+
+    def get_by_city_and_datetime(self, city, date):
+        return self.get_many(city, [date])[0]
+
+    def get_many(self, city, dates):
+        with self._lock:
+            self.calls.append((city, list(dates)))
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            if self.fail:
+                raise RuntimeError("provedor fora do ar")
+            if self.delay:
+                threading.Event().wait(self.delay)
+            return self._inner.get_many(city, dates)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+@pytest.fixture
+def service():
+    return _CountingService()
+
+@pytest.fixture
+def queue(service, repo, fake_async_redis):
+    # fila própria do teste (a global continua servindo o TestClient)
+    return ForecastRefreshQueue(
+        workers=2, window_ms=10, bucket_minutes=60, retries=2, retry_delay=0,
+        service_factory=lambda: service, repo_factory=lambda db: repo,
+    )
+
+def _add(repo, city: str, when: datetime) -> int:
+    return repo.add(EventCreate(
+        title="show", description="d", city=city, event_date=when, participants=[],
+    )).id
+
+def _sample(name: str, labels: dict | None = None) -> float:
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+async def test_duplicate_ids_are_coalesced(queue, service, repo):
+    event_id = _add(repo, "Recife", BASE)
+    before = _sample("forecast_refresh_dedup_total")
+
+    for _ in range(5):
+        queue.enqueue(event_id)
+    assert queue.depth == 1
+    assert _sample("forecast_refresh_queue_depth") == 1
+    await queue.drain()
+
+    assert len(service.calls) == 1
+    assert _sample("forecast_refresh_dedup_total") - before == 4
+    assert _sample("forecast_refresh_queue_depth") == 0
+    assert repo.get(event_id).forecast_info is not None
+    await queue.stop()
+
+async def test_same_city_and_bucket_share_one_provider_call(queue, service, repo):
+    same = [_add(repo, "Recife", BASE), _add(repo, "recife ", BASE + timedelta(minutes=20))]
+    other_bucket = _add(repo, "Recife", BASE + timedelta(hours=5))
+    other_city = _add(repo, "Curitiba", BASE)
+    before = _sample("forecast_refresh_groups_total", {"result": "ok"})
+
+    for event_id in (*same, other_bucket, other_city):
+        queue.enqueue(event_id)
+    await queue.drain()
+
+    # uma chamada por cidade, com uma data por bucket
+    assert sorted(service.calls) == [("Curitiba", [BASE]), ("Recife", [BASE, BASE + timedelta(hours=5)])]
+    assert _sample("forecast_refresh_groups_total", {"result": "ok"}) - before == 3
+    forecasts = [repo.get(i).forecast_info for i in same]
+    assert forecasts[0].forecast_datetime == forecasts[1].forecast_datetime
+    assert all(repo.get(i).forecast_info is not None for i in (other_bucket, other_city))
+    await queue.stop()
+
+async def test_worker_pool_is_bounded(queue, service, repo):
+    service.delay = 0.05
+    for city in ("Recife", "Curitiba", "Fortaleza", "São Paulo", "Porto Alegre"):
+        queue.enqueue(_add(repo, city, BASE))
+    await queue.drain()
+
+    assert len(service.calls) == 5
+    assert service.max_running <= queue.workers
+    await queue.stop()
+
+async def test_provider_failure_is_retried_then_dropped(queue, service, repo):
+    service.fail = True
+    event_id = _add(repo, "Recife", BASE)
+    before = _sample("forecast_refresh_groups_total", {"result": "failed"})
+
+    queue.enqueue(event_id)
+    await queue.drain()
+
+    assert len(service.calls) == queue.retries
+    assert _sample("forecast_refresh_groups_total", {"result": "failed"}) - before == 1
+    assert repo.get(event_id).forecast_info is None
+    await queue.stop()
+
+async def test_enqueue_from_worker_thread(queue, service, repo):
+    event_id = _add(repo, "Recife", BASE)
+    await queue.start()
+
+    # handlers síncronos rodam no ThreadPool do AnyIO
+    await anyio.to_thread.run_sync(queue.enqueue, event_id)
+    await queue.drain()
+
+    assert len(service.calls) == 1
+    await queue.stop()
+
+@pytest.mark.parametrize("event", ["evento_valido"], indirect=True)
+def test_endpoints_enqueue_instead_of_background_tasks(client, auth_header, event, monkeypatch):
+    enqueued: list[int] = []
+    monkeypatch.setattr(forecast_queue.forecast_refresh_queue, "enqueue", enqueued.append)
+
+    event_id = client.post("/api/v1/events", json=event, headers=auth_header).json()["id"]
+    resp = client.patch(f"/api/v1/events/{event_id}/forecast_info", headers=auth_header)
+
+    assert resp.status_code == 200
+    assert enqueued == [event_id, event_id]
@@ -0,0 +1,103 @@
+# tests/unit/test_forecast_shared.py
+# (previsão compartilhada por (cidade, slot): uma gravação por cidade, upsert no SQL)
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.event_orm_db import SQLEventRepo
+from app.schemas.event_create import EventCreate, EventResponse
+from app.schemas.weather_forecast import ForecastInfoResponse
+from app.services.forecast import stamp_forecast
+from app.services.forecast_queue import ForecastRefreshQueue
+from app.services.mock_forecast_info import MockForecastService
+
+BASE = datetime.now(tz=timezone.utc).replace(hour=10, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+def _add(repo, city: str, when: datetime) -> int:
+    return repo.add(EventCreate(title="show", description="d", city=city, event_date=when, participants=[])).id
+
+def _forecast(when: datetime) -> ForecastInfoResponse:
+    return ForecastInfoResponse(
+        forecast_datetime=when, temperature=27.5, weather_main="Clear", weather_desc="Céu limpo",
+        humidity=65, wind_speed=2.5, updated_at=datetime.now(timezone.utc),
+    )
+
+async def test_city_refresh_is_one_write_with_shared_rows(repo, fake_async_redis, monkeypatch):
+    writes: list[tuple[str, list]] = []
+    original = repo.upsert_city_forecasts
+
+    def _spy(city, forecasts):
+        writes.append((city, forecasts))
+        original(city, forecasts)
+
+    monkeypatch.setattr(repo, "upsert_city_forecasts", _spy)
+    # 10h e 11h caem em buckets de 60 min diferentes, mas no mesmo slot de 6h do provedor
+    same_slot = [_add(repo, "Recife", BASE), _add(repo, " recife", BASE + timedelta(minutes=10)), _add(repo, "Recife", BASE + timedelta(hours=1))]
+    other_slot = _add(repo, "Recife", BASE + timedelta(hours=6))
+
+    queue = ForecastRefreshQueue(service_factory=MockForecastService, repo_factory=lambda db: repo)
+    assert await queue.refresh([*same_slot, other_slot]) == set()
+
+    [(city, forecasts)] = writes
+    assert city == "recife"
+    assert sorted(sorted(ids) for _, ids in forecasts) == [sorted(same_slot), [other_slot]]
+    shared = repo.get(same_slot[0]).forecast_info
+    assert all(repo.get(i).forecast_info is shared for i in same_slot)
+    assert repo.get(other_slot).forecast_info is not shared
+
+def test_sql_repo_upserts_once_per_city_and_repoints_events():
+    db = MagicMock()
+    slot = datetime(2030, 1, 10, 12, 0)                               # como volta do banco (UTC, sem tz)
+    db.execute.return_value = [(slot, 7)]
+    repo = SQLEventRepo(db)
+
+    repo.upsert_city_forecasts(" São  Paulo", [(_forecast(slot.replace(tzinfo=timezone.utc)), [1, 2, 3])])
+
+    [stmt] = [c.args[0] for c in db.execute.call_args_list]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT ON CONSTRAINT uq_forecast_infos_city_slot DO UPDATE" in sql
+    assert "RETURNING" in sql
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    assert params["city_m0"] == "são paulo"
+    assert params["forecast_datetime_m0"] == slot
+
+    [(values,), kwargs] = db.query.return_value.filter.return_value.update.call_args
+    assert values["forecast_info_id"] == 7 and values["updated_at"] and kwargs == {"synchronize_session": False}
+    db.commit.assert_called_once()
+
+def test_sql_replace_only_repoints_to_existing_shared_row():
+    db = MagicMock()
+    db.scalar.return_value = 7
+    db_event = db.query.return_value.filter.return_value.first.return_value
+    repo = SQLEventRepo(db)
+    slot = datetime(2030, 1, 10, 12, 0, tzinfo=timezone.utc)
+    event = EventResponse(
+        id=1, title="show", description="d", city="Recife", event_date=slot, participants=[],
+        forecast_info=_forecast(slot).model_copy(update={"temperature": -40.0}),   # dado do cliente
+    )
+
+    with patch("app.repositories.event_orm_db.EventResponse.model_validate"):
+        repo.replace_by_id(1, event)
+
+    db.execute.assert_not_called()                                   # linha compartilhada intacta
+    assert db_event.forecast_info_id == 7
+    sql = str(db.scalar.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "forecast_infos.city" in sql and "forecast_infos.forecast_datetime" in sql
+
+def test_same_slot_with_different_seconds_is_one_row():
+    db = MagicMock()
+    db.execute.return_value = [(datetime(2030, 1, 10, 12, 0), 7)]
+    repo = SQLEventRepo(db)
+    service = MockForecastService()
+    dates = [datetime(2030, 1, 10, 11, 0, 17, 123000, tzinfo=timezone.utc), datetime(2030, 1, 10, 12, 59, 42, tzinfo=timezone.utc)]
+
+    for date in dates:                                              # duas gravações do mesmo dia/slot
+        [forecast] = service.get_many("Recife", [date])
+        repo.upsert_city_forecasts("Recife", [(stamp_forecast(forecast), [1])])
+    first, second = service.get_many("Recife", dates)
+    assert first is second                                          # memo do lote também é por slot
+
+    slots = [c.args[0].compile(dialect=postgresql.dialect()).params["forecast_datetime_m0"] for c in db.execute.call_args_list]
+    assert slots == [datetime(2030, 1, 10, 12, 0)] * 2               # mesma chave (city, forecast_datetime)
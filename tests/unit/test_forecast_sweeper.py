@@ -0,0 +1,130 @@
+# tests/unit/test_forecast_sweeper.py
+# (varredura periódica de previsões antigas: índice por data no repositório, lock no Redis, GET sem refresh)
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+import fakeredis
+import pytest
+from prometheus_client import REGISTRY
+
+from app.repositories.event import AbstractEventRepo
+from app.schemas.event_create import EventCreate
+from app.services import forecast_queue
+from app.services.forecast import stamp_forecast
+from app.services.forecast_queue import ForecastRefreshQueue
+from app.services.forecast_sweeper import ForecastSweeper, LOCK_KEY
+from app.services.mock_forecast_info import MockForecastService
+
+NOW = datetime.now(timezone.utc)
+
+def _add(repo, city: str, when: datetime) -> int:
+    return repo.add(EventCreate(
+        title="show", description="d", city=city, event_date=when, participants=[],
+    )).id
+
+def _stamp(repo, event_id: int, updated_at: datetime) -> None:
+    event = repo.get(event_id)
+    forecast = stamp_forecast(MockForecastService().get_by_city_and_datetime(event.city, event.event_date))
+    repo.upsert_city_forecasts(event.city, [(forecast.model_copy(update={"updated_at": updated_at}), [event_id])])
+
+def _query(repo, limit: int = 100) -> list[int]:
+    return [e.id for e in repo.list_stale_forecasts(
+        start=NOW, end=NOW + timedelta(days=10), stale_before=NOW - timedelta(days=1), limit=limit,
+    )]
+
+@pytest.fixture
+def events(repo):
+    later = _add(repo, "Recife", NOW + timedelta(days=3))
+    soon = _add(repo, "Curitiba", NOW + timedelta(days=1))
+    fresh = _add(repo, "Recife", NOW + timedelta(days=2))
+    old = _add(repo, "Fortaleza", NOW + timedelta(days=4))
+    past = _add(repo, "Recife", NOW - timedelta(days=1))
+    far = _add(repo, "Recife", NOW + timedelta(days=30))
+    _stamp(repo, fresh, NOW)
+    _stamp(repo, old, NOW - timedelta(days=2))
+    return {"later": later, "soon": soon, "fresh": fresh, "old": old, "past": past, "far": far}
+
+def test_index_returns_upcoming_stale_events_in_date_order(repo, events):
+    assert _query(repo) == [events["soon"], events["later"], events["old"]]
+    assert _query(repo, limit=1) == [events["soon"]]
+
+def test_index_follows_updates_and_deletes(repo, events):
+    repo.update(events["far"], {"event_date": NOW + timedelta(hours=12)})
+    repo.delete_by_id(events["soon"])
+    assert _query(repo) == [events["far"], events["later"], events["old"]]
+
+def test_generic_scan_matches_index(repo, events):
+    generic = AbstractEventRepo.list_stale_forecasts(
+        repo, start=NOW, end=NOW + timedelta(days=10), stale_before=NOW - timedelta(days=1),
+    )
+    assert [e.id for e in generic] == _query(repo)
+
+@pytest.fixture
+def lock_redis(monkeypatch):
+    r = fakeredis.FakeAsyncRedis(decode_responses=True)
+
+    async def _provide():
+        return r
+
+    monkeypatch.setattr("app.services.forecast_sweeper.provide_redis", _provide)
+    return r
+
+@pytest.fixture
+def sweeper(repo, fake_async_redis):
+    queue = ForecastRefreshQueue(
+        window_ms=0, retries=1, retry_delay=0,
+        service_factory=MockForecastService, repo_factory=lambda db: repo,
+    )
+    return ForecastSweeper(queue, interval_s=60, batch_size=2, max_batches=5, repo_factory=lambda db: repo)
+
+async def test_sweep_refreshes_stale_events_once_per_interval(repo, events, sweeper, lock_redis):
+    before = REGISTRY.get_sample_value("forecast_sweep_runs_total", {"result": "locked"}) or 0.0
+
+    assert await sweeper.run_once() == 3
+    assert _query(repo) == []
+    assert repo.get(events["past"]).forecast_info is None           # fora da janela
+    assert repo.get(events["far"]).forecast_info is None
+    assert 0 < await lock_redis.pttl(LOCK_KEY) <= 60_000
+
+    # outro worker (ou a próxima volta antes do TTL) não varre de novo
+    assert await ForecastSweeper(sweeper.queue, repo_factory=lambda db: repo).run_once() == 0
+    assert (REGISTRY.get_sample_value("forecast_sweep_runs_total", {"result": "locked"}) or 0.0) - before == 1
+
+async def test_sweep_batches_by_normalized_city_off_the_loop(repo, sweeper, lock_redis, monkeypatch):
+    ids = {city: _add(repo, city, NOW + timedelta(days=day))
+           for day, city in enumerate(["Recife", "São  Paulo", "São Miguel", "são paulo"], start=1)}
+    batches: list[list[int]] = []
+    monkeypatch.setattr(sweeper.queue, "dispatch", lambda event_ids: _record(batches, event_ids))
+    threads: list[threading.Thread] = []
+    query = repo.list_stale_forecasts
+
+    def _spy(**kwargs):
+        threads.append(threading.current_thread())
+        return query(**kwargs)
+
+    monkeypatch.setattr(repo, "list_stale_forecasts", _spy)
+
+    assert await sweeper.run_once() == 4
+    assert batches == [[ids["Recife"], ids["São Miguel"]], [ids["São  Paulo"], ids["são paulo"]]]
+    assert threads and threads[0] is not threading.main_thread()   # consulta no executor, não no loop
+
+async def _record(batches: list[list[int]], event_ids) -> None:
+    batches.append(list(event_ids))
+
+async def test_sweep_skips_without_redis(repo, events, sweeper, monkeypatch):
+    async def _down():
+        raise ConnectionError("redis fora do ar")
+
+    monkeypatch.setattr("app.services.forecast_sweeper.provide_redis", _down)
+    assert await sweeper.run_once() == 0
+    assert len(_query(repo)) == 3
+
+@pytest.mark.parametrize("event", ["evento_valido"], indirect=True)
+def test_get_no_longer_schedules_refresh(client, auth_header, event, monkeypatch):
+    event_id = client.post("/api/v1/events", json=event, headers=auth_header).json()["id"]
+    enqueued: list[int] = []
+    monkeypatch.setattr(forecast_queue.forecast_refresh_queue, "enqueue", enqueued.append)
+
+    assert client.get(f"/api/v1/events/{event_id}", headers=auth_header).status_code == 200
+    assert enqueued == []
@@ -0,0 +1,163 @@
+# tests/unit/test_jobs.py
+# (fila de jobs durável: Redis Streams e SQLite, ack, retry com backoff, fila de mortos, reentrega; worker + forecast)
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import fakeredis
+import pytest
+
+from app.jobs.base import RetryJob, backoff_delay
+from app.jobs.redis_streams import RedisStreamJobQueue
+from app.jobs.registry import register_job
+from app.jobs.sqlite import SQLiteJobQueue
+from app.jobs.worker import execute_job, run_worker
+from app.schemas.event_create import EventCreate
+from app.services.forecast_queue import FORECAST_REFRESH_JOB, ForecastRefreshQueue
+from app.services.mock_forecast_info import MockForecastService
+
+@pytest.fixture(params=["redis", "sqlite"])
+def job_queue(request, tmp_path):
+    if request.param == "redis":
+        return RedisStreamJobQueue(fakeredis.FakeRedis(decode_responses=True), "test", visibility_timeout=0.2)
+    return SQLiteJobQueue(tmp_path / "jobs.sqlite3", "test", visibility_timeout=0.2, poll_interval=0.01)
+
+_calls: list[dict] = []
+
+@register_job("test.ok")
+async def _ok(payload):
+    _calls.append(payload)
+
+@register_job("test.flaky")
+async def _flaky(payload):
+    if payload["left"]:
+        raise RetryJob("ainda não", {"left": payload["left"] - 1})
+
+@register_job("test.boom")
+async def _boom(payload):
+    raise ValueError("quebrou")
+
+def test_enqueue_reserve_ack(job_queue):
+    job_id = job_queue.enqueue("test.ok", {"x": 1})
+    assert job_queue.pending() == 1
+
+    [job] = job_queue.reserve("c1", count=5, block_ms=0)
+    assert (job.id, job.name, job.payload, job.attempts) == (job_id, "test.ok", {"x": 1}, 0)
+    assert job_queue.reserve("c2", block_ms=0) == []            # reservado não é entregue de novo
+
+    job_queue.ack(job)
+    assert job_queue.pending() == 0
+
+def test_delayed_jobs_wait(job_queue):
+    job_queue.enqueue("test.ok", {}, delay=0.15)
+    assert job_queue.reserve("c1", block_ms=0) == []
+    time.sleep(0.2)
+    assert len(job_queue.reserve("c1", block_ms=0)) == 1
+
+def test_unacked_job_is_redelivered_after_visibility_timeout(job_queue):
+    job_queue.enqueue("test.ok", {})
+    [first] = job_queue.reserve("morto", block_ms=0)
+    time.sleep(0.3)
+
+    [again] = job_queue.reserve("vivo", block_ms=0)
+    assert again.id == first.id
+    job_queue.ack(again)
+    assert job_queue.pending() == 0
+
+def test_retry_and_dead_letter(job_queue):
+    job_queue.enqueue("test.ok", {"v": 1})
+    [job] = job_queue.reserve("c1", block_ms=0)
+    job.payload = {"v": 2}
+    job_queue.retry(job, 0, "falhou")
+
+    [job] = job_queue.reserve("c1", block_ms=0)
+    assert (job.attempts, job.payload, job.last_error) == (1, {"v": 2}, "falhou")
+
+    job_queue.dead_letter(job, "desisti")
+    assert job_queue.pending() == 0
+    [dead] = job_queue.dead_letters()
+    assert (dead.id, dead.attempts, dead.last_error) == (job.id, 2, "desisti")
+
+def test_backoff_is_capped_with_jitter():
+    delays = [backoff_delay(10, 1.0, 30.0) for _ in range(50)]
+    assert all(0 <= d <= 30 for d in delays)
+    assert len(set(delays)) > 1
+
+async def test_worker_acks_retries_and_dead_letters(job_queue):
+    _calls.clear()
+    job_queue.enqueue("test.ok", {"n": 1})
+    job_queue.enqueue("test.flaky", {"left": 2})
+    job_queue.enqueue("test.boom", {})
+    job_queue.enqueue("test.desconhecido", {})
+
+    for _ in range(5):
+        await run_worker(job_queue, consumer="w", concurrency=2, max_attempts=3, backoff_base=0, block_ms=0, stop_when_empty=True)
+
+    assert _calls == [{"n": 1}]
+    assert job_queue.pending() == 0                             # flaky acabou dando certo na 3ª
+    dead = {j.name: j for j in job_queue.dead_letters()}
+    assert set(dead) == {"test.boom", "test.desconhecido"}
+    assert dead["test.boom"].attempts == 3
+    assert dead["test.boom"].last_error == "ValueError: quebrou"
+
+async def test_execute_job_outcomes(job_queue):
+    job_queue.enqueue("test.flaky", {"left": 1})
+    [job] = job_queue.reserve("w", block_ms=0)
+    assert await execute_job(job_queue, job, max_attempts=5, backoff_base=0, backoff_max=0) == "retry"
+    [job] = job_queue.reserve("w", block_ms=0)
+    assert job.payload == {"left": 0}
+    assert await execute_job(job_queue, job, max_attempts=5, backoff_base=0, backoff_max=0) == "ok"
+
+# ── forecast na fila de jobs ─────────────────────────
+WHEN = datetime.now(timezone.utc) + timedelta(days=1)
+
+class _FailingCity(MockForecastService):
+    async def aget_many(self, city, dates):
+        if city == "Curitiba":
+            raise RuntimeError("provedor fora do ar")
+        return await super().aget_many(city, dates)
+
+def _add(repo, city: str) -> int:
+    return repo.add(EventCreate(title="show", description="d", city=city, event_date=WHEN, participants=[])).id
+
+async def test_forecast_batches_go_through_job_queue(job_queue, repo, fake_async_redis, monkeypatch):
+    import app.jobs.handlers as handlers
+
+    ok, bad = _add(repo, "Recife"), _add(repo, "Curitiba")
+    api_side = ForecastRefreshQueue(
+        window_ms=0, job_queue_factory=lambda: job_queue,
+        service_factory=lambda: pytest.fail("a API não deve chamar o provedor"), repo_factory=lambda db: repo,
+    )
+    worker_side = ForecastRefreshQueue(
+        retries=1, retry_delay=0, service_factory=_FailingCity, repo_factory=lambda db: repo,
+        job_queue_factory=lambda: None,
+    )
+    monkeypatch.setattr(handlers, "forecast_refresh_queue", worker_side)
+
+    api_side.enqueue(ok)
+    api_side.enqueue(bad)
+    await api_side.drain()
+    [job] = job_queue.reserve("w", block_ms=0)
+    assert (job.name, job.payload) == (FORECAST_REFRESH_JOB, {"event_ids": sorted([ok, bad])})
+
+    # só o evento que falhou volta para a fila
+    assert await execute_job(job_queue, job, max_attempts=2, backoff_base=0, backoff_max=0) == "retry"
+    assert repo.get(ok).forecast_info is not None
+    [job] = job_queue.reserve("w", block_ms=0)
+    assert job.payload == {"event_ids": [bad]}
+
+    assert await execute_job(job_queue, job, max_attempts=2, backoff_base=0, backoff_max=0) == "dead"
+    assert repo.get(bad).forecast_info is None
+    await api_side.stop()
+
+async def test_publish_failure_falls_back_to_local_processing(repo, fake_async_redis):
+    class _Down:
+        def enqueue(self, *args, **kwargs):
+            raise ConnectionError("broker fora do ar")
+
+    event_id = _add(repo, "Recife")
+    queue = ForecastRefreshQueue(
+        window_ms=0, job_queue_factory=_Down, service_factory=MockForecastService, repo_factory=lambda db: repo,
+    )
+    await queue.dispatch([event_id])
+    assert repo.get(event_id).forecast_info is not None
@@ -1,5 +1,7 @@
 # tests/unit/test_localinfo.py
 
+import json
+import time
 from typing import Literal
 from fastapi.testclient import TestClient
 import pytest
@@ -13,12 +15,14 @@ from app.deps import provide_local_info_service
 
 from app.schemas.local_info import LocalInfo
 from app.services.mock_local_info import MockLocalInfoService
+from app.utils.suggest_index import SuggestIndex
 
 from app.constants.routes import (
     EVENTS_PREFIX,
     EVENTS_LOCAL_INFO_ROUTE,
     EVENTS_DETAIL_LOCAL_INFO_ROUTE,
     EVENTS_LOCAL_INFO_BY_NAME_ROUTE,
+    EVENTS_LOCAL_INFO_SUGGEST_ROUTE,
 )
 
 def test_get_local_info_endpoint(client: TestClient, auth_header: dict[str, str]):
@@ -108,6 +112,96 @@ async def test_mock_local_info_service_unit(mock_local_info_service: MockLocalIn
     info_none = await mock_local_info_service.get_by_name("inexistente")
     assert info_none is None
 
+@pytest.mark.parametrize("query", ["Espaço-Verde", "  ESPACO_verde ", "espaco / verde", "Galpão  Criativo"])
+async def test_lookup_folds_accents_and_separators_on_both_sides(mock_local_info_service, query):
+    # antes a consulta normalizada era comparada com o nome cru ("espaço verde") e não achava
+    assert await mock_local_info_service.get_by_name(query) is not None
+
+def test_provide_local_info_service_is_singleton():
+    assert provide_local_info_service() is provide_local_info_service()
+
+@pytest.mark.parametrize("suffix", [".json", ".csv"])
+async def test_from_file(tmp_path, suffix):
+    path = tmp_path / f"venues{suffix}"
+    if suffix == ".json":
+        path.write_text(json.dumps([{"location_name": "Arena Pernambuco", "capacity": 46000, "venue_type": "Auditorio", "address": "BR-408, km 2"}]))
+    else:
+        path.write_text("location_name,capacity,venue_type,is_accessible,address\nArena Pernambuco,46000,Auditorio,true,\"BR-408, km 2\"\n")
+    service = MockLocalInfoService.from_file(path)
+    assert len(service) == 1
+    info = await service.get_by_name("arena-pernambuco")
+    assert info is not None and info.capacity == 46000
+
+async def test_lookup_benchmark_100k_venues(tmp_path):
+    """100 mil locais: carga em lote do arquivo + busca O(1), contra a varredura linear antiga."""
+    venues = [{"location_name": f"Local {i}", "capacity": i % 900, "address": f"Rua {i}, 1"} for i in range(100_000)]
+    path = tmp_path / "venues.json"
+    path.write_text(json.dumps(venues))
+
+    started = time.perf_counter()
+    service = MockLocalInfoService.from_file(path)
+    load_s = time.perf_counter() - started
+    assert len(service) == 100_000
+
+    names = [f"local {i}" for i in range(99_000, 100_000)]
+    started = time.perf_counter()
+    for name in names:
+        assert await service.get_by_name(name) is not None
+    indexed_s = (time.perf_counter() - started) / len(names)
+
+    items = list(service._index.values())
+    started = time.perf_counter()
+    for name in names[:20]:
+        next(item for item in items if item.location_name == name)   # como era: um scan por consulta
+    linear_s = (time.perf_counter() - started) / 20
+
+    print(f"\n100k locais: carga {load_s:.2f}s | busca indexada {indexed_s * 1e6:.1f}µs | scan {linear_s * 1e6:.0f}µs")
+    assert indexed_s * 20 < linear_s
+
+# ---------------------------------------------------------------------------
+# Autocomplete (/events/local_info/suggest)
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("q, expected", [
+    ("aud", ["auditorio beta", "auditorio central"]),                # prefixo do nome
+    ("Verde", ["espaço verde"]),                                      # prefixo de palavra
+    ("teatro munisipal", ["teatro municipal"]),                       # erro de digitação (trigramas)
+    ("zzz", []),
+])
+def test_suggest_endpoint(client: TestClient, auth_header: dict[str, str], fake_async_redis, q, expected):
+    resp = client.get(EVENTS_LOCAL_INFO_SUGGEST_ROUTE, params={"q": q}, headers=auth_header)
+    assert resp.status_code == 200
+    assert [v["location_name"] for v in resp.json()] == expected
+
+def test_suggest_endpoint_validates_query(client: TestClient, auth_header: dict[str, str]):
+    assert client.get(EVENTS_LOCAL_INFO_SUGGEST_ROUTE, params={"q": ""}, headers=auth_header).status_code == 422
+    assert client.get(EVENTS_LOCAL_INFO_SUGGEST_ROUTE, params={"q": "a", "limit": 99}, headers=auth_header).status_code == 422
+
+def test_suggest_ranking():
+    index = SuggestIndex(["grande teatro", "teatro municipal", "treatro", "teatro", "museu"])
+    ranked = [index.names[i] for i in index.search("teatro", 10)]
+    assert ranked[:3] == ["teatro", "teatro municipal", "grande teatro"]   # exato > prefixo > palavra
+    assert "treatro" in ranked and "museu" not in ranked
+    assert len(index.search("teatro", 2)) == 2
+
+def test_suggest_benchmark_100k_venues():
+    """100 mil nomes: cada tecla (prefixo) bem abaixo de 1 ms; aproximado por volta de 1 ms."""
+    kinds = ["arena", "teatro", "casa", "clube"]
+    index = SuggestIndex([f"local {kinds[i % 4]} {i}" for i in range(100_000)])
+    typed = "local teatro 12345"
+
+    def _avg(queries):
+        started = time.perf_counter()
+        for q in queries:
+            assert index.search(q, 8)
+        return (time.perf_counter() - started) / len(queries)
+
+    keystrokes = _avg([typed[:n] for n in range(1, len(typed) + 1)] * 20)
+    fuzzy = _avg(["locak teatro 12345", "teatro 1234 local"] * 10)
+    print(f"\nautocomplete 100k: prefixo {keystrokes * 1e6:.0f}µs | aproximado {fuzzy * 1e6:.0f}µs")
+    assert keystrokes < 0.001
+    assert fuzzy < 0.005
+
 @pytest.mark.parametrize("localinfo", ["localinfo_type_error"], indirect=True)
 def test_location_name_validator_typeerror(localinfo: Literal['localinfo_type_error']):
     # with pytest.raises(ValidationError):
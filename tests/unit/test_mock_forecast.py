@@ -0,0 +1,65 @@
+# tests/unit/test_mock_forecast.py
+# (grade pré-calculada do MockForecastService: mesmo resultado da versão antiga, lookup em lote)
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.schemas.weather_forecast import ForecastInfo
+from app.services.mock_forecast_info import MockForecastService, _BASE_TEMP
+
+def _reference(city: str, date: datetime) -> ForecastInfo | None:
+    """Implementação original (40 modelos + `min()` linear), com os slots em horas cheias."""
+    temp_base = _BASE_TEMP.get(city.lower())
+    if temp_base is None:
+        return None
+    start = date.replace(hour=0, minute=0, second=0, microsecond=0)
+    previsoes = []
+    for day in range(10):
+        for hour in [0, 6, 12, 18]:
+            idx = (day * 4 + hour // 6) % 4
+            previsoes.append(ForecastInfo(
+                forecast_datetime=start + timedelta(days=day, hours=hour),
+                temperature=temp_base + (idx * 2) + (hour / 8),
+                weather_main=["Clear", "Rain", "Clouds", "Thunderstorm"][idx],
+                weather_desc=["Céu limpo", "Chuva leve", "Nuvens dispersas", "Tempestade elétrica"][idx],
+                humidity=65 + idx,
+                wind_speed=2.5 + idx,
+            ))
+    return min(previsoes, key=lambda p: abs((p.forecast_datetime - date).total_seconds()))
+
+def _dates(n: int = 300) -> list[datetime]:
+    rnd = random.Random(42)
+    base = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    dates = [base + timedelta(seconds=rnd.randrange(0, 30 * 86400)) for _ in range(n)]
+    # bordas: empates exatos entre dois slots e fim do dia
+    dates += [base.replace(hour=h, minute=m) for h, m in ((3, 0), (9, 0), (21, 0), (23, 59), (0, 0))]
+    return dates
+
+@pytest.mark.parametrize("city", ["Recife", "são paulo", "CURITIBA"])
+def test_grid_matches_original_implementation(city):
+    service = MockForecastService()
+    for date in _dates():
+        assert service.get_by_city_and_datetime(city, date) == _reference(city, date), date
+
+def test_unknown_city_returns_none():
+    assert MockForecastService().get_by_city_and_datetime("Atlântida", datetime.now(timezone.utc)) is None
+
+def test_get_many_matches_single_lookups():
+    service = MockForecastService()
+    dates = _dates(50)
+
+    batch = service.get_many("Fortaleza", dates)
+
+    assert batch == [service.get_by_city_and_datetime("Fortaleza", d) for d in dates]
+    assert service.get_many("Atlântida", dates) == [None] * len(dates)
+    assert service.get_many("Recife", []) == []
+
+def test_get_many_reuses_models_for_the_same_slot():
+    day = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    first, second, other = MockForecastService().get_many(
+        "Recife", [day.replace(hour=11), day.replace(hour=13), day.replace(hour=18)],
+    )
+    assert first is second
+    assert other is not first
@@ -0,0 +1,122 @@
+# tests/unit/test_service_url.py
+# (registro de URLs de serviços: leitura em memória, mtime, escrita atômica, pub/sub entre workers, pool HTTP)
+
+import asyncio
+import json
+import os
+import threading
+
+import fakeredis
+import pytest
+
+from app.core.config import get_settings
+from app.services import http_client
+from app.utils.service_url import ServiceUrlRegistry, service_urls
+
+DEFAULTS = {"forecast_info_url": "https://default.forecast.api", "local_info_url": "https://default.localinfo.api"}
+
+@pytest.fixture
+def registry(tmp_path):
+    return ServiceUrlRegistry(tmp_path / "runtime_urls.json", DEFAULTS)
+
+def test_defaults_then_override_written_atomically(registry):
+    assert registry.get("forecast_info_url") == DEFAULTS["forecast_info_url"]
+    assert registry.get("desconhecido") == ""
+
+    registry.write("forecast_info_url", "https://novo.forecast.api")
+    assert registry.get("forecast_info_url") == "https://novo.forecast.api"
+    assert json.loads(registry.path.read_text()) == {"forecast_info_url": "https://novo.forecast.api"}
+    assert not list(registry.path.parent.glob("*.tmp"))                 # temporário renomeado, não copiado
+
+def test_reload_only_when_mtime_changes(registry):
+    assert registry.reload_if_changed() is False
+
+    registry.path.write_text(json.dumps({"local_info_url": "https://outro.local.api"}))
+    os.utime(registry.path, ns=(1, 1))
+    assert registry.reload_if_changed() is True
+    assert registry.get("local_info_url") == "https://outro.local.api"
+    assert registry.reload_if_changed() is False
+
+    registry.path.write_text("{quebrado")
+    os.utime(registry.path, ns=(2, 2))
+    assert registry.reload_if_changed() is False                        # mantém o último válido
+    assert registry.get("local_info_url") == "https://outro.local.api"
+
+def test_concurrent_writers_do_not_lose_updates(tmp_path):
+    # dois "workers" (registros diferentes, mesmo arquivo) gravando ao mesmo tempo
+    a = ServiceUrlRegistry(tmp_path / "runtime_urls.json", DEFAULTS)
+    b = ServiceUrlRegistry(tmp_path / "runtime_urls.json", DEFAULTS)
+    threads = [
+        threading.Thread(target=reg.write, args=(f"svc_{reg_i}_{i}", f"https://h{i}.api"))
+        for i in range(20) for reg_i, reg in enumerate((a, b))
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(json.loads(a.path.read_text())) == 40
+
+def test_listeners_only_on_real_change(registry):
+    seen = []
+    registry.on_change(lambda *change: seen.append(change))
+    registry.write("forecast_info_url", "https://novo.forecast.api")
+    registry.write("forecast_info_url", "https://novo.forecast.api")
+    assert seen == [("forecast_info_url", DEFAULTS["forecast_info_url"], "https://novo.forecast.api")]
+
+async def test_pubsub_converges_other_workers(tmp_path):
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    writer = ServiceUrlRegistry(tmp_path / "a.json", DEFAULTS)
+    other = ServiceUrlRegistry(tmp_path / "b.json", DEFAULTS)          # outro host: não enxerga o arquivo
+    await other.start(redis)
+    await asyncio.sleep(0.05)
+
+    await writer.update("local_info_url", "https://novo.local.api", redis)
+    for _ in range(50):
+        if other.get("local_info_url") == "https://novo.local.api":
+            break
+        await asyncio.sleep(0.01)
+    assert other.get("local_info_url") == "https://novo.local.api"
+    await other.stop()
+
+async def test_idle_channel_outlives_socket_timeout(tmp_path, idle_redis):
+    client, server = idle_redis
+    registry = ServiceUrlRegistry(tmp_path / "a.json", DEFAULTS)
+    task = asyncio.create_task(registry.listen(client, retry_delay=0.01))
+    await asyncio.sleep(0.3)                                          # ocioso por ~6× o socket_timeout
+
+    assert server.subscribe_calls == 1                               # a mesma assinatura, sem reconectar
+    server.publish(get_settings().service_urls_channel, json.dumps({"local_info_url": "https://novo.local.api"}))
+    for _ in range(50):
+        if registry.get("local_info_url") == "https://novo.local.api":
+            break
+        await asyncio.sleep(0.01)
+    assert registry.get("local_info_url") == "https://novo.local.api"
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+async def test_http_pool_rebuilt_only_when_origin_changes(monkeypatch):
+    monkeypatch.setattr(http_client._settings, "http_read_timeout", 0)
+    first = await http_client.start_http_client()
+
+    http_client._on_service_url_change("forecast_info_url", "https://a.api/v1", "https://a.api/v2")
+    assert http_client.get_http_client() is first
+
+    http_client._on_service_url_change("forecast_info_url", "https://a.api/v2", "https://b.api/v2")
+    second = http_client.get_http_client()
+    assert second is not first
+    await asyncio.sleep(0.01)
+    assert first.is_closed and not second.is_closed
+    await http_client.close_http_client()
+
+def test_admin_update_endpoint(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(service_urls, "path", tmp_path / "runtime_urls.json")
+    try:
+        resp = client.put("/api/v1/admin/update-service-url", json={"service": "local_info_url", "url": "https://novo.local.api"})
+        assert resp.status_code == 204
+        assert service_urls.get("local_info_url") == "https://novo.local.api/"
+        assert json.loads(service_urls.path.read_text()) == {"local_info_url": "https://novo.local.api/"}
+
+        resp = client.put("/api/v1/admin/update-service-url", json={"service": "outro", "url": "https://x.api"})
+        assert resp.status_code == 400
+    finally:
+        service_urls._apply({})
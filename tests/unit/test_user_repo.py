@@ -0,0 +1,38 @@
+# tests/unit/test_user_repo.py
+# (repositórios de usuários: troca de papéis no SQL e em memória)
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models.models_user import User
+from app.repositories.user_mem import InMemoryUserRepo
+from app.services.user_db import UserRepo
+
+@pytest.fixture
+def sql_repo():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[User.__table__])
+    with sessionmaker(bind=engine)() as db:
+        db.add(User(username="carol", full_name="Carol Jones", hashed_password="x", roles="viewer"))
+        db.commit()
+        yield UserRepo(db)
+    engine.dispose()
+
+def test_sql_update_roles_persists(sql_repo):
+    updated = sql_repo.update_roles("carol", ["editor", "viewer"])
+
+    assert updated is not None and updated.roles == ["editor", "viewer"]
+    sql_repo.db.expire_all()                                     # relê do banco, não da sessão
+    assert sql_repo.get_by_username("carol").roles == ["editor", "viewer"]
+    assert sql_repo.db.query(User).count() == 1                  # atualiza a linha, não insere outra
+
+def test_sql_update_roles_unknown_user(sql_repo):
+    assert sql_repo.update_roles("ninguem", ["admin"]) is None
+
+def test_mem_update_roles():
+    repo = InMemoryUserRepo()
+    assert repo.update_roles("carol", ["editor"]).roles == ["editor"]
+    assert repo.get_by_username("carol").roles == ["editor"]
+    assert repo.update_roles("ninguem", ["admin"]) is None
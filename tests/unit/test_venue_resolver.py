@@ -0,0 +1,108 @@
+# tests/unit/test_venue_resolver.py
+# (importação em lote: cada local distinto validado uma vez, instância compartilhada, busca por nome em lote)
+
+import json
+import time
+from io import BytesIO
+
+import pytest
+from pydantic import ValidationError
+
+from app.constants.routes import EVENTS_UPLOAD_CSV_ROUTE
+from app.schemas.event_create import EventCreate
+from app.schemas.local_info import LocalInfoResponse
+from app.services.mock_local_info import MockLocalInfoService
+from app.services.venue_resolver import VenueResolver
+
+def _venue(name: str, capacity: int = 300, **extra) -> str:
+    return json.dumps({"location_name": name, "capacity": capacity, "venue_type": "Auditorio", **extra})
+
+class _CountingService(MockLocalInfoService):
+    def __init__(self):
+        super().__init__()
+        self.batches: list[list[str]] = []
+
+    async def get_many_by_name(self, names):
+        names = list(names)
+        self.batches.append(names)
+        return await super().get_many_by_name(names)
+
+def test_each_distinct_venue_is_validated_once_and_shared():
+    resolver = VenueResolver()
+    raws = [_venue("Teatro Santa Isabel"), _venue("Cais do Sertão", 120)] * 50
+
+    venues = [resolver.resolve(raw) for raw in raws]
+    assert resolver.parsed == 2
+    assert len({id(v) for v in venues}) == 2
+
+    # outro texto, mesmo local (ordem das chaves, caixa/acentos do nome) → mesma instância
+    same = json.dumps({"capacity": 300, "venue_type": "Auditorio", "location_name": "TEATRO  santa isabel"})
+    assert resolver.resolve(same) is venues[0]
+
+def test_invalid_venue_error_is_memoized():
+    resolver = VenueResolver()
+    for _ in range(3):
+        with pytest.raises(ValidationError):
+            resolver.resolve(_venue("x", capacity=-1))
+    assert resolver.parsed == 1
+    with pytest.raises(ValueError):
+        resolver.resolve("  ")
+
+def test_shared_venue_is_immutable():
+    venue = VenueResolver().resolve(_venue("Teatro Santa Isabel"))
+    with pytest.raises(ValidationError):
+        venue.capacity = 1
+
+def test_event_default_local_info_is_not_rebuilt():
+    assert EventCreate(...).local_info is EventCreate(...).local_info
+
+async def test_names_resolved_with_one_batched_lookup():
+    service = _CountingService()
+    resolver = VenueResolver(service)
+    raws = ["Teatro Municipal", " teatro-municipal ", "Biblioteca", "Inexistente", _venue("Cais do Sertão")] * 10
+
+    await resolver.prefetch(raws)
+    assert len(service.batches) == 1
+    assert sorted(service.batches[0]) == ["biblioteca", "inexistente", "teatro municipal"]
+
+    assert resolver.resolve("TEATRO MUNICIPAL").capacity == 500
+    assert resolver.resolve("Biblioteca") is resolver.resolve("biblioteca")
+    with pytest.raises(ValueError, match="Local não encontrado"):
+        resolver.resolve("Inexistente")
+
+def test_upload_csv_shares_venues_across_rows(client_autenticado, repo):
+    json_venue = _venue("Teatro Santa Isabel").replace('"', '""')
+    lines = ["title,description,event_date,city,participants,local_info"]
+    for i in range(60):
+        venue = f'"{json_venue}"' if i % 3 else "Teatro Municipal"
+        lines.append(f'Show {i},Um grande show,2030-06-20T19:00:00Z,Recife,"Alice;Bob",{venue}')
+    lines.append('Show X,Um grande show,2030-06-20T19:00:00Z,Recife,Alice,Local Fantasma')
+
+    resp = client_autenticado.post(
+        EVENTS_UPLOAD_CSV_ROUTE, files={"file": ("eventos.csv", BytesIO("\n".join(lines).encode()), "text/csv")},
+    )
+    assert resp.status_code == 201
+    assert resp.json()["total"] == 60                                   # "Local Fantasma" não existe
+
+    events = repo.list_all()
+    assert len({id(e.local_info) for e in events}) == 2
+    assert {e.local_info.location_name for e in events} == {"teatro santa isabel", "teatro municipal"}
+
+def test_import_cpu_drops_with_venue_reuse():
+    """20 mil linhas, 5 locais: validar por linha (como era) vs. uma vez por local distinto."""
+    raws = [_venue(f"Local {i % 5}", address="Rua das Flores, 456") for i in range(20_000)]
+
+    started = time.process_time()
+    for raw in raws:
+        LocalInfoResponse(**json.loads(raw))
+    per_row = time.process_time() - started
+
+    started = time.process_time()
+    resolver = VenueResolver()
+    for raw in raws:
+        resolver.resolve(raw)
+    memoized = time.process_time() - started
+
+    print(f"\n20k linhas / 5 locais: por linha {per_row * 1000:.0f} ms | memoizado {memoized * 1000:.0f} ms")
+    assert resolver.parsed == 5
+    assert memoized * 3 < per_row